@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+"""Check FootballDataClient against a local stand-in HTTP server (no database, no internet).
+
+The server answers /competitions/PL/teams with a small JSON body after a short
+delay, and /limited with one 429 before a 200. The checks cover:
+  - every worker shares one token bucket, so the combined call rate holds
+  - fetch_seasons runs the seasons concurrently and keys results by (endpoint, season)
+  - a 429 drains the bucket and the request is retried after Retry-After,
+    given either as delay-seconds or as an HTTP-date (RFC 9110)
+
+Usage:
+    python check_api_client.py
+"""
+
+import datetime
+import json
+import sys
+import threading
+import time
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Add project to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.etl.extract.api_client import TEAMS_ENDPOINT, FootballDataClient, retry_after_seconds
+from src.etl.extract.throttle import TokenBucket
+
+RESPONSE_DELAY = 0.3
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    lock = threading.Lock()
+    arrivals = []
+    in_flight = 0
+    max_in_flight = 0
+    limited_seen = {}
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        cls = type(self)
+        with cls.lock:
+            cls.arrivals.append((time.monotonic(), self.path))
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            if url.path.endswith("/limited"):
+                self._limited(query.get("mode", "seconds"))
+            else:
+                time.sleep(RESPONSE_DELAY)
+                self._json(200, {"season": int(query.get("season", 0)), "teams": []})
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def _limited(self, mode):
+        cls = type(self)
+        with cls.lock:
+            cls.limited_seen[mode] = cls.limited_seen.get(mode, 0) + 1
+            first = cls.limited_seen[mode] == 1
+        if not first:
+            self._json(200, {"mode": mode})
+            return
+        if mode == "date":
+            retry_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=2)
+            retry_after = format_datetime(retry_at.replace(microsecond=0), usegmt=True)
+        else:
+            retry_after = "1"
+        self._json(429, {"message": "rate limited"}, {"Retry-After": retry_after})
+
+    def _json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def check(label, condition):
+    print(f"  {'[OK]' if condition else '[ERROR]'} {label}")
+    return condition
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/v4"
+    arrivals = StandInHandler.arrivals
+    results = []
+
+    print("Shared token bucket:")
+    # 120/min = one call every 0.5s; capacity 1 so the first burst is a single call
+    client = FootballDataClient(base_url=base, max_workers=4, use_cache=False)
+    client.limiter = TokenBucket(120, capacity=1)
+    client.fetch_seasons(range(2018, 2023))
+    times = sorted(at for at, _ in arrivals)
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    results.append(check(f"5 calls over 4 workers spaced by the bucket rate (min gap {min(gaps):.2f}s)",
+                         len(times) == 5 and min(gaps) >= 0.45))
+    client.close()
+
+    print("Concurrent fetch_seasons:")
+    arrivals.clear()
+    StandInHandler.max_in_flight = 0
+    client = FootballDataClient(base_url=base, requests_per_minute=600, max_workers=4, use_cache=False)
+    seasons = [2020, 2021, 2022, 2023]
+    started = time.monotonic()
+    responses = client.fetch_seasons(seasons)
+    elapsed = time.monotonic() - started
+    results.append(check("results keyed by (endpoint, season) with the matching body",
+                         sorted(responses) == [(TEAMS_ENDPOINT, season) for season in seasons]
+                         and all(responses[(TEAMS_ENDPOINT, season)]["season"] == season for season in seasons)))
+    results.append(check(f"seasons fetched in parallel ({elapsed:.2f}s, up to "
+                         f"{StandInHandler.max_in_flight} in flight)",
+                         StandInHandler.max_in_flight > 1 and elapsed < RESPONSE_DELAY * len(seasons)))
+
+    print("429 handling:")
+    drains = []
+    drain = client.limiter.drain
+    client.limiter.drain = lambda: (drains.append(time.monotonic()), drain())
+    started = time.monotonic()
+    body = client.get("/limited", {"mode": "seconds"})
+    elapsed = time.monotonic() - started
+    results.append(check(f"Retry-After: 1 drains the bucket and retries ({elapsed:.2f}s)",
+                         body == {"mode": "seconds"} and StandInHandler.limited_seen["seconds"] == 2
+                         and len(drains) == 1 and elapsed >= 1.0))
+    started = time.monotonic()
+    body = client.get("/limited", {"mode": "date"})
+    elapsed = time.monotonic() - started
+    results.append(check(f"Retry-After as an HTTP-date is waited out, not raised ({elapsed:.2f}s)",
+                         body == {"mode": "date"} and StandInHandler.limited_seen["date"] == 2
+                         and len(drains) == 2 and elapsed >= 0.5))
+    client.close()
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    in_30s = format_datetime(now + datetime.timedelta(seconds=30), usegmt=True)
+    past = format_datetime(now - datetime.timedelta(seconds=30), usegmt=True)
+    results.append(check("retry_after_seconds parses seconds, future/past dates and falls back on garbage",
+                         retry_after_seconds({"Retry-After": "7"}) == 7.0
+                         and 28 <= retry_after_seconds({"Retry-After": in_30s}) <= 30
+                         and retry_after_seconds({"Retry-After": past}) == 0.0
+                         and retry_after_seconds({"X-RequestCounter-Reset": "12"}) == 12.0
+                         and retry_after_seconds({"Retry-After": "soon"}) == 60.0
+                         and retry_after_seconds({}) == 60.0))
+
+    server.shutdown()
+    print(f"\n{'[OK]' if all(results) else '[ERROR]'} {sum(results)}/{len(results)} checks passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""Check HttpCache against a local stand-in HTTP server (no database, no internet).
+
+The server answers every GET with a JSON body and an ETag, and a 304 when the
+request carries the matching If-None-Match. The checks cover:
+  - a fresh entry is served without a network call
+  - a stale entry is revalidated with a conditional GET and a 304 reuses the body
+  - historical seasons never expire, even when a ttl_rule matches the URL
+  - ttl_rules pick the TTL of current-season/undated URLs; get_http_cache's
+    default rules (HTTP_CACHE_TTL_RULES) apply to the API and FBref URLs
+  - the size bound evicts the least-recently-used entry
+
+Usage:
+    python check_http_cache.py
+"""
+
+import json
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import requests
+
+from src.etl.extract.http_cache import HTTP_CACHE_TTL_RULES, HttpCache, current_season_start_year
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        etag = f'"{abs(hash(self.path))}"'
+        self.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = json.dumps({"path": self.path, "padding": "x" * 400}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def check(label, condition):
+    print(f"  {'[OK]' if condition else '[ERROR]'} {label}")
+    return condition
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/v4"
+    current, past = current_season_start_year(), current_season_start_year() - 3
+    seen = StandInHandler.requests_seen
+    session = requests.Session()
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("Freshness and revalidation:")
+        cache = HttpCache(Path(tmp) / "a", default_ttl=3600, ttl_rules={r"/matches": 0})
+        teams = f"{base}/competitions/PL/teams"
+        first = cache.request(session, teams, params={"season": current})
+        second = cache.request(session, teams, params={"season": current})
+        results.append(check("fresh entry served from cache", not first.from_cache and second.from_cache
+                             and len(seen) == 1))
+
+        matches = f"{base}/competitions/PL/matches"
+        cache.request(session, matches, params={"season": current})
+        revalidated = cache.request(session, matches, params={"season": current})
+        results.append(check("stale entry revalidated with If-None-Match, 304 reuses the body",
+                             revalidated.from_cache and seen[-1][1] is not None
+                             and revalidated.json()["path"].startswith("/v4/competitions/PL/matches")))
+
+        before = len(seen)
+        cache.request(session, matches, params={"season": past})
+        cache.request(session, matches, params={"season": past})
+        results.append(check("historical season never expires despite a matching rule",
+                             len(seen) == before + 1 and cache.ttl_for(matches, {"season": past}) is None))
+
+        print("TTL rules:")
+        results.append(check("rule TTL for a matching current-season URL",
+                             cache.ttl_for(matches, {"season": current}) == 0))
+        results.append(check("default TTL for an undated URL", cache.ttl_for(f"{base}/areas") == 3600))
+        shared = HttpCache(Path(tmp) / "b", ttl_rules=HTTP_CACHE_TTL_RULES)
+        fbref = f"https://fbref.com/en/comps/9/{current}-{current + 1}/stats/{current}-{current + 1}-Premier-League-Stats"
+        results.append(check("HTTP_CACHE_TTL_RULES apply to team lists and FBref pages",
+                             shared.ttl_for(teams, {"season": current}) == 24 * 3600
+                             and shared.ttl_for(fbref) == 6 * 3600))
+
+        print("LRU eviction:")
+        small = HttpCache(Path(tmp) / "c", max_bytes=1200, default_ttl=3600)
+        urls = [f"{base}/teams/{team_id}" for team_id in (1, 2, 3)]
+        small.request(session, urls[0])
+        small.request(session, urls[1])
+        small.request(session, urls[0])  # touch: urls[1] is now least recently used
+        small.request(session, urls[2])
+        cached = {meta["url"] for meta in small._index.values()}
+        results.append(check("least-recently-used entry evicted under max_bytes",
+                             cached == {urls[0], urls[2]} and small._total_bytes <= small.max_bytes))
+
+    server.shutdown()
+    print(f"\n{'[OK]' if all(results) else '[ERROR]'} {sum(results)}/{len(results)} checks passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
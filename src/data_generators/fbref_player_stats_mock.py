@@ -1,20 +1,32 @@
 """
 FBRef Player Stats Mock Data Generator
 
-Generates realistic mock player stats CSV files for each EPL season.
-Output: data/raw/fbref_player_stats/{season}_player_stats.csv
+Generates realistic mock player stats for EPL seasons with NumPy, one column
+at a time, so load-test volumes (10M+ rows) are produced in seconds. Output is
+seeded and therefore reproducible for a given set of cardinalities.
+
+Output:
+  - csv:     data/raw/fbref_player_stats/{season}_player_stats.csv (one file per season)
+  - parquet: data/raw/fbref_player_stats/player_stats.parquet (single file)
+  - staging: bulk insert into stg_player_stats_fbref
 
 Usage:
     python src/data_generators/fbref_player_stats_mock.py
+    python -m src.data_generators.fbref_player_stats_mock --teams 200 --seasons 50 --players-per-team 1000 --format parquet
+    python -m src.data_generators.fbref_player_stats_mock --format staging --truncate
 """
 
-import os
-import pandas as pd
+import argparse
+import time
 from pathlib import Path
-from random import randint, choice, seed
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
 
-# Set seed for reproducibility
-seed(42)
+DEFAULT_SEED = 42
+DEFAULT_OUTPUT_DIR = Path("data/raw/fbref_player_stats")
+FIRST_SEASON = 2017
 
 # EPL Teams
 TEAMS = [
@@ -40,89 +52,224 @@ BASE_PLAYERS = [
 
 SEASONS = ['2017-2018', '2018-2019', '2019-2020', '2020-2021', '2021-2022', '2022-2023', '2023-2024']
 
+# FBref CSV headers -> stg_player_stats_fbref columns
+CSV_TO_STAGING_COLS = {
+    'Player': 'player_name',
+    'Squad': 'team_name',
+    'Min': 'minutes_played',
+    'Gls': 'goals',
+    'Ast': 'assists',
+    'Sh': 'shots',
+    'SoT': 'shots_on_target',
+    'CrdY': 'yellow_cards',
+    'CrdR': 'red_cards',
+    'xG': 'xg',
+    'xA': 'xa',
+    'Season': 'season_label',
+}
 
-def generate_season_stats(season: str, num_matches_per_team: int = 30) -> pd.DataFrame:
-    """Generate mock player stats for a season."""
-    rows = []
-    
-    for team in TEAMS:
-        # 20-25 players per team
-        num_players = 22 + len(team) % 4
-        
-        for i in range(num_players):
-            player_name = BASE_PLAYERS[i % len(BASE_PLAYERS)]
-            # Add small variation so not exact duplicates across seasons
-            if i % 5 == 0:
-                player_name = f"{player_name} Jr."
-            
-            # Vary by team and season
-            team_hash = hash(team) % 1000
-            season_hash = hash(season) % 1000
-            player_hash = hash(player_name + team + season) % 1000
-            
-            # Minutes played (0-2700, or 0 for unused players)
-            if randint(1, 100) <= 70:  # 70% chance player actually played
-                minutes_base = 1200 + (player_hash % 1500)
-                minutes_played = max(0, minutes_base)
-            else:
-                minutes_played = 0
-            
-            # Stats scale with minutes
-            minute_factor = minutes_played / 1500.0 if minutes_played > 0 else 0
-            
-            goals = max(0, int(minute_factor * (5 + (player_hash % 10))) - 2)
-            assists = max(0, int(minute_factor * (3 + (player_hash % 8))) - 1)
-            shots = max(0, int(minute_factor * (4 + (player_hash % 6))))
-            shots_on_target = max(0, int(shots * 0.4))
-            yellow_cards = randint(0, 3) if minutes_played > 500 else 0
-            red_cards = 1 if randint(1, 100) > 95 and minutes_played > 1000 else 0
-            xg = round(minute_factor * (2.5 + (player_hash % 100) / 100.0), 2)
-            xa = round(minute_factor * (1.5 + (player_hash % 100) / 100.0), 2)
-            
-            rows.append({
-                'Player': player_name,
-                'Squad': team,
-                'Min': minutes_played,
-                'Gls': goals,
-                'Ast': assists,
-                'Sh': shots,
-                'SoT': shots_on_target,
-                'CrdY': yellow_cards,
-                'CrdR': red_cards,
-                'xG': xg,
-                'xA': xa,
-                'Season': season,
-            })
-    
-    return pd.DataFrame(rows)
 
+def team_names(n_teams: int) -> list:
+    """First n EPL team names; beyond the real list, numbered variants are added."""
+    return [TEAMS[i] if i < len(TEAMS) else f"{TEAMS[i % len(TEAMS)]} {i // len(TEAMS) + 1}"
+            for i in range(n_teams)]
 
-def main():
-    """Generate all season CSVs."""
-    output_dir = Path("data/raw/fbref_player_stats")
+
+def season_labels(n_seasons: int, first_season: int = FIRST_SEASON) -> list:
+    return [f"{year}-{year + 1}" for year in range(first_season, first_season + n_seasons)]
+
+
+def player_names(players_per_team: int, base_players: Sequence[str] = BASE_PLAYERS,
+                 juniors: bool = True) -> list:
+    """Squad-slot names; every fifth slot gets ' Jr.' (unless juniors is False) and later laps a number."""
+    names = []
+    for i in range(players_per_team):
+        name = base_players[i % len(base_players)]
+        lap = i // len(base_players)
+        if lap:
+            name = f"{name} {lap + 1}"
+        if juniors and i % 5 == 0:
+            name = f"{name} Jr."
+        names.append(name)
+    return names
+
+
+def generate_player_stats(
+    n_teams: int = len(TEAMS),
+    n_seasons: int = len(SEASONS),
+    players_per_team: int = 23,
+    seed: int = DEFAULT_SEED,
+    first_season: int = FIRST_SEASON,
+    names: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Generate one row per (season, team, squad slot) with FBref column names.
+
+    Player, Squad and Season are categoricals built from integer codes, so no
+    Python-level loop runs per row.
+
+    Args:
+        n_teams: Number of distinct teams
+        n_seasons: Number of consecutive seasons starting at first_season
+        players_per_team: Squad size per team per season
+        seed: NumPy RNG seed (same seed + cardinalities -> same data)
+        first_season: Start year of the first season
+        names: Squad-slot player names (default: player_names(players_per_team))
+
+    Returns:
+        DataFrame with n_seasons * n_teams * players_per_team rows
+    """
+    rng = np.random.default_rng(seed)
+    n_rows = n_seasons * n_teams * players_per_team
+
+    row = np.arange(n_rows, dtype=np.int64)
+    player_code = row % players_per_team
+    team_code = (row // players_per_team) % n_teams
+    season_code = row // (players_per_team * n_teams)
+
+    # Per-player "ability" drives the scale of attacking output. A player is a
+    # squad slot of a team, so it is drawn once per player and kept across seasons
+    ability = rng.integers(0, 1000, size=n_teams * players_per_team)[team_code * players_per_team + player_code]
+
+    # 70% of squad players actually get minutes
+    played = rng.random(n_rows) < 0.70
+    minutes = np.where(played, 1200 + ability % 1500, 0)
+    minute_factor = minutes / 1500.0
+
+    goals = np.maximum(0, (minute_factor * (5 + ability % 10)).astype(np.int64) - 2)
+    assists = np.maximum(0, (minute_factor * (3 + ability % 8)).astype(np.int64) - 1)
+    shots = (minute_factor * (4 + ability % 6)).astype(np.int64)
+    shots_on_target = (shots * 0.4).astype(np.int64)
+    yellow_cards = np.where(minutes > 500, rng.integers(0, 4, size=n_rows), 0)
+    red_cards = ((rng.random(n_rows) < 0.05) & (minutes > 1000)).astype(np.int64)
+    xg = np.round(minute_factor * (2.5 + (ability % 100) / 100.0), 2)
+    xa = np.round(minute_factor * (1.5 + (ability % 100) / 100.0), 2)
+
+    return pd.DataFrame({
+        'Player': pd.Categorical.from_codes(
+            player_code, list(names) if names is not None else player_names(players_per_team)),
+        'Squad': pd.Categorical.from_codes(team_code, team_names(n_teams)),
+        'Min': minutes,
+        'Gls': goals,
+        'Ast': assists,
+        'Sh': shots,
+        'SoT': shots_on_target,
+        'CrdY': yellow_cards,
+        'CrdR': red_cards,
+        'xG': xg,
+        'xA': xa,
+        'Season': pd.Categorical.from_codes(season_code, season_labels(n_seasons, first_season)),
+    })
+
+
+def generate_season_stats(season: str, num_matches_per_team: int = 30, *,
+                          num_players: int = 23, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """Generate mock player stats for a single season label ('YYYY-YYYY').
+
+    num_matches_per_team is kept for callers of the original signature; as
+    before, it does not affect the output. Squad size is num_players.
+    """
+    return generate_player_stats(n_seasons=1, players_per_team=num_players, seed=seed,
+                                 first_season=int(season[:4]))
+
+
+def to_staging_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Rename FBref headers to stg_player_stats_fbref columns."""
+    return df.rename(columns=CSV_TO_STAGING_COLS)
+
+
+def write_csv(df: pd.DataFrame, output_dir: Path = DEFAULT_OUTPUT_DIR) -> list:
+    """Write one {season}_player_stats.csv per season; returns the paths written."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for season, season_df in df.groupby('Season', observed=True, sort=True):
+        output_file = output_dir / f"{season}_player_stats.csv"
+        season_df.to_csv(output_file, index=False)
+        paths.append(output_file)
+    return paths
+
+
+def write_parquet(df: pd.DataFrame, output_dir: Path = DEFAULT_OUTPUT_DIR) -> Path:
+    """Write all seasons to a single player_stats.parquet (requires pyarrow)."""
+    output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
-    
+    output_file = output_dir / "player_stats.parquet"
+    df.to_parquet(output_file, index=False)
+    return output_file
+
+
+def load_staging(df: pd.DataFrame, engine=None, truncate: bool = False, chunksize: int = 50_000) -> int:
+    """Bulk insert into stg_player_stats_fbref in one transaction.
+
+    Each chunk is sent as a single executemany, which the driver batches into
+    multi-row INSERTs.
+
+    Args:
+        df: Frame from generate_player_stats
+        engine: SQLAlchemy engine (defaults to the shared ETL engine)
+        truncate: Clear the staging table first
+        chunksize: Rows per executemany call
+
+    Returns:
+        Number of rows inserted
+    """
+    from sqlalchemy import text
+
+    if engine is None:
+        from src.etl.db import get_engine
+        engine = get_engine()
+
+    staged = to_staging_frame(df)
+    columns = list(CSV_TO_STAGING_COLS.values())
+    insert_sql = text(
+        f"INSERT INTO stg_player_stats_fbref ({', '.join(columns)}) "
+        f"VALUES ({', '.join(':' + c for c in columns)})"
+    )
+
+    with engine.begin() as conn:
+        if truncate:
+            conn.execute(text('DELETE FROM stg_player_stats_fbref'))
+        for start in range(0, len(staged), chunksize):
+            chunk = staged.iloc[start:start + chunksize].astype(object)
+            conn.execute(insert_sql, chunk.to_dict('records'))
+    return len(staged)
+
+
+def main():
+    """Generate mock player stats and write them to CSV, Parquet or staging."""
+    parser = argparse.ArgumentParser(description="Generate mock FBref player stats")
+    parser.add_argument('--teams', type=int, default=len(TEAMS), help='Number of teams')
+    parser.add_argument('--seasons', type=int, default=len(SEASONS), help=f'Number of seasons from {FIRST_SEASON}')
+    parser.add_argument('--players-per-team', type=int, default=23, help='Squad size per team per season')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='RNG seed')
+    parser.add_argument('--format', choices=['csv', 'parquet', 'staging'], default='csv', help='Output target')
+    parser.add_argument('--output-dir', type=Path, default=DEFAULT_OUTPUT_DIR, help='Directory for csv/parquet output')
+    parser.add_argument('--truncate', action='store_true', help='Clear stg_player_stats_fbref before --format staging')
+    args = parser.parse_args()
+
     print("\n" + "="*80)
     print("GENERATING MOCK FBRef PLAYER STATS")
     print("="*80 + "\n")
-    
-    total_rows = 0
-    
-    for season in SEASONS:
-        df = generate_season_stats(season)
-        
-        season_slug = season.replace('-', '_').lower()
-        output_file = output_dir / f"{season}_player_stats.csv"
-        
-        df.to_csv(output_file, index=False)
-        
-        num_rows = len(df)
-        total_rows += num_rows
-        
-        print(f"✅ Created {output_file.relative_to('.')} ({num_rows:,} rows)")
-    
+
+    started = time.perf_counter()
+    df = generate_player_stats(args.teams, args.seasons, args.players_per_team, seed=args.seed)
+    print(f"✅ Generated {len(df):,} rows in {time.perf_counter() - started:.2f}s "
+          f"({args.seasons} seasons x {args.teams} teams x {args.players_per_team} players)")
+
+    started = time.perf_counter()
+    if args.format == 'csv':
+        for output_file in write_csv(df, args.output_dir):
+            print(f"✅ Created {output_file}")
+    elif args.format == 'parquet':
+        print(f"✅ Created {write_parquet(df, args.output_dir)}")
+    else:
+        load_staging(df, truncate=args.truncate)
+        print("✅ Loaded into stg_player_stats_fbref")
+    elapsed = time.perf_counter() - started
+
     print("\n" + "="*80)
-    print(f"✅ TOTAL: {total_rows:,} mock player stats rows generated")
+    print(f"✅ TOTAL: {len(df):,} mock player stats rows written in {elapsed:.2f}s "
+          f"({len(df) / elapsed if elapsed else 0:,.0f} rows/sec)")
     print("="*80 + "\n")
 
 
@@ -0,0 +1,421 @@
+"""
+StatsBomb Events Mock Data Generator
+
+Generates a deterministic synthetic corpus in the StatsBomb open-data layout so
+statsbomb_reader can be benchmarked offline at 1x, 10x or 100x the EPL corpus
+(one EPL season = 380 matches):
+
+    <output>/data/events/<match_id>.json         one list of events per match
+    <output>/data/matches/2/<season_id>.json      match metadata per season
+
+Events follow the open-data event schema (type/team/player/position objects,
+locations, nested pass/shot/carry/duel objects, possession chains, Starting XI
+tactics) with an event-type mix close to a real EPL match. Each match is
+generated from its own seeded RNG, so any subset of files is reproducible and
+files can be written in parallel.
+
+Replica seasons cycle through season ids 27/28/29, the ids get_epl_match_ids()
+looks for. Point the reader at the corpus with STATSBOMB_DATA_DIR=<output>.
+
+Usage:
+    python -m src.data_generators.statsbomb_events_mock --scale 1
+    python -m src.data_generators.statsbomb_events_mock --scale 10 --events-per-match 1000 --workers 8
+    STATSBOMB_DATA_DIR=data/raw/statsbomb_synthetic python -m src.etl.extract.statsbomb_reader
+"""
+
+import argparse
+import json
+import math
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_SEED = 42
+DEFAULT_OUTPUT_DIR = Path("data/raw/statsbomb_synthetic")
+MATCHES_PER_SEASON = 380
+EVENTS_PER_MATCH = 3500
+FIRST_MATCH_ID = 9_000_000
+
+COMPETITION = {"competition_id": 2, "country_name": "England", "competition_name": "Premier League"}
+
+# StatsBomb EPL season ids preferred by the reader
+SEASONS = {27: ("2015/2016", 2015), 28: ("2016/2017", 2016), 29: ("2017/2018", 2017)}
+
+TEAMS = [
+    (1, "Arsenal"), (2, "Aston Villa"), (3, "Bournemouth"), (4, "Chelsea"),
+    (5, "Crystal Palace"), (6, "Everton"), (7, "Leicester City"), (8, "Liverpool"),
+    (9, "Manchester City"), (10, "Manchester United"), (11, "Newcastle United"), (12, "Norwich City"),
+    (13, "Southampton"), (14, "Stoke City"), (15, "Sunderland"), (16, "Swansea City"),
+    (17, "Tottenham Hotspur"), (18, "Watford"), (19, "West Bromwich Albion"), (20, "West Ham United"),
+]
+
+_TEAM_NAMES = dict(TEAMS)
+
+# (position id, position name) for a 4-2-3-1 starting XI
+POSITIONS = [
+    (1, "Goalkeeper"), (2, "Right Back"), (3, "Right Center Back"), (5, "Left Center Back"),
+    (6, "Left Back"), (10, "Right Defensive Midfield"), (11, "Left Defensive Midfield"),
+    (12, "Right Midfield"), (19, "Center Attacking Midfield"), (16, "Left Midfield"), (23, "Center Forward"),
+]
+
+# (type id, type name, share of in-play events) - roughly a real EPL match
+EVENT_TYPES = [
+    (30, "Pass", 0.300), (42, "Ball Receipt*", 0.285), (43, "Carry", 0.240),
+    (17, "Pressure", 0.090), (2, "Ball Recovery", 0.025), (4, "Duel", 0.014),
+    (9, "Clearance", 0.011), (23, "Goal Keeper", 0.008), (16, "Shot", 0.007),
+    (38, "Miscontrol", 0.007), (6, "Block", 0.007), (14, "Dribble", 0.007),
+    (22, "Foul Committed", 0.006), (21, "Foul Won", 0.006), (39, "Dribbled Past", 0.006),
+    (3, "Dispossessed", 0.006), (10, "Interception", 0.004),
+]
+_TYPE_IDS = np.array([t[0] for t in EVENT_TYPES])
+_TYPE_NAMES = {t[0]: t[1] for t in EVENT_TYPES}
+_TYPE_P = np.array([t[2] for t in EVENT_TYPES])
+_TYPE_P = _TYPE_P / _TYPE_P.sum()
+
+# Events performed by the team out of possession
+DEFENSIVE_TYPES = {17, 4, 9, 23, 6, 22, 39, 10}
+
+PLAY_PATTERNS = [(1, "Regular Play"), (4, "From Throw In"), (2, "From Corner"),
+                 (3, "From Free Kick"), (9, "From Kick Off"), (7, "From Goal Kick"), (6, "From Counter")]
+_PLAY_PATTERN_P = np.array([0.45, 0.22, 0.06, 0.1, 0.04, 0.08, 0.05])
+
+SHOT_OUTCOMES = [(97, "Goal"), (100, "Saved"), (98, "Off T"), (96, "Blocked"), (101, "Wayward"), (99, "Post")]
+_SHOT_OUTCOME_P = np.array([0.11, 0.27, 0.30, 0.25, 0.05, 0.02])
+
+PASS_HEIGHTS = [(1, "Ground Pass"), (2, "Low Pass"), (3, "High Pass")]
+_PASS_HEIGHT_P = np.array([0.72, 0.1, 0.18])
+
+BODY_PARTS = [(40, "Right Foot"), (38, "Left Foot"), (37, "Head")]
+_BODY_PART_P = np.array([0.6, 0.3, 0.1])
+
+DUEL_TYPES = [(11, "Tackle"), (10, "Aerial Lost")]
+DUEL_OUTCOMES = [(4, "Won"), (16, "Success In Play"), (13, "Lost In Play")]
+
+
+# Stable synthetic player identity per (team, squad slot)
+_PLAYERS = {
+    team_id: [{"id": team_id * 1000 + slot, "name": f"{name} Player {slot + 1}"} for slot in range(len(POSITIONS))]
+    for team_id, name in TEAMS
+}
+
+
+def _named(pair) -> dict:
+    return {"id": int(pair[0]), "name": pair[1]}
+
+
+def _player(team_id: int, slot: int) -> dict:
+    """Stable synthetic player identity for a squad slot."""
+    return _PLAYERS[team_id][slot]
+
+
+def _timestamp(seconds: float) -> str:
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
+
+
+def _location(x: float, y: float) -> list:
+    return [round(x, 1), round(y, 1)]
+
+
+def fixture_list() -> list:
+    """Double round-robin (circle method): 38 match weeks x 10 = 380 (week, home_id, away_id)."""
+    team_ids = [team_id for team_id, _ in TEAMS]
+    n = len(team_ids)
+    rotation = team_ids[:]
+    first_half = []
+    for week in range(n - 1):
+        for i in range(n // 2):
+            home, away = rotation[i], rotation[n - 1 - i]
+            first_half.append((week + 1, home, away) if week % 2 == 0 else (week + 1, away, home))
+        rotation = [rotation[0]] + [rotation[-1]] + rotation[1:-1]
+    second_half = [(week + n - 1, away, home) for week, home, away in first_half]
+    return first_half + second_half
+
+
+def match_plan(scale: int, seed: int = DEFAULT_SEED) -> list:
+    """One metadata stub per synthetic match: id, season, week, teams, kick-off date.
+
+    Args:
+        scale: Number of 380-match EPL seasons to produce
+        seed: Corpus seed (stored so each match can be regenerated independently)
+
+    Returns:
+        List of plan dicts, in match_id order
+    """
+    fixtures = fixture_list()
+    season_ids = list(SEASONS)
+    plan = []
+    for replica in range(scale):
+        season_id = season_ids[replica % len(season_ids)]
+        season_start = date(SEASONS[season_id][1], 8, 8)
+        for idx, (week, home_id, away_id) in enumerate(fixtures):
+            plan.append({
+                "match_id": FIRST_MATCH_ID + replica * MATCHES_PER_SEASON + idx,
+                "season_id": season_id,
+                "match_week": week,
+                "home_team_id": home_id,
+                "away_team_id": away_id,
+                "match_date": (season_start + timedelta(weeks=week - 1, days=idx % 3)).isoformat(),
+                "seed": seed,
+            })
+    return plan
+
+
+def generate_match_events(match: dict, events_per_match: int = EVENTS_PER_MATCH) -> list:
+    """Generate the event list for one planned match.
+
+    The RNG is seeded from (corpus seed, match_id), so the same match always
+    produces the same events regardless of which worker writes it.
+
+    Args:
+        match: Entry from match_plan()
+        events_per_match: Approximate number of events (excluding set-up events)
+
+    Returns:
+        List of StatsBomb-style event dicts
+    """
+    rng = np.random.default_rng([match["seed"], match["match_id"]])
+    home_id, away_id = match["home_team_id"], match["away_team_id"]
+    teams = {home_id: {"id": home_id, "name": _TEAM_NAMES[home_id]},
+             away_id: {"id": away_id, "name": _TEAM_NAMES[away_id]}}
+    n = events_per_match
+
+    # Column-wise draws for the whole match
+    type_ids = rng.choice(_TYPE_IDS, size=n, p=_TYPE_P)
+    # ~12 events per possession; possession flips between the two teams
+    possession = np.cumsum(rng.random(n) < 1 / 12) + 2
+    possession_home = (possession + rng.integers(0, 2)) % 2 == 0
+    is_defensive = np.isin(type_ids, list(DEFENSIVE_TYPES))
+    acting_home = possession_home ^ is_defensive
+    slots = rng.integers(1, len(POSITIONS), size=n)  # outfield players act most
+    slots[type_ids == 23] = 0  # goalkeeper events belong to the keeper
+    xs = rng.uniform(0, 120, size=n)
+    ys = rng.uniform(0, 80, size=n)
+    dxs = rng.normal(8, 14, size=n)
+    dys = rng.normal(0, 12, size=n)
+    recipients = rng.integers(1, len(POSITIONS), size=n)
+    pass_heights = rng.choice(len(PASS_HEIGHTS), size=n, p=_PASS_HEIGHT_P)
+    body_parts = rng.choice(len(BODY_PARTS), size=n, p=_BODY_PART_P)
+    shot_outcomes = rng.choice(len(SHOT_OUTCOMES), size=n, p=_SHOT_OUTCOME_P)
+    shot_xg = np.round(rng.beta(1.2, 9, size=n), 6)
+    durations = np.round(rng.exponential(1.2, size=n), 6)
+    patterns = rng.choice(len(PLAY_PATTERNS), size=n, p=_PLAY_PATTERN_P)
+    duel_types = rng.integers(0, len(DUEL_TYPES), size=n)
+    duel_outcomes = rng.integers(0, len(DUEL_OUTCOMES), size=n)
+    uuid_bytes = rng.bytes(16 * (n + 2))
+    # Two halves of ~47 minutes each, events in time order
+    half_split = n // 2
+    clock = np.concatenate([np.sort(rng.uniform(0, 2820, size=half_split)),
+                            np.sort(rng.uniform(0, 2880, size=n - half_split))])
+
+    events = []
+    for index, team_id in enumerate((home_id, away_id), start=1):
+        events.append({
+            "id": str(uuid.UUID(bytes=uuid_bytes[16 * (index - 1):16 * index], version=4)),
+            "index": index,
+            "period": 1,
+            "timestamp": "00:00:00.000",
+            "minute": 0,
+            "second": 0,
+            "type": {"id": 35, "name": "Starting XI"},
+            "possession": 1,
+            "possession_team": teams[home_id],
+            "play_pattern": {"id": 1, "name": "Regular Play"},
+            "team": teams[team_id],
+            "duration": 0.0,
+            "tactics": {
+                "formation": 4231,
+                "lineup": [
+                    {"player": _player(team_id, slot), "position": _named(POSITIONS[slot]),
+                     "jersey_number": slot + 1}
+                    for slot in range(len(POSITIONS))
+                ],
+            },
+        })
+
+    for i in range(n):
+        type_id = int(type_ids[i])
+        period = 1 if i < half_split else 2
+        seconds = float(clock[i])
+        team_id = home_id if acting_home[i] else away_id
+        possession_team_id = home_id if possession_home[i] else away_id
+        slot = int(slots[i])
+        x, y = float(xs[i]), float(ys[i])
+        event = {
+            "id": str(uuid.UUID(bytes=uuid_bytes[16 * (i + 2):16 * (i + 3)], version=4)),
+            "index": len(events) + 1,
+            "period": period,
+            "timestamp": _timestamp(seconds),
+            "minute": int(seconds // 60) + (45 if period == 2 else 0),
+            "second": int(seconds % 60),
+            "type": {"id": type_id, "name": _TYPE_NAMES[type_id]},
+            "possession": int(possession[i]),
+            "possession_team": teams[possession_team_id],
+            "play_pattern": _named(PLAY_PATTERNS[patterns[i]]),
+            "team": teams[team_id],
+            "player": _player(team_id, slot),
+            "position": _named(POSITIONS[slot]),
+            "location": _location(x, y),
+            "duration": float(durations[i]),
+        }
+        end_x = min(120.0, max(0.0, x + float(dxs[i])))
+        end_y = min(80.0, max(0.0, y + float(dys[i])))
+
+        if type_id == 30:
+            recipient = int(recipients[i])
+            if recipient == slot:
+                recipient = (recipient % (len(POSITIONS) - 1)) + 1
+            event["pass"] = {
+                "recipient": _player(team_id, recipient),
+                "length": round(math.hypot(end_x - x, end_y - y), 6),
+                "angle": round(math.atan2(end_y - y, end_x - x), 6),
+                "height": _named(PASS_HEIGHTS[pass_heights[i]]),
+                "end_location": _location(end_x, end_y),
+                "body_part": _named(BODY_PARTS[body_parts[i]]),
+            }
+        elif type_id == 43:
+            event["carry"] = {"end_location": _location(min(120.0, x + abs(float(dxs[i])) / 3), end_y)}
+        elif type_id == 16:
+            # Shots come from the attacking third, aimed at the goal mouth
+            event["location"] = _location(96 + x / 5, 18 + y / 2)
+            event["shot"] = {
+                "statsbomb_xg": float(shot_xg[i]),
+                "end_location": [120.0, round(36 + y / 10, 1), round(float(durations[i]), 1)],
+                "outcome": _named(SHOT_OUTCOMES[shot_outcomes[i]]),
+                "technique": {"id": 93, "name": "Normal"},
+                "body_part": _named(BODY_PARTS[body_parts[i]]),
+                "type": {"id": 87, "name": "Open Play"},
+            }
+        elif type_id == 4:
+            event["duel"] = {"type": _named(DUEL_TYPES[duel_types[i]]),
+                             "outcome": _named(DUEL_OUTCOMES[duel_outcomes[i]])}
+        events.append(event)
+
+    return events
+
+
+def match_metadata(match: dict, events: list) -> dict:
+    """matches/<comp>/<season>.json entry; the score is counted from the generated goals."""
+    home_id, away_id = match["home_team_id"], match["away_team_id"]
+    goals = {home_id: 0, away_id: 0}
+    for event in events:
+        if event.get("shot", {}).get("outcome", {}).get("name") == "Goal":
+            goals[event["team"]["id"]] += 1
+    season_name = SEASONS[match["season_id"]][0]
+    return {
+        "match_id": match["match_id"],
+        "match_date": match["match_date"],
+        "kick_off": "15:00:00.000",
+        "competition": COMPETITION,
+        "season": {"season_id": match["season_id"], "season_name": season_name},
+        "home_team": {"home_team_id": home_id, "home_team_name": _TEAM_NAMES[home_id],
+                      "home_team_gender": "male", "country": {"id": 68, "name": "England"}},
+        "away_team": {"away_team_id": away_id, "away_team_name": _TEAM_NAMES[away_id],
+                      "away_team_gender": "male", "country": {"id": 68, "name": "England"}},
+        "home_score": goals[home_id],
+        "away_score": goals[away_id],
+        "match_status": "available",
+        "match_week": match["match_week"],
+        "competition_stage": {"id": 1, "name": "Regular Season"},
+        "stadium": {"id": home_id, "name": f"{_TEAM_NAMES[home_id]} Stadium"},
+        "referee": {"id": 100 + match["match_id"] % 20, "name": f"Referee {match['match_id'] % 20 + 1}"},
+    }
+
+
+def _write_match(args) -> tuple:
+    """Worker: generate and write one match file; returns (metadata, event count)."""
+    match, events_dir, events_per_match = args
+    events = generate_match_events(match, events_per_match)
+    # dumps + one write is much faster than json.dump's many small writes
+    (Path(events_dir) / f"{match['match_id']}.json").write_text(
+        json.dumps(events, ensure_ascii=False), encoding="utf-8")
+    return match_metadata(match, events), len(events)
+
+
+def generate_corpus(
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    scale: int = 1,
+    events_per_match: int = EVENTS_PER_MATCH,
+    seed: int = DEFAULT_SEED,
+    workers: int = 1,
+    limit_matches: int = None,
+) -> dict:
+    """Write a synthetic StatsBomb corpus.
+
+    Args:
+        output_dir: Corpus root (gets data/events and data/matches/2)
+        scale: Number of 380-match seasons (1x, 10x, 100x the EPL corpus)
+        events_per_match: Approximate events per match file
+        seed: Corpus seed
+        workers: Processes used to generate and write match files
+        limit_matches: Optional cap on matches written (for quick tests)
+
+    Returns:
+        Summary dict with matches, events, bytes and seconds
+    """
+    output_dir = Path(output_dir)
+    events_dir = output_dir / "data" / "events"
+    matches_dir = output_dir / "data" / "matches" / str(COMPETITION["competition_id"])
+    events_dir.mkdir(parents=True, exist_ok=True)
+    matches_dir.mkdir(parents=True, exist_ok=True)
+
+    plan = match_plan(scale, seed)
+    if limit_matches:
+        plan = plan[:limit_matches]
+
+    started = time.perf_counter()
+    jobs = [(match, str(events_dir), events_per_match) for match in plan]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_write_match, jobs, chunksize=16))
+    else:
+        results = [_write_match(job) for job in jobs]
+
+    by_season = {}
+    for metadata, _ in results:
+        by_season.setdefault(metadata["season"]["season_id"], []).append(metadata)
+    for season_id, matches in by_season.items():
+        with open(matches_dir / f"{season_id}.json", "w", encoding="utf-8") as f:
+            json.dump(matches, f, ensure_ascii=False)
+
+    total_bytes = sum(f.stat().st_size for f in events_dir.glob("*.json"))
+    return {
+        "matches": len(results),
+        "events": sum(count for _, count in results),
+        "bytes": total_bytes,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main():
+    """Generate a synthetic StatsBomb corpus from the command line."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic StatsBomb event corpus")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR, help="Corpus root directory")
+    parser.add_argument("--scale", type=int, default=1, help="Number of 380-match EPL seasons (1, 10, 100)")
+    parser.add_argument("--events-per-match", type=int, default=EVENTS_PER_MATCH, help="Approximate events per match")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Corpus seed")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--limit-matches", type=int, default=None, help="Only write the first N matches")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("GENERATING SYNTHETIC STATSBOMB EVENTS")
+    print("="*80 + "\n")
+
+    summary = generate_corpus(args.output_dir, args.scale, args.events_per_match,
+                              args.seed, args.workers, args.limit_matches)
+
+    print(f"✅ {summary['matches']:,} matches, {summary['events']:,} events, "
+          f"{summary['bytes'] / 1024 / 1024:,.1f} MB in {summary['seconds']:.1f}s")
+    print(f"   Corpus root: {args.output_dir}")
+    print(f"   Load with: STATSBOMB_DATA_DIR={args.output_dir}")
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
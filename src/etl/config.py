@@ -24,6 +24,41 @@ def database_url():
     # NOTE: You may need to install the 'mysql-connector-python' package (pip install mysql-connector-python)
     return f"mysql+mysqlconnector://{DATABASE['user']}:{DATABASE['password']}@{DATABASE['host']}:{DATABASE['port']}/{DATABASE['db']}"
 
+# Connection pool sizing (concurrent loaders check out one connection per worker)
+POOL = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+}
+
+# Worker threads used by JSONReader when loading Season_*/ player dumps
+JSON_READER_WORKERS = int(os.getenv("ETL_JSON_WORKERS", "4"))
+
+# Worker threads for independent dimension upserts (each holds one pooled connection)
+UPSERT_WORKERS = int(os.getenv("ETL_UPSERT_WORKERS", "4"))
+
+# Ignore ETL_Watermark and reconcile dimensions against the full staging tables
+FULL_REFRESH = os.getenv("ETL_FULL_REFRESH", "0").lower() in ("1", "true", "yes")
+# Incremental upserts re-read this many seconds before the stored watermark:
+# staging rows are stamped when inserted but become visible when their
+# transaction commits, and concurrent loaders commit out of order
+WATERMARK_LAG_SECONDS = int(os.getenv("ETL_WATERMARK_LAG_SECONDS", "600"))
+
+# Buffered ETL audit writer (event_log): batch size and max seconds a record waits
+LOG_BATCH_SIZE = int(os.getenv("ETL_LOG_BATCH_SIZE", "100"))
+LOG_FLUSH_SECONDS = float(os.getenv("ETL_LOG_FLUSH_SECONDS", "2"))
+
+# SQL script runner (sql_runner): capture query plans, JSON profile report directory
+SQL_EXPLAIN = os.getenv("ETL_SQL_EXPLAIN", "0").lower() in ("1", "true", "yes")
+SQL_PROFILE_DIR = os.getenv("ETL_SQL_PROFILE_DIR", "data/reports/sql_profile")
+
+# Chunked fact_match_events load: StatsBomb matches per chunk, chunks loaded at once
+EVENT_CHUNK_MATCHES = int(os.getenv("ETL_EVENT_CHUNK_MATCHES", "25"))
+FACT_LOAD_WORKERS = int(os.getenv("ETL_FACT_WORKERS", "4"))
+# Where fact_match_events surrogate keys are resolved: "sql" (joins in MySQL)
+# or "python" (transform.key_resolver maps, then bulk insert)
+FACT_KEY_RESOLUTION = os.getenv("ETL_FACT_KEY_RESOLUTION", "sql").lower()
+
 # Other constants
 RAW_DATA_DIR = "data/raw"
-STAGING_DIR = "data/staging"
\ No newline at end of file
+STAGING_DIR = "data/staging"
+CACHE_DIR = os.getenv("ETL_CACHE_DIR", "data/cache")
\ No newline at end of file
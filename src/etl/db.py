@@ -1,7 +1,7 @@
 """SQLAlchemy engine/session helpers."""
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker  # cSpell:ignore sessionmaker
-from .config import database_url
+from .config import database_url, POOL
 from contextlib import contextmanager
 
 
@@ -14,7 +14,13 @@ _SessionLocal = None
 def get_engine():
     global _engine
     if _engine is None:
-        _engine = create_engine(database_url(), echo=False)
+        _engine = create_engine(
+            database_url(),
+            echo=False,
+            pool_size=POOL["pool_size"],
+            max_overflow=POOL["max_overflow"],
+            pool_pre_ping=True,
+        )
     return _engine
 
 
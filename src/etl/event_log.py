@@ -0,0 +1,170 @@
+"""Buffered, asynchronous writer for ETL audit records (etl_log and manifests).
+
+Pipeline steps used to open a connection and commit one INSERT per log row on
+the hot path. Records are now enqueued in memory (timestamps are taken at
+enqueue time) and a background thread writes them in batches:
+  - as soon as ETL_LOG_BATCH_SIZE records are waiting
+  - otherwise every ETL_LOG_FLUSH_SECONDS
+  - immediately on flush(), which blocks until the batch is written
+    (call it on failure paths, before returning an error)
+  - on close(), registered with atexit for the shared loggers
+Each batch is one transaction with one executemany per (table, columns).
+A failed batch is reported and dropped: auditing never fails a pipeline step.
+
+Exposed:
+- EtlEventLogger(engine, batch_size, flush_interval) -> logger instance
+- EtlEventLogger.log(job_name, phase_step, status, start_time, end_time, rows_processed, message) -> None
+- EtlEventLogger.record(table, row) -> None
+- EtlEventLogger.flush(timeout) -> bool
+- EtlEventLogger.close(timeout) -> None
+- get_event_logger(engine) -> shared EtlEventLogger for that engine (default: get_engine())
+"""
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+from .config import LOG_BATCH_SIZE, LOG_FLUSH_SECONDS
+
+# Queue items: ("row", table, dict) | ("flush", Event) | ("stop", Event)
+_ROW, _FLUSH, _STOP = "row", "flush", "stop"
+
+
+class EtlEventLogger:
+    """Queue of audit rows drained in batches by a daemon writer thread."""
+
+    def __init__(self, engine, batch_size: int = LOG_BATCH_SIZE, flush_interval: float = LOG_FLUSH_SECONDS):
+        """
+        Args:
+            engine: SQLAlchemy engine the records are written with
+            batch_size: Records that trigger a write without waiting for the interval
+            flush_interval: Seconds a record may wait before it is written
+        """
+        self.engine = engine
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="etl-event-log", daemon=True)
+        self._thread.start()
+
+    def log(
+        self,
+        job_name: str,
+        phase_step: str,
+        status: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        rows_processed: Optional[int] = None,
+        message: str = "",
+    ) -> None:
+        """Enqueue one etl_log row."""
+        self.record("etl_log", {
+            "job_name": job_name,
+            "phase_step": phase_step,
+            "status": status,
+            "start_time": start_time,
+            "end_time": end_time,
+            "rows_processed": rows_processed,
+            "message": message,
+        })
+
+    def record(self, table: str, row: Dict[str, object]) -> None:
+        """Enqueue one row for any audit table (e.g. ETL_Excel_Manifest)."""
+        if self._closed:
+            # Late records after close() (e.g. from other atexit handlers)
+            self._write({(table, tuple(row)): [row]})
+            return
+        self._queue.put((_ROW, table, dict(row)))
+
+    def flush(self, timeout: Optional[float] = 30.0) -> bool:
+        """Write everything enqueued so far; returns False if the wait timed out."""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Flush pending records and stop the writer thread (idempotent)."""
+        if self._closed:
+            return
+        self._closed = True
+        done = threading.Event()
+        self._queue.put((_STOP, done))
+        done.wait(timeout)
+
+    def _run(self) -> None:
+        pending: List[tuple] = []
+        deadline = None  # when the oldest pending record has waited flush_interval
+        while True:
+            try:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._drain(pending)
+                deadline = None
+                continue
+
+            if item[0] == _ROW:
+                pending.append(item[1:])
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                # A steady trickle never lets get() time out: check the deadline too
+                if len(pending) >= self.batch_size or time.monotonic() >= deadline:
+                    self._drain(pending)
+                    deadline = None
+            else:
+                self._drain(pending)
+                deadline = None
+                item[1].set()
+                if item[0] == _STOP:
+                    return
+
+    def _drain(self, pending: List[tuple]) -> None:
+        """Group pending (table, row) pairs by statement shape and write them."""
+        if not pending:
+            return
+        groups: Dict[tuple, List[dict]] = {}
+        for table, row in pending:
+            groups.setdefault((table, tuple(row)), []).append(row)
+        pending.clear()
+        self._write(groups)
+
+    def _write(self, groups: Dict[tuple, List[dict]]) -> None:
+        count = sum(len(rows) for rows in groups.values())
+        try:
+            with self.engine.begin() as conn:
+                for (table, columns), rows in groups.items():
+                    conn.execute(text(
+                        f"INSERT INTO {table} ({', '.join(columns)}) "
+                        f"VALUES ({', '.join(':' + c for c in columns)})"
+                    ), rows)
+            self.written += count
+        except Exception as e:
+            self.dropped += count
+            print(f"[WARNING] Could not write {count} ETL log records: {e}")
+
+
+_loggers: Dict[object, EtlEventLogger] = {}
+_loggers_lock = threading.Lock()
+
+
+def get_event_logger(engine=None) -> EtlEventLogger:
+    """Shared logger per engine; flushed and stopped at interpreter exit."""
+    if engine is None:
+        from .db import get_engine
+        engine = get_engine()
+    with _loggers_lock:
+        logger = _loggers.get(engine)
+        if logger is None:
+            logger = EtlEventLogger(engine)
+            _loggers[engine] = logger
+            atexit.register(logger.close)
+    return logger
@@ -1,13 +1,20 @@
 """ETL API client for football-data.org.
 Provides functions to fetch data from the football-data.org API
 """
+import os
+import time
 import requests
 import datetime as datetime
 import pandas as pd
 import sqlalchemy
 import pathlib
 import json
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
 from ..db import get_engine
+from .throttle import TokenBucket
+from .http_cache import HttpCache, get_http_cache
 from sqlalchemy import text
 
 
@@ -16,6 +23,127 @@ _headers = {
     "Accept": "application/json"
 }
 
+# Base URL can point at a local stub server for testing
+API_BASE_URL = os.getenv("FOOTBALL_DATA_BASE_URL", "https://api.football-data.org/v4")
+# football-data.org free tier quota
+API_REQUESTS_PER_MINUTE = int(os.getenv("FOOTBALL_DATA_REQUESTS_PER_MINUTE", "10"))
+API_MAX_WORKERS = int(os.getenv("FOOTBALL_DATA_MAX_WORKERS", "4"))
+TEAMS_ENDPOINT = "/competitions/PL/teams"
+
+
+def retry_after_seconds(headers, default: float = 60.0) -> float:
+    """Seconds to wait after a 429, from Retry-After or X-RequestCounter-Reset.
+
+    Retry-After is either delay-seconds or an HTTP-date (RFC 9110); a date is
+    turned into the delay from now. Missing or unparseable values give `default`.
+    """
+    value = headers.get("Retry-After") or headers.get("X-RequestCounter-Reset")
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+class FootballDataClient:
+    """Pooled, rate-limited football-data.org client.
+
+    One requests.Session (keep-alive connection pool sized to the worker count)
+    is shared by all fetches, and a TokenBucket keeps the combined call rate
+    within the per-minute quota. fetch_many() runs requests concurrently.
+    Responses go through the shared HttpCache, so historical seasons are served
+    from disk and only requests that reach the network spend rate-limit budget.
+    """
+
+    def __init__(
+        self,
+        base_url: str = API_BASE_URL,
+        requests_per_minute: int = API_REQUESTS_PER_MINUTE,
+        max_workers: int = API_MAX_WORKERS,
+        timeout: int = 10,
+        max_retries: int = 3,
+        headers: dict | None = None,
+        cache: HttpCache | None = None,
+        use_cache: bool = True,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache if cache is not None else (get_http_cache() if use_cache else None)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_workers = max(1, max_workers)
+        self.limiter = TokenBucket(requests_per_minute)
+        self.session = requests.Session()
+        self.session.headers.update(headers if headers is not None else _headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, endpoint: str, params: dict | None = None) -> dict:
+        """GET an endpoint (e.g. '/competitions/PL/teams') and return parsed JSON.
+
+        Waits on the rate limiter before every network attempt. A 429 response empties
+        the bucket and honours Retry-After / X-RequestCounter-Reset before retrying.
+
+        Raises:
+            requests.exceptions.HTTPError: if response status is 4xx/5xx after retries
+        """
+        url = endpoint if endpoint.startswith("http") else f"{self.base_url}{endpoint}"
+        for attempt in range(1, self.max_retries + 1):
+            if self.cache is not None:
+                resp = self.cache.request(self.session, url, params=params, timeout=self.timeout,
+                                          before_network=self.limiter.acquire)
+            else:
+                self.limiter.acquire()
+                resp = self.session.get(url, params=params, timeout=self.timeout)
+            if resp.status_code == 429 and attempt < self.max_retries:
+                self.limiter.drain()
+                wait = retry_after_seconds(resp.headers)
+                print(f"  Rate limited on {endpoint}; retrying in {wait:.1f}s")
+                time.sleep(wait)
+                continue
+            resp.raise_for_status()
+            return resp.json()
+
+    def fetch_many(self, requests_list: list) -> list:
+        """Fetch several (endpoint, params) pairs concurrently.
+
+        Returns:
+            List aligned with requests_list holding either the parsed JSON dict
+            or the exception raised for that request
+        """
+        def _fetch(req):
+            endpoint, params = req
+            try:
+                return self.get(endpoint, params)
+            except Exception as e:
+                return e
+
+        if not requests_list:
+            return []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="football_data") as pool:
+            return list(pool.map(_fetch, requests_list))
+
+    def fetch_seasons(self, seasons, endpoints=(TEAMS_ENDPOINT,)) -> dict:
+        """Fetch every endpoint for every season concurrently.
+
+        Returns:
+            Dict keyed by (endpoint, season) -> parsed JSON dict or exception
+        """
+        keys = [(endpoint, season) for season in seasons for endpoint in endpoints]
+        results = self.fetch_many([(endpoint, {"season": season}) for endpoint, season in keys])
+        return dict(zip(keys, results))
+
+    def close(self) -> None:
+        self.session.close()
+
 
 def log_api_call(
     api_name: str,
@@ -25,7 +153,8 @@ def log_api_call(
     load_end_time: datetime.datetime = None,
     status: str = "IN_PROGRESS",
     rows_processed: int = None,
-    error_message: str = None
+    error_message: str = None,
+    conn=None
 ) -> None:
     """Log or update an API call in ETL_Api_Manifest table for audit tracking.
     
@@ -41,43 +170,47 @@ def log_api_call(
         status: Status of the operation ('IN_PROGRESS', 'SUCCESS', 'FAILED')
         rows_processed: Number of rows processed/loaded
         error_message: Error message if status is 'FAILED'
+        conn: Optional open connection to reuse; the caller owns its commit
     """
-    try:
-        engine = get_engine()
-        with engine.connect() as conn:
-            # Use INSERT...ON DUPLICATE KEY UPDATE to upsert the record
-            # This ensures we update the same row instead of creating duplicates
-            upsert_query = text("""
-                INSERT INTO ETL_Api_Manifest 
-                (api_name, endpoint, season, load_start_time, load_end_time, 
-                 status, rows_processed, error_message)
-                VALUES 
-                (:api_name, :endpoint, :season, :load_start_time, :load_end_time,
-                 :status, :rows_processed, :error_message)
-                ON DUPLICATE KEY UPDATE
-                    load_end_time = :load_end_time,
-                    status = :status,
-                    rows_processed = :rows_processed,
-                    error_message = :error_message
-            """)
-            
-            start_time = load_start_time or datetime.datetime.now()
-            
-            conn.execute(upsert_query, {
-                "api_name": api_name,
-                "endpoint": endpoint,
-                "season": season,
-                "load_start_time": start_time,
-                "load_end_time": load_end_time or start_time,
-                "status": status,
-                "rows_processed": rows_processed,
-                "error_message": error_message
-            })
-            conn.commit()
-            print(f"OK Logged API call: {api_name} {endpoint} season={season} status={status}")
-    except Exception as e:
-        print(f"ERROR logging API call to manifest: {e}")
-        # Don't raise - logging failure shouldn't break the main process
+    if conn is None:
+        try:
+            with get_engine().begin() as own_conn:
+                log_api_call(api_name, endpoint, season, load_start_time, load_end_time,
+                             status, rows_processed, error_message, conn=own_conn)
+        except Exception as e:
+            print(f"ERROR logging API call to manifest: {e}")
+            # Don't raise - logging failure shouldn't break the main process
+        return
+
+    # Use INSERT...ON DUPLICATE KEY UPDATE to upsert the record
+    # This ensures we update the same row instead of creating duplicates
+    upsert_query = text("""
+        INSERT INTO ETL_Api_Manifest 
+        (api_name, endpoint, season, load_start_time, load_end_time, 
+         status, rows_processed, error_message)
+        VALUES 
+        (:api_name, :endpoint, :season, :load_start_time, :load_end_time,
+         :status, :rows_processed, :error_message)
+        ON DUPLICATE KEY UPDATE
+            load_end_time = :load_end_time,
+            status = :status,
+            rows_processed = :rows_processed,
+            error_message = :error_message
+    """)
+    
+    start_time = load_start_time or datetime.datetime.now()
+    
+    conn.execute(upsert_query, {
+        "api_name": api_name,
+        "endpoint": endpoint,
+        "season": season,
+        "load_start_time": start_time,
+        "load_end_time": load_end_time or start_time,
+        "status": status,
+        "rows_processed": rows_processed,
+        "error_message": error_message
+    })
+    print(f"OK Logged API call: {api_name} {endpoint} season={season} status={status}")
 
 
 
@@ -97,7 +230,8 @@ def normalize_date(value):
     
 
 # Fetch team data from API endpoint.
-def fetch_team_data(url: str | None = None, params: dict | None = None, timeout: int = 10, season: int | None = None) -> dict:
+def fetch_team_data(url: str | None = None, params: dict | None = None, timeout: int = 10, season: int | None = None,
+                    client: FootballDataClient | None = None) -> dict:
     """Fetch team data from API endpoint for a specific season.
     
     Args:
@@ -105,6 +239,7 @@ def fetch_team_data(url: str | None = None, params: dict | None = None, timeout:
         params: optional query parameters (e.g., {"season": 2024})
         timeout: request timeout in seconds
         season: specific season year (if None, uses current year)
+        client: optional shared FootballDataClient (pooled session + rate limiter)
 
     Returns:
         Parsed JSON response as dict
@@ -115,8 +250,11 @@ def fetch_team_data(url: str | None = None, params: dict | None = None, timeout:
     if season is None:
         season = datetime.datetime.now().year
     
+    if client is not None:
+        return client.get(url or TEAMS_ENDPOINT, params if params is not None else {"season": season})
+
     if url is None:
-        url = f"https://api.football-data.org/v4/competitions/PL/teams?season={season}"
+        url = f"{API_BASE_URL}{TEAMS_ENDPOINT}?season={season}"
     
     resp = requests.get(url, headers=_headers, params=params, timeout=timeout)
     resp.raise_for_status()
@@ -138,9 +276,9 @@ def read_json(json_data: dict) -> pd.DataFrame:
     #replace NaN with None
     df = df.where(pd.notnull(df), None)
 
-    # ignore id from DataFrame if present
+    # keep the API team id as stg_team_raw.team_id: it is dim_team's business key
     if 'id' in df.columns:
-        df = df.drop(columns=['id'])
+        df = df.rename(columns={'id': 'team_id'})
     
     #write to staging table
     engine = get_engine()
@@ -153,23 +291,25 @@ def read_json(json_data: dict) -> pd.DataFrame:
     print(df.columns.tolist())
 
 
+    # Shared pooled engine: do not dispose it here, concurrent fetchers reuse it
     res = df.to_sql('stg_team_raw', engine, if_exists='append', index=False)
-    
-    engine.dispose()
-        #with engine.begin() as conn:
-        #   df.to_sql('stg_team_raw', conn, if_exists='append', index=False)    
     print("Inserted rows:", res)
     return df
 
 
-def fetch_and_load_team_data_for_years(start_year: int = 2023, end_year: int | None = None) -> None:
+def fetch_and_load_team_data_for_years(start_year: int = 2023, end_year: int | None = None,
+                                       client: FootballDataClient | None = None) -> None:
     """Fetch team data for a range of years and load all to stg_team_raw table.
     
-    Logs each API call and data load operation to ETL_Api_Manifest for audit tracking.
+    All seasons are fetched concurrently through one FootballDataClient (pooled
+    session, token-bucket rate limiting), then loaded in season order. Each API
+    call is logged to ETL_Api_Manifest for audit tracking over a single
+    connection per phase instead of one connection per log row.
     
     Args:
         start_year: starting season year (default 2023)
         end_year: ending season year (default current year)
+        client: optional FootballDataClient (e.g. pointed at a local stub server)
     
     Returns:
         None (loads directly to database)
@@ -185,63 +325,71 @@ def fetch_and_load_team_data_for_years(start_year: int = 2023, end_year: int | N
     total_rows_loaded = 0
     successful_years = 0
     failed_years = 0
+    endpoint = TEAMS_ENDPOINT
+    years = list(range(start_year, end_year + 1))
+    owns_client = client is None
+    client = client or FootballDataClient()
+    engine = get_engine()
     
-    for year in range(start_year, end_year + 1):
+    try:
         load_start = datetime.datetime.now()
-        endpoint = "/competitions/PL/teams"
         
+        # Log the start of every API call
+        try:
+            with engine.begin() as conn:
+                for year in years:
+                    log_api_call(
+                        api_name="football-data.org",
+                        endpoint=endpoint,
+                        season=year,
+                        load_start_time=load_start,
+                        status="IN_PROGRESS",
+                        conn=conn
+                    )
+        except Exception as e:
+            print(f"ERROR logging API calls to manifest: {e}")
+        
+        # Fetch all seasons concurrently
+        print(f"  Fetching teams for {len(years)} seasons with {client.max_workers} workers...")
+        responses = client.fetch_seasons(years, endpoints=(endpoint,))
+        
+        outcomes = []
+        for year in years:
+            teams_json = responses[(endpoint, year)]
+            try:
+                if isinstance(teams_json, Exception):
+                    raise teams_json
+                df_year = read_json(teams_json)
+                rows_loaded = len(df_year)
+                total_rows_loaded += rows_loaded
+                successful_years += 1
+                outcomes.append((year, "SUCCESS", rows_loaded, None, datetime.datetime.now()))
+                print(f"  OK Loaded {rows_loaded} teams for season {year}")
+            except Exception as e:
+                failed_years += 1
+                outcomes.append((year, "FAILED", None, str(e), datetime.datetime.now()))
+                print(f"  ERROR fetching teams for season {year}: {e}")
+        
+        # Log success/failure of every call
         try:
-            print(f"  Fetching teams for season {year}...")
-            
-            # Log the start of the API call
-            log_api_call(
-                api_name="football-data.org",
-                endpoint=endpoint,
-                season=year,
-                load_start_time=load_start,
-                status="IN_PROGRESS"
-            )
-            
-            # Fetch and load data
-            teams_json = fetch_team_data(season=year)
-            df_year = read_json(teams_json)
-            rows_loaded = len(df_year)
-            total_rows_loaded += rows_loaded
-            successful_years += 1
-            
-            load_end = datetime.datetime.now()
-            
-            # Log success
-            log_api_call(
-                api_name="football-data.org",
-                endpoint=endpoint,
-                season=year,
-                load_start_time=load_start,
-                load_end_time=load_end,
-                status="SUCCESS",
-                rows_processed=rows_loaded
-            )
-            
-            print(f"  OK Loaded {rows_loaded} teams for season {year}")
-            
+            with engine.begin() as conn:
+                for year, status, rows_loaded, error_msg, load_end in outcomes:
+                    log_api_call(
+                        api_name="football-data.org",
+                        endpoint=endpoint,
+                        season=year,
+                        load_start_time=load_start,
+                        load_end_time=load_end,
+                        status=status,
+                        rows_processed=rows_loaded,
+                        error_message=error_msg,
+                        conn=conn
+                    )
         except Exception as e:
-            failed_years += 1
-            load_end = datetime.datetime.now()
-            error_msg = str(e)
-            
-            # Log failure
-            log_api_call(
-                api_name="football-data.org",
-                endpoint=endpoint,
-                season=year,
-                load_start_time=load_start,
-                load_end_time=load_end,
-                status="FAILED",
-                error_message=error_msg
-            )
-            
-            print(f"  ERROR fetching teams for season {year}: {e}")
-            continue
+            print(f"ERROR logging API calls to manifest: {e}")
+    finally:
+        if owns_client:
+            client.close()
     
     print(f"\n{'='*60}")
     print(f"Summary: Loaded {total_rows_loaded} total teams")
@@ -5,22 +5,63 @@ Supports referee, stadium, and other dimension data
 """
 
 import os
+import json
+import hashlib
 import logging
 from pathlib import Path
 import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from openpyxl import load_workbook
 from sqlalchemy import text
 from ..db import get_engine
+from ..event_log import get_event_logger
+from ..config import CACHE_DIR
 
 logger = logging.getLogger(__name__)
 
+
+def _file_sha256(file_path: Path) -> str:
+    """Content hash of a workbook, used as the parsed-sheet cache key"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _pick_sheet(sheet_names: List[str], keyword: str) -> Optional[str]:
+    """Pick the sheet whose name contains keyword, else the first non-'Sheet1' sheet"""
+    for sheet in sheet_names:
+        if keyword in sheet.lower():
+            return sheet
+    for sheet in sheet_names:
+        if sheet != 'Sheet1':
+            return sheet
+    return None
+
+
+def _rows_to_dataframe(rows) -> pd.DataFrame:
+    """Build a DataFrame from streamed worksheet rows (first row is the header)"""
+    rows = list(rows)
+    # read_only worksheets can report trailing blank rows from stale dimensions
+    while rows and all(v is None for v in rows[-1]):
+        rows.pop()
+    if not rows:
+        return pd.DataFrame()
+    header = [str(h).strip() if h is not None else f"Unnamed: {i}" for i, h in enumerate(rows[0])]
+    return pd.DataFrame(rows[1:], columns=header)
+
 class ExcelReader:
     """Reads Excel files from data/raw/xlsx and loads into staging tables"""
     
     def __init__(self):
-        self.xlsx_dir = Path(__file__).parent.parent.parent.parent / "data" / "raw" / "xlsx"
+        project_root = Path(__file__).parent.parent.parent.parent
+        self.xlsx_dir = project_root / "data" / "raw" / "xlsx"
+        self.cache_dir = project_root / CACHE_DIR / "excel"
         self.engine = get_engine()
+        # File names with a SUCCESS manifest row, read once per batch
+        self._processed: Optional[set] = None
         
     def get_excel_files(self) -> List[Path]:
         """Get all Excel files from xlsx directory"""
@@ -32,41 +73,98 @@ class ExcelReader:
         logger.info(f"Found {len(excel_files)} Excel files in {self.xlsx_dir}")
         return excel_files
     
-    def check_manifest(self, file_name: str) -> bool:
-        """Check if file has already been processed"""
-        query = """
-            SELECT 1 FROM ETL_Excel_Manifest 
-            WHERE file_name = :file_name AND status = 'SUCCESS'
+    def _load_processed(self) -> set:
+        """Read every successfully processed file name once.
+
+        Queued manifest writes are flushed first (once, not per file); files
+        loaded afterwards are added by log_manifest as they succeed.
         """
+        get_event_logger(self.engine).flush()
+        query = "SELECT DISTINCT file_name FROM ETL_Excel_Manifest WHERE status = 'SUCCESS'"
         with self.engine.connect() as conn:
-            result = conn.execute(text(query), {"file_name": file_name})
-            return result.fetchone() is not None
+            self._processed = {row[0] for row in conn.execute(text(query))}
+        return self._processed
+
+    def check_manifest(self, file_name: str) -> bool:
+        """Check if file has already been processed"""
+        processed = self._processed if self._processed is not None else self._load_processed()
+        return file_name in processed
     
     def log_manifest(self, file_name: str, file_path: str, sheet_name: str, 
                      data_type: str, status: str, rows_processed: int = 0, 
                      error_message: str = None):
-        """Log file load to ETL_Excel_Manifest"""
-        query = """
-            INSERT INTO ETL_Excel_Manifest 
-            (file_name, file_path, sheet_name, data_type, load_start_time, 
-             load_end_time, status, rows_processed, error_message)
-            VALUES (:file_name, :file_path, :sheet_name, :data_type, :load_start_time, 
-                    :load_end_time, :status, :rows_processed, :error_message)
-        """
-        with self.engine.connect() as conn:
-            conn.execute(text(query), {
-                "file_name": file_name,
-                "file_path": str(file_path),
-                "sheet_name": sheet_name,
-                "data_type": data_type,
-                "load_start_time": datetime.now(),
-                "load_end_time": datetime.now(),
-                "status": status,
-                "rows_processed": rows_processed,
-                "error_message": error_message
-            })
-            conn.commit()
+        """Queue a file load record for ETL_Excel_Manifest (written in batches)"""
+        now = datetime.now()
+        if status == 'SUCCESS' and self._processed is not None:
+            self._processed.add(file_name)
+        get_event_logger(self.engine).record("ETL_Excel_Manifest", {
+            "file_name": file_name,
+            "file_path": str(file_path),
+            "sheet_name": sheet_name,
+            "data_type": data_type,
+            "load_start_time": now,
+            "load_end_time": now,
+            "status": status,
+            "rows_processed": rows_processed,
+            "error_message": error_message
+        })
     
+    def _cache_paths(self, file_hash: str, keyword: str) -> Tuple[Path, Path]:
+        """Parquet data file and JSON metadata file for one cached sheet"""
+        stem = f"{file_hash}.{keyword}"
+        return self.cache_dir / f"{stem}.parquet", self.cache_dir / f"{stem}.json"
+
+    def read_sheet(self, file_path: Path, keyword: str) -> Tuple[Optional[str], pd.DataFrame]:
+        """Read the sheet matching keyword, opening the workbook at most once.
+
+        Parsed sheets are cached as Parquet keyed by the workbook's SHA-256, so an
+        unchanged reference workbook is served from disk without touching Excel.
+        .xlsx files are streamed with openpyxl in read_only mode; the sheet is
+        chosen from workbook metadata before any cells are read.
+
+        Returns:
+            Tuple of (sheet_name or None if no suitable sheet, DataFrame)
+        """
+        file_hash = _file_sha256(file_path)
+        data_path, meta_path = self._cache_paths(file_hash, keyword)
+        if data_path.exists() and meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text(encoding='utf-8'))
+                df = pd.read_parquet(data_path)
+                logger.info(f"Using cached sheet '{meta['sheet_name']}' for {file_path.name}")
+                return meta['sheet_name'], df
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable sheet cache for {file_path.name}: {e}")
+
+        if file_path.suffix.lower() == '.xlsx':
+            wb = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                sheet_name = _pick_sheet(wb.sheetnames, keyword)
+                if not sheet_name:
+                    return None, pd.DataFrame()
+                df = _rows_to_dataframe(wb[sheet_name].iter_rows(values_only=True))
+            finally:
+                wb.close()
+        else:
+            # Legacy .xls is not supported by openpyxl; parse every sheet in one open
+            sheets = pd.read_excel(file_path, sheet_name=None)
+            sheet_name = _pick_sheet(list(sheets), keyword)
+            if not sheet_name:
+                return None, pd.DataFrame()
+            df = sheets[sheet_name]
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(data_path, index=False)
+            meta_path.write_text(json.dumps({'sheet_name': sheet_name, 'source': file_path.name}), encoding='utf-8')
+        except ImportError as e:
+            logger.warning(f"Parquet engine unavailable, sheet cache disabled: {e}")
+        except Exception as e:
+            logger.warning(f"Could not cache sheet '{sheet_name}' from {file_path.name}: {e}")
+            data_path.unlink(missing_ok=True)
+
+        return sheet_name, df
+
     def load_referee_data(self, file_path: Path) -> Tuple[int, str]:
         """Load referee data from Excel into stg_referee_raw"""
         try:
@@ -77,22 +175,8 @@ class ExcelReader:
                 logger.info(f"File {file_path.name} already processed, skipping")
                 return 0, "SKIPPED"
             
-            # Read Excel file - try to find the right sheet
-            xls = pd.ExcelFile(file_path)
-            sheet_name = None
-            
-            # Look for a sheet with 'referee' in the name
-            for sheet in xls.sheet_names:
-                if 'referee' in sheet.lower():
-                    sheet_name = sheet
-                    break
-            
-            if not sheet_name:
-                # If not found, use the first sheet (excluding Sheet1)
-                for sheet in xls.sheet_names:
-                    if sheet != 'Sheet1':
-                        sheet_name = sheet
-                        break
+            # Read Excel file - sheet with 'referee' in the name, else first non-Sheet1 sheet
+            sheet_name, df = self.read_sheet(file_path, 'referee')
             
             if not sheet_name:
                 error_msg = "Could not find appropriate sheet for referee data"
@@ -100,8 +184,6 @@ class ExcelReader:
                 self.log_manifest(file_path.name, file_path, 'Unknown', 'Referee', 'FAILED', 0, error_msg)
                 return 0, f"FAILED: {error_msg}"
             
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
-            
             if df.empty:
                 logger.warning(f"No data found in {file_path.name}")
                 self.log_manifest(file_path.name, file_path, sheet_name, 'Referee', 'EMPTY', 0)
@@ -176,22 +258,8 @@ class ExcelReader:
                 logger.info(f"File {file_path.name} already processed, skipping")
                 return 0, "SKIPPED"
             
-            # Read Excel file - try to find the right sheet
-            xls = pd.ExcelFile(file_path)
-            sheet_name = None
-            
-            # Look for a sheet with 'stadium' in the name
-            for sheet in xls.sheet_names:
-                if 'stadium' in sheet.lower():
-                    sheet_name = sheet
-                    break
-            
-            if not sheet_name:
-                # If not found, use the first sheet (excluding Sheet1)
-                for sheet in xls.sheet_names:
-                    if sheet != 'Sheet1':
-                        sheet_name = sheet
-                        break
+            # Read Excel file - sheet with 'stadium' in the name, else first non-Sheet1 sheet
+            sheet_name, df = self.read_sheet(file_path, 'stadium')
             
             if not sheet_name:
                 error_msg = "Could not find appropriate sheet for stadium data"
@@ -199,8 +267,6 @@ class ExcelReader:
                 self.log_manifest(file_path.name, file_path, 'Unknown', 'Stadium', 'FAILED', 0, error_msg)
                 return 0, f"FAILED: {error_msg}"
             
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
-            
             if df.empty:
                 logger.warning(f"No data found in {file_path.name}")
                 self.log_manifest(file_path.name, file_path, sheet_name, 'Stadium', 'EMPTY', 0)
@@ -248,6 +314,8 @@ class ExcelReader:
             logger.info("No Excel files found to process")
             return results
         
+        # One manifest read (and log flush) for the whole batch
+        self._load_processed()
         for file_path in excel_files:
             file_name = file_path.name.lower()
             
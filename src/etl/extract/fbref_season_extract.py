@@ -3,29 +3,40 @@ FBref season player stats extractor
 
 Usage:
   Extract 'Player Standard Stats' table from an FBref season page.
-  - Set environment variables: DB_HOST, DB_PORT, DB_USER, DB_PASS, DB_NAME
+  - Database connection comes from the shared engine (MYSQL_* env vars, see src/etl/config.py)
   - Set FBREF_URL and FBREF_SEASON for the season URL and label
   - Or: export FBREF_LOCAL_HTML to use a local downloaded HTML file (for testing or FBref blocks)
   - Run: python -m src.etl.extract.fbref_season_extract
 
+  Batch mode backfills a season range for one or more competitions through a
+  polite concurrent scheduler. Completed (competition, season) pairs are
+  recorded in ETL_Fbref_Manifest, so an interrupted backfill resumes where it
+  stopped:
+  - Run: python -m src.etl.extract.fbref_season_extract --batch --start-year 2017 --end-year 2023 --competitions 9 10
+
 Example:
-  $env:DB_HOST='127.0.0.1'
-  $env:DB_PORT='3307'
-  $env:DB_USER='root'
-  $env:DB_PASS='1234'
-  $env:DB_NAME='epl_dw'
+  $env:MYSQL_HOST='127.0.0.1'
+  $env:MYSQL_PORT='3307'
+  $env:MYSQL_USER='root'
+  $env:MYSQL_PASSWORD='1234'
+  $env:MYSQL_DB='epl_dw'
   $env:FBREF_URL='https://fbref.com/en/comps/9/2022-2023/2022-2023-Premier-League-Stats'
   $env:FBREF_SEASON='2022/2023'
   python -m src.etl.extract.fbref_season_extract
 """
 import os
-import re
 import logging
 from time import sleep
 from io import StringIO
+import lxml.html
 import pandas as pd
 import requests
-from sqlalchemy import create_engine, text
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from sqlalchemy import text
+from ..db import get_engine
+from .http_cache import HttpCache, get_http_cache
+from .throttle import TokenBucket
 
 logging.basicConfig(
     level=logging.INFO,
@@ -33,14 +44,19 @@ logging.basicConfig(
 )
 log = logging.getLogger('fbref_extract')
 
-# DB connection from env with sensible defaults for local dev
-DB_HOST = os.getenv('DB_HOST', '127.0.0.1')
-DB_PORT = int(os.getenv('DB_PORT', '3307'))
-DB_USER = os.getenv('DB_USER', 'root')
-DB_PASS = os.getenv('DB_PASS', '1234')
-DB_NAME = os.getenv('DB_NAME', 'epl_dw')
+# FBref competition ids -> URL slug used in stats page links
+FBREF_COMPETITIONS = {
+    '9': 'Premier-League',
+    '10': 'Championship',
+    '11': 'Serie-A',
+    '12': 'La-Liga',
+    '13': 'Ligue-1',
+    '20': 'Bundesliga',
+}
 
-DB_URL = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
+# Polite scheduling: FBref blocks clients that exceed ~20 requests/minute
+FBREF_REQUESTS_PER_MINUTE = int(os.getenv('FBREF_REQUESTS_PER_MINUTE', '10'))
+FBREF_MAX_WORKERS = int(os.getenv('FBREF_MAX_WORKERS', '2'))
 
 # Expected FBref columns that map to our schema
 FBREF_TO_DB_COLS = {
@@ -58,33 +74,107 @@ FBREF_TO_DB_COLS = {
 }
 
 
-def _clean_numeric(val):
-    """Convert string numeric (possibly with commas) to int/float or None."""
-    if pd.isna(val):
-        return None
-    if isinstance(val, (int, float)):
-        return val
-    # remove commas and non-numeric chars except dot and minus
-    s = str(val).strip()
-    s = re.sub(r'[^0-9.\-]', '', s)
-    if not s or s == '-':
-        return None
-    try:
-        if '.' in s:
-            return float(s)
-        return int(s)
-    except (ValueError, TypeError):
-        return None
+# id of the "Player Standard Stats" table; on season pages FBref ships it
+# inside an HTML comment that is un-commented client-side
+PLAYER_STATS_TABLE_ID = 'stats_standard'
+
+INT_COLS = ['minutes_played', 'goals', 'assists', 'yellow_cards', 'red_cards', 'shots', 'shots_on_target']
+DECIMAL_COLS = ['xg', 'xa']
+
+
+def _coerce_numeric(series: pd.Series, integer: bool = False) -> pd.Series:
+    """Vectorized numeric coercion: strip commas/non-numeric chars, blanks and '-' become NA."""
+    cleaned = series.astype('string').str.replace(r'[^0-9.\-]', '', regex=True)
+    cleaned = cleaned.mask(cleaned.isin(['', '-', '.']))
+    numbers = pd.to_numeric(cleaned, errors='coerce')
+    if integer and (numbers.dropna() % 1 == 0).all():
+        return numbers.astype('Int64')
+    # decimal columns, or fractional values in an integer column: keep floats
+    return numbers
+
+
+def _find_table(html: str, table_id: str):
+    """Locate <table id=table_id> with lxml, including the commented-out variant."""
+    tree = lxml.html.fromstring(html)
+    tables = tree.xpath('//table[@id=$tid]', tid=table_id)
+    if tables:
+        return tables[0]
+    marker = f'id="{table_id}"'
+    for comment in tree.xpath('//comment()'):
+        text_ = comment.text or ''
+        if marker not in text_:
+            continue
+        fragment = lxml.html.fromstring(text_)
+        tables = fragment.xpath('//table[@id=$tid]', tid=table_id)
+        if tables:
+            return tables[0]
+    return None
+
+
+def _unique_columns(names):
+    """De-duplicate header names the way pandas does (Gls, Gls.1, ...)."""
+    seen = {}
+    result = []
+    for name in names:
+        if name in seen:
+            seen[name] += 1
+            result.append(f'{name}.{seen[name]}')
+        else:
+            seen[name] = 0
+            result.append(name)
+    return result
+
 
+def parse_player_standard_stats(html: str, table_id: str = PLAYER_STATS_TABLE_ID) -> pd.DataFrame:
+    """Build a DataFrame from the Player Standard Stats table only.
 
-def extract_season(season_url: str, season_name: str, to_sql: bool = True) -> pd.DataFrame:
+    The table is located by id with lxml (falling back to the first table via
+    pd.read_html when the id is absent, e.g. for hand-saved pages). The last
+    header row is used, and repeated in-body header rows are skipped.
+    """
+    table = _find_table(html, table_id)
+    if table is None:
+        log.warning(f'Table #{table_id} not found; falling back to first table on page')
+        dfs = pd.read_html(StringIO(html), header=1)
+        if not dfs:
+            raise RuntimeError('No tables found in HTML')
+        return dfs[0]
+
+    header_rows = table.xpath('./thead/tr')
+    if not header_rows:
+        raise RuntimeError(f'Table #{table_id} has no header')
+    header = [cell.text_content().strip() for cell in header_rows[-1].xpath('./th|./td')]
+
+    records = []
+    for row in table.xpath('./tbody/tr'):
+        if 'thead' in (row.get('class') or ''):
+            continue
+        cells = [cell.text_content().strip() for cell in row.xpath('./th|./td')]
+        if len(cells) == len(header):
+            records.append(cells)
+
+    return pd.DataFrame(records, columns=_unique_columns(header))
+
+
+def extract_season(season_url: str, season_name: str, to_sql: bool = True,
+                   cache: HttpCache = None, use_cache: bool = True,
+                   competition_id: str = '9', before_network=None,
+                   allow_local_fallback: bool = True) -> pd.DataFrame:
     """
     Extract player stats table from FBref season page.
     
+    Pages are fetched through the shared HTTP cache: past seasons are served
+    from disk, the current season is revalidated with ETag/Last-Modified.
+    
     Args:
         season_url: URL to the FBref season page
         season_name: Season label (e.g., '2022/2023')
         to_sql: Whether to write extracted data to DB
+        cache: Optional HttpCache (defaults to the shared cache)
+        use_cache: Set False to always download
+        competition_id: FBref competition id stored with each row (9 = Premier League)
+        before_network: Optional callable run before each real download (rate limiter)
+        allow_local_fallback: Use FBREF_LOCAL_HTML when the download fails
     
     Returns:
         DataFrame with cleaned and mapped columns ready for DB insert
@@ -103,13 +193,26 @@ def extract_season(season_url: str, season_name: str, to_sql: bool = True) -> pd
         'Connection': 'keep-alive',
     }
 
+    if cache is None and use_cache:
+        cache = get_http_cache()
+    session = requests.Session()
+
     for attempt in range(1, 4):
         try:
             log.info(f'Attempt {attempt}: Downloading FBref page...')
-            resp = requests.get(season_url, headers=headers, timeout=15)
+            if cache is not None:
+                resp = cache.request(session, season_url, headers=headers, timeout=15,
+                                     before_network=before_network)
+            else:
+                if before_network is not None:
+                    before_network()
+                resp = session.get(season_url, headers=headers, timeout=15)
             resp.raise_for_status()
             html = resp.text
-            log.info('Successfully downloaded FBref page')
+            if getattr(resp, 'from_cache', False):
+                log.info('Served FBref page from HTTP cache')
+            else:
+                log.info('Successfully downloaded FBref page')
             break
         except requests.exceptions.HTTPError as he:
             log.warning(f'HTTP {resp.status_code} error on attempt {attempt}: {he}')
@@ -123,7 +226,7 @@ def extract_season(season_url: str, season_name: str, to_sql: bool = True) -> pd
 
     # Fallback to local HTML file if download failed
     if not html:
-        local_path = os.getenv('FBREF_LOCAL_HTML')
+        local_path = os.getenv('FBREF_LOCAL_HTML') if allow_local_fallback else None
         if local_path and os.path.exists(local_path):
             log.info(f'Using local HTML file: {local_path}')
             with open(local_path, 'r', encoding='utf-8') as fh:
@@ -134,12 +237,8 @@ def extract_season(season_url: str, season_name: str, to_sql: bool = True) -> pd
                 'Set FBREF_LOCAL_HTML env var to point to a saved HTML file, or ensure FBref is accessible.'
             )
 
-    # Parse HTML tables
-    dfs = pd.read_html(StringIO(html), header=1)
-    if not dfs:
-        raise RuntimeError('No tables found in HTML')
-
-    df = dfs[0]
+    # Parse only the Player Standard Stats table
+    df = parse_player_standard_stats(html)
     log.info(f'Found table with {len(df)} rows and columns: {list(df.columns)[:5]}...')
 
     # Normalize column names (strip whitespace)
@@ -159,42 +258,35 @@ def extract_season(season_url: str, season_name: str, to_sql: bool = True) -> pd
         )
 
     df = df[available_cols].copy()
+    df['Player'] = df['Player'].mask(df['Player'] == '')
     df = df.dropna(subset=['Player'])
     log.info(f'Selected {len(df)} rows with Player info')
 
     # Rename columns to match DB schema
     df = df.rename(columns=FBREF_TO_DB_COLS)
 
-    # Normalize numeric columns
-    numeric_cols = ['minutes_played', 'goals', 'assists', 'yellow_cards', 'red_cards', 'shots', 'shots_on_target']
-    for col in numeric_cols:
+    # Normalize numeric columns (whole-column coercion)
+    for col in INT_COLS:
         if col in df.columns:
-            df[col] = df[col].apply(_clean_numeric)
+            df[col] = _coerce_numeric(df[col], integer=True)
 
     # Numeric but allow decimals
-    for col in ['xg', 'xa']:
+    for col in DECIMAL_COLS:
         if col in df.columns:
-            df[col] = df[col].apply(_clean_numeric)
+            df[col] = _coerce_numeric(df[col])
 
-    # Add season label
+    # Add season label and competition
     df['season_label'] = season_name
+    df['competition_id'] = competition_id
 
     log.info(f'Extracted {len(df)} player records for {season_name}')
 
     if to_sql:
         log.info('Writing to DB table stg_player_stats_fbref')
-        engine = create_engine(DB_URL)
-        
         # Append to table (table already exists from schema init)
         try:
-            df.to_sql(
-                'stg_player_stats_fbref',
-                con=engine,
-                if_exists='append',
-                index=False,
-                method='multi',
-                chunksize=100
-            )
+            with get_engine().begin() as conn:
+                _write_staging(conn, df)
             log.info(f'Successfully inserted {len(df)} rows into stg_player_stats_fbref')
         except Exception as e:
             log.error(f'Error inserting rows: {e}')
@@ -203,7 +295,147 @@ def extract_season(season_url: str, season_name: str, to_sql: bool = True) -> pd
     return df
 
 
+def _write_staging(conn, df: pd.DataFrame) -> None:
+    df.to_sql(
+        'stg_player_stats_fbref',
+        con=conn,
+        if_exists='append',
+        index=False,
+        method='multi',
+        chunksize=500
+    )
+
+
+def season_stats_url(competition_id: str, start_year: int) -> str:
+    """URL of the player standard stats page for a competition season."""
+    slug = FBREF_COMPETITIONS.get(str(competition_id))
+    if slug is None:
+        raise ValueError(f'Unknown FBref competition id {competition_id}; known: {list(FBREF_COMPETITIONS)}')
+    season = f'{start_year}-{start_year + 1}'
+    return f'https://fbref.com/en/comps/{competition_id}/{season}/stats/{season}-{slug}-Stats'
+
+
+def _completed_seasons(engine) -> set:
+    """(competition_id, season_label) pairs already loaded successfully."""
+    with engine.connect() as conn:
+        result = conn.execute(text(
+            "SELECT competition_id, season_label FROM ETL_Fbref_Manifest WHERE status = 'SUCCESS'"
+        ))
+        return {(str(row[0]), row[1]) for row in result}
+
+
+def _record_manifest(conn, competition_id, season_label, url, status, rows, started, error=None) -> None:
+    conn.execute(text("""
+        INSERT INTO ETL_Fbref_Manifest
+        (competition_id, season_label, url, load_start_time, load_end_time, status, rows_processed, error_message)
+        VALUES (:competition_id, :season_label, :url, :load_start_time, :load_end_time, :status, :rows_processed, :error_message)
+        ON DUPLICATE KEY UPDATE
+            url = VALUES(url),
+            load_start_time = VALUES(load_start_time),
+            load_end_time = VALUES(load_end_time),
+            status = VALUES(status),
+            rows_processed = VALUES(rows_processed),
+            error_message = VALUES(error_message)
+    """), {
+        'competition_id': competition_id,
+        'season_label': season_label,
+        'url': url,
+        'load_start_time': started,
+        'load_end_time': datetime.now(),
+        'status': status,
+        'rows_processed': rows,
+        'error_message': error,
+    })
+
+
+def extract_seasons(start_year: int, end_year: int, competitions=('9',),
+                    max_workers: int = FBREF_MAX_WORKERS,
+                    requests_per_minute: int = FBREF_REQUESTS_PER_MINUTE) -> dict:
+    """Backfill player standard stats for a season range across competitions.
+
+    Pending (competition, season) pairs are fetched by a small thread pool that
+    shares one TokenBucket, so downloads stay within requests_per_minute (HTTP
+    cache hits are free). Each season's staging rows and its SUCCESS manifest
+    row commit in one transaction on the shared pooled engine, so re-running
+    after an interruption skips everything already completed.
+
+    Args:
+        start_year: First season start year (e.g. 2017 for 2017/2018)
+        end_year: Last season start year (inclusive)
+        competitions: FBref competition ids (see FBREF_COMPETITIONS)
+        max_workers: Concurrent fetch workers
+        requests_per_minute: Download budget shared by all workers
+
+    Returns:
+        Summary dict with completed, skipped, failed counts and rows loaded
+    """
+    engine = get_engine()
+    done = _completed_seasons(engine)
+    jobs = []
+    for competition_id in competitions:
+        for year in range(start_year, end_year + 1):
+            season_label = f'{year}/{year + 1}'
+            if (str(competition_id), season_label) in done:
+                continue
+            jobs.append((str(competition_id), year, season_label))
+
+    summary = {'completed': 0, 'skipped': 0, 'failed': 0, 'rows': 0}
+    summary['skipped'] = len(competitions) * (end_year - start_year + 1) - len(jobs)
+    log.info(f'FBref batch: {len(jobs)} seasons pending, {summary["skipped"]} already complete')
+    if not jobs:
+        return summary
+
+    limiter = TokenBucket(requests_per_minute, capacity=1)
+
+    def _run(job):
+        competition_id, year, season_label = job
+        url = season_stats_url(competition_id, year)
+        started = datetime.now()
+        try:
+            df = extract_season(url, season_label, to_sql=False, competition_id=competition_id,
+                                before_network=limiter.acquire, allow_local_fallback=False)
+            with engine.begin() as conn:
+                _write_staging(conn, df)
+                _record_manifest(conn, competition_id, season_label, url, 'SUCCESS', len(df), started)
+            return job, len(df), None
+        except Exception as e:
+            try:
+                with engine.begin() as conn:
+                    _record_manifest(conn, competition_id, season_label, url, 'FAILED', None, started, str(e)[:1000])
+            except Exception as log_error:
+                log.error(f'Failed to record manifest for {competition_id} {season_label}: {log_error}')
+            return job, 0, e
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='fbref') as pool:
+        futures = [pool.submit(_run, job) for job in jobs]
+        for future in as_completed(futures):
+            (competition_id, _, season_label), rows, error = future.result()
+            if error is None:
+                summary['completed'] += 1
+                summary['rows'] += rows
+                log.info(f'✓ comp {competition_id} {season_label}: {rows} rows')
+            else:
+                summary['failed'] += 1
+                log.error(f'✗ comp {competition_id} {season_label}: {error}')
+
+    log.info(f'FBref batch finished: {summary}')
+    return summary
+
+
 if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='FBref player standard stats extractor')
+    parser.add_argument('--batch', action='store_true', help='Backfill a season range (resumable)')
+    parser.add_argument('--start-year', type=int, default=2017, help='First season start year for --batch')
+    parser.add_argument('--end-year', type=int, default=2023, help='Last season start year for --batch')
+    parser.add_argument('--competitions', nargs='+', default=['9'], help='FBref competition ids for --batch')
+    parser.add_argument('--workers', type=int, default=FBREF_MAX_WORKERS, help='Concurrent fetch workers for --batch')
+    args = parser.parse_args()
+
+    if args.batch:
+        summary = extract_seasons(args.start_year, args.end_year, args.competitions, max_workers=args.workers)
+        exit(0 if summary['failed'] == 0 else 1)
+
     # Example: extract 2022/2023 season
     season_url = os.getenv(
         'FBREF_URL',
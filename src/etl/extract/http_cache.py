@@ -0,0 +1,267 @@
+"""Disk-backed HTTP response cache for the API and FBref extractors.
+
+Responses are stored under CACHE_DIR/http as a body file plus a small JSON
+metadata file per URL. Each entry has a freshness TTL chosen per endpoint:
+  - historical seasons (season param / 'YYYY-YYYY' in the URL before the
+    current season) never expire and are always served locally
+  - the current season and undated URLs take the TTL of the first matching
+    ttl_rules pattern (HTTP_CACHE_TTL_RULES, overridable with
+    ETL_HTTP_CACHE_TTL_RULES as JSON {regex: seconds or null}), else the
+    default TTL (ETL_HTTP_CACHE_TTL)
+  - expired entries are revalidated with If-None-Match / If-Modified-Since so
+    an unchanged page costs a 304 instead of a full download
+The cache is bounded in bytes and evicts least-recently-used entries.
+
+Exposed:
+- HttpCache(cache_dir, max_bytes, default_ttl, ttl_rules) -> cache instance
+- HttpCache.request(session, url, params, headers, timeout, before_network) -> response
+- current_season_start_year() -> int
+- get_http_cache() -> shared HttpCache, or None when ETL_HTTP_CACHE=0
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from urllib.parse import urlencode
+
+from ..config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_ENABLED = os.getenv("ETL_HTTP_CACHE", "1").lower() in ("1", "true", "yes")
+HTTP_CACHE_MAX_MB = int(os.getenv("ETL_HTTP_CACHE_MAX_MB", "512"))
+HTTP_CACHE_TTL_SECONDS = int(os.getenv("ETL_HTTP_CACHE_TTL", "3600"))
+
+# Per-endpoint freshness for current-season / undated URLs: team lists only
+# change in transfer windows, FBref season tables after each matchweek
+HTTP_CACHE_TTL_RULES = json.loads(os.getenv("ETL_HTTP_CACHE_TTL_RULES", "null")) or {
+    r"/competitions/[^/?]+/teams": 24 * 3600,
+    r"fbref\.com/": 6 * 3600,
+}
+
+_SEASON_IN_URL = re.compile(r"(\d{4})-(\d{4})")
+
+
+def current_season_start_year(today: datetime = None) -> int:
+    """EPL seasons start in August; before July we are still in last year's season."""
+    today = today or datetime.now()
+    return today.year if today.month >= 7 else today.year - 1
+
+
+def _season_start_year(url: str, params: Optional[dict]) -> Optional[int]:
+    """Season a request refers to: ?season=YYYY, or 'YYYY-YYYY' in the URL."""
+    if params and params.get("season") is not None:
+        try:
+            return int(str(params["season"])[:4])
+        except ValueError:
+            return None
+    match = _SEASON_IN_URL.search(url)
+    return int(match.group(1)) if match else None
+
+
+class CachedResponse:
+    """Minimal requests.Response look-alike served from the cache."""
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: dict, from_cache: bool):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        # Only 2xx responses are ever stored
+        return None
+
+
+class HttpCache:
+    """Size-bounded LRU cache of HTTP responses with conditional revalidation."""
+
+    def __init__(
+        self,
+        cache_dir,
+        max_bytes: int = HTTP_CACHE_MAX_MB * 1024 * 1024,
+        default_ttl: Optional[float] = HTTP_CACHE_TTL_SECONDS,
+        ttl_rules: Optional[Dict[str, Optional[float]]] = None,
+    ):
+        """
+        Args:
+            cache_dir: Directory for cached bodies and metadata
+            max_bytes: Total body size allowed before LRU eviction
+            default_ttl: Freshness in seconds for current-season/undated URLs
+            ttl_rules: Optional {regex: ttl_seconds or None} matched against the
+                URL of current-season/undated requests; None means never expire
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_rules = [(re.compile(p), ttl) for p, ttl in (ttl_rules or {}).items()]
+        self._lock = threading.Lock()
+        self._index = {}
+        self._total_bytes = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        for meta_path in self.cache_dir.glob("*.json"):
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            self._index[meta_path.stem] = meta
+            self._total_bytes += meta.get("size", 0)
+
+    @staticmethod
+    def _key(url: str, params: Optional[dict]) -> str:
+        full = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        return hashlib.sha256(full.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, url: str, params: Optional[dict] = None) -> Optional[float]:
+        """Freshness lifetime for a request; None means the entry never expires."""
+        season = _season_start_year(url, params)
+        if season is not None and season < current_season_start_year():
+            return None
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def _is_fresh(self, meta: dict, ttl: Optional[float]) -> bool:
+        return ttl is None or (time.time() - meta["fetched_at"]) < ttl
+
+    def _read(self, key: str, meta: dict, from_cache: bool) -> Optional[CachedResponse]:
+        try:
+            content = (self.cache_dir / f"{key}.body").read_bytes()
+        except OSError:
+            return None
+        return CachedResponse(meta["url"], meta.get("status_code", 200), content, meta.get("headers", {}), from_cache)
+
+    def _write_meta(self, key: str, meta: dict) -> None:
+        (self.cache_dir / f"{key}.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    def _store(self, key: str, url: str, resp) -> None:
+        headers = {k: v for k, v in resp.headers.items()
+                   if k.lower() in ("etag", "last-modified", "content-type")}
+        meta = {
+            "url": url,
+            "status_code": resp.status_code,
+            "headers": headers,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "last_access": time.time(),
+            "size": len(resp.content),
+        }
+        with self._lock:
+            old = self._index.get(key)
+            if old:
+                self._total_bytes -= old.get("size", 0)
+            (self.cache_dir / f"{key}.body").write_bytes(resp.content)
+            self._write_meta(key, meta)
+            self._index[key] = meta
+            self._total_bytes += meta["size"]
+            self._evict()
+
+    def _touch(self, key: str, meta: dict, revalidated: bool = False) -> None:
+        with self._lock:
+            meta["last_access"] = time.time()
+            if revalidated:
+                meta["fetched_at"] = meta["last_access"]
+            self._write_meta(key, meta)
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until under max_bytes (caller holds lock)."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        for key, meta in sorted(self._index.items(), key=lambda kv: kv[1].get("last_access", 0)):
+            if self._total_bytes <= self.max_bytes:
+                break
+            for suffix in (".body", ".json"):
+                (self.cache_dir / f"{key}{suffix}").unlink(missing_ok=True)
+            self._total_bytes -= meta.get("size", 0)
+            del self._index[key]
+            logger.info(f"HTTP cache evicted {meta.get('url')}")
+
+    def request(
+        self,
+        session,
+        url: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: float = 15,
+        before_network: Optional[Callable[[], object]] = None,
+    ):
+        """GET through the cache.
+
+        Fresh entries are returned without any network call. Stale entries are
+        revalidated with a conditional GET. before_network (e.g. a rate limiter's
+        acquire) runs only when a request actually goes out.
+
+        Returns:
+            CachedResponse for cached/stored 2xx results (from_cache tells which),
+            or the raw requests.Response for any other status (not cached)
+        """
+        key = self._key(url, params)
+        meta = self._index.get(key)
+        ttl = self.ttl_for(url, params)
+
+        if meta and self._is_fresh(meta, ttl):
+            cached = self._read(key, meta, from_cache=True)
+            if cached is not None:
+                self._touch(key, meta)
+                return cached
+
+        request_headers = dict(headers or {})
+        if meta:
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+
+        if before_network is not None:
+            before_network()
+        resp = session.get(url, params=params, headers=request_headers, timeout=timeout)
+
+        if resp.status_code == 304 and meta:
+            cached = self._read(key, meta, from_cache=True)
+            if cached is not None:
+                self._touch(key, meta, revalidated=True)
+                return cached
+            # Body went missing; fetch it again unconditionally
+            if before_network is not None:
+                before_network()
+            resp = session.get(url, params=params, headers=headers, timeout=timeout)
+
+        if 200 <= resp.status_code < 300:
+            self._store(key, url, resp)
+            return CachedResponse(url, resp.status_code, resp.content, dict(resp.headers), from_cache=False)
+        return resp
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Shared cache under CACHE_DIR/http (project root), or None if disabled."""
+    global _http_cache
+    if not HTTP_CACHE_ENABLED:
+        return None
+    with _http_cache_lock:
+        if _http_cache is None:
+            project_root = Path(__file__).resolve().parents[3]
+            _http_cache = HttpCache(project_root / CACHE_DIR / "http", ttl_rules=HTTP_CACHE_TTL_RULES)
+    return _http_cache
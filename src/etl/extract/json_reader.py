@@ -1,11 +1,13 @@
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-import pandas as pd
+from time import perf_counter
 from sqlalchemy import text
 from ..db import get_engine
+from ..config import JSON_READER_WORKERS
 
 # Configure logging
 logging.basicConfig(
@@ -14,6 +16,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+PLAYER_INSERT_SQL = text('''
+    INSERT INTO stg_player_raw
+    (file_name, file_path, season, load_start_time, load_end_time, status,
+     rows_processed, player_id, player_name, team, position, birth_date, nationality,
+     raw_data, created_at)
+    VALUES (:file_name, :file_path, :season, :load_start_time, :load_end_time, :status,
+            :rows_processed, :player_id, :player_name, :team, :position, :birth_date, :nationality,
+            :raw_data, NOW())
+''')
+
+MANIFEST_INSERT_SQL = text('''
+    INSERT INTO ETL_JSON_Manifest (file_name, file_path, season, load_start_time, load_end_time, status, rows_processed, error_message)
+    VALUES (:file_name, :file_path, :season, :load_start_time, :load_end_time, :status, :rows_processed, :error_message)
+''')
+
+# football-data.org player dumps format dateOfBirth as e.g. "Jan 02, 1990"
+DOB_FORMAT = '%b %d, %Y'
+
+
+def _parse_birth_date(value):
+    """Parse a dateOfBirth string into a date, or None if missing/unparseable."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(str(value).strip(), DOB_FORMAT).date()
+    except ValueError:
+        return None
+
+
+def _first_nationality(value):
+    """Return the primary nationality from a list (or scalar) nationality field."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if value is None:
+        return None
+    return str(value).strip() or None
+
+
 class JSONReader:
     def __init__(self, json_dir: str):
         self.json_dir = Path(json_dir)
@@ -26,124 +66,196 @@ class JSONReader:
             result = conn.execute(text("SELECT file_path FROM ETL_JSON_Manifest WHERE status='SUCCESS'"))
             return {row[0] for row in result}
     
-    def read_json_files(self):
-        """Read all JSON files from nested season folders (e.g., Season_1992/Arsenal_FC_11_1992.json)"""
+    def read_json_files(self, workers: int = 1) -> dict:
+        """Read all JSON files from nested season folders (e.g., Season_1992/Arsenal_FC_11_1992.json)
+
+        Args:
+            workers: Number of worker threads. Files are sharded round-robin
+                across workers and each worker holds one pooled connection for
+                its whole shard; every file still commits its staging rows and
+                manifest entry in a single transaction.
+
+        Returns:
+            Dictionary with files loaded/failed/skipped, rows, seconds and rows/sec
+        """
+        summary = {'files': 0, 'failed': 0, 'skipped': 0, 'rows': 0, 'seconds': 0.0, 'rows_per_sec': 0.0}
+
         # Recursively find all .json files in subdirectories
         json_files = list(self.json_dir.glob('*/*.json'))  # Season_YYYY/TeamName_*.json
         logger.info(f"Found {len(json_files)} JSON files across all season folders")
         
         if not json_files:
             logger.warning(f"No JSON files found in {self.json_dir}")
-            return
+            return summary
         
         # Get already-processed files
         processed = self._get_processed_files()
         logger.info(f"Already processed: {len(processed)} files")
         
-        skipped = 0
+        pending = []
         for json_file in json_files:
             file_key = f"{json_file.parent.name}/{json_file.name}"
             if file_key in processed:
-                skipped += 1
+                summary['skipped'] += 1
                 continue
-            self._process_json_file(json_file)
+            pending.append(json_file)
         
-        if skipped > 0:
-            logger.info(f"⊘ Skipped {skipped} already-processed files")
+        if summary['skipped'] > 0:
+            logger.info(f"⊘ Skipped {summary['skipped']} already-processed files")
+
+        workers = max(1, min(workers, len(pending) or 1))
+        shards = [pending[i::workers] for i in range(workers)]
+
+        start = perf_counter()
+        if workers == 1:
+            results = [self._process_shard(shards[0])]
+        else:
+            logger.info(f"Loading {len(pending)} files with {workers} workers")
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='json_reader') as pool:
+                results = list(pool.map(self._process_shard, shards))
+        elapsed = perf_counter() - start
+
+        for loaded, failed, rows in results:
+            summary['files'] += loaded
+            summary['failed'] += failed
+            summary['rows'] += rows
+        summary['seconds'] = round(elapsed, 3)
+        summary['rows_per_sec'] = round(summary['rows'] / elapsed, 1) if elapsed > 0 else 0.0
+
+        if pending:
+            logger.info(
+                f"✓ JSON load: {summary['rows']} rows from {summary['files']} files "
+                f"({summary['failed']} failed) in {summary['seconds']}s "
+                f"→ {summary['rows_per_sec']} rows/sec"
+            )
+        return summary
+
+    def _process_shard(self, files):
+        """Load a shard of files over a single pooled connection.
+
+        Returns:
+            Tuple of (files_loaded, files_failed, rows_loaded)
+        """
+        loaded = failed = rows = 0
+        if not files:
+            return loaded, failed, rows
+        with self.engine.connect() as conn:
+            for json_file in files:
+                file_rows = self._process_json_file(json_file, conn)
+                if file_rows is None:
+                    failed += 1
+                else:
+                    loaded += 1
+                    rows += file_rows
+        return loaded, failed, rows
     
-    def _process_json_file(self, file_path: Path):
-        """Process individual JSON file and extract individual players"""
+    def _parse_json_file(self, file_path: Path, load_start_time: datetime):
+        """Parse a team JSON dump into ready-to-insert stg_player_raw rows.
+
+        Rows are built with their final status, end time and row count so the
+        whole file can be written with a single executemany and no follow-up
+        UPDATE pass.
+
+        Returns:
+            Tuple of (season_year, list of row parameter dicts)
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        # Extract season from parent folder name (e.g., "Season_1992" -> 1992)
+        season_folder = file_path.parent.name  # e.g., "Season_1992"
+        try:
+            season_year = int(season_folder.split('_')[1])
+        except (IndexError, ValueError):
+            season_year = None
+
+        # Get team ID from the top-level "id" field
+        team_id = data.get('id')
+
+        # Extract players from the "players" array
+        players = data.get('players', [])
+        if not isinstance(players, list):
+            players = [players]
+
+        file_key = f"{file_path.parent.name}/{file_path.name}"
+        rows = []
+        for player in players:
+            player_id = player.get('id')
+            if not player_id:
+                continue
+            rows.append({
+                'file_name': file_path.name,
+                'file_path': file_key,
+                'season': season_year,
+                'load_start_time': load_start_time,
+                'player_id': player_id,
+                'player_name': player.get('name'),
+                'team': team_id,
+                'position': player.get('position'),
+                'birth_date': _parse_birth_date(player.get('dateOfBirth')),
+                'nationality': _first_nationality(player.get('nationality')),
+                'raw_data': json.dumps(player),
+            })
+
+        # Every row of the file shares the same completion metadata
+        load_end_time = datetime.now()
+        for row in rows:
+            row['status'] = 'SUCCESS'
+            row['load_end_time'] = load_end_time
+            row['rows_processed'] = len(rows)
+
+        return season_year, rows
+
+    def _insert_player_rows(self, conn, rows):
+        """Write parsed player rows to stg_player_raw in one executemany batch."""
+        if not rows:
+            return
+        conn.execute(PLAYER_INSERT_SQL, rows)
+
+    def _process_json_file(self, file_path: Path, conn=None):
+        """Process individual JSON file and extract individual players
+
+        Args:
+            file_path: Path of the team JSON dump
+            conn: Optional open connection to reuse (one per worker)
+
+        Returns:
+            Number of rows staged, or None if the file failed
+        """
+        if conn is None:
+            with self.engine.connect() as own_conn:
+                return self._process_json_file(file_path, own_conn)
+
         load_start_time = datetime.now()
         total_rows = 0
+        season_year = None
         error_msg = None
         status = 'SUCCESS'
         file_key = f"{file_path.parent.name}/{file_path.name}"
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Extract season from parent folder name (e.g., "Season_1992" -> 1992)
-            season_folder = file_path.parent.name  # e.g., "Season_1992"
-            try:
-                season_year = int(season_folder.split('_')[1])
-            except (IndexError, ValueError):
-                season_year = None
-            
-            # Get team ID from the top-level "id" field
-            team_id = data.get('id')
-            
-            # Extract players from the "players" array
-            players = data.get('players', [])
-            if not isinstance(players, list):
-                players = [players]
-            
-            # Insert each individual player into staging table
-            with self.engine.connect() as conn:
-                for player in players:
-                    player_id = player.get('id')
-                    
-                    if not player_id:
-                        continue
-                    
-                    # Use filename as file_name, full path as file_path
-                    sql = text('''
-                        INSERT INTO stg_player_raw 
-                        (file_name, file_path, season, load_start_time, status, 
-                         rows_processed, player_id, player_name, team, position, raw_data, created_at)
-                        VALUES (:file_name, :file_path, :season, :load_start_time, 'PENDING',
-                                1, :player_id, :player_name, :team, :position, :raw_data, :created_at)
-                    ''')
-                    conn.execute(sql, {
-                        'file_name': file_path.name,
-                        'file_path': file_key,
-                        'season': season_year,
-                        'load_start_time': load_start_time,
-                        'player_id': player_id,
-                        'player_name': player.get('name'),
-                        'team': team_id,
-                        'position': player.get('position'),
-                        'raw_data': json.dumps(player),
-                        'created_at': datetime.now()
-                    })
-                    total_rows += 1
-                
-                # Update all rows to mark load completion
-                load_end_time = datetime.now()
-                update_sql = text('''
-                    UPDATE stg_player_raw 
-                    SET status = :status, 
-                        load_end_time = :load_end_time,
-                        rows_processed = :rows_processed
-                    WHERE file_name = :file_name 
-                      AND file_path = :file_path
-                      AND status = 'PENDING'
-                ''')
-                conn.execute(update_sql, {
-                    'status': 'SUCCESS',
-                    'load_end_time': load_end_time,
-                    'rows_processed': total_rows,
-                    'file_name': file_path.name,
-                    'file_path': file_key
-                })
-                
+            season_year, rows = self._parse_json_file(file_path, load_start_time)
+            total_rows = len(rows)
+            load_end_time = rows[0]['load_end_time'] if rows else datetime.now()
+
+            # Staging rows and manifest entry commit together (per-file atomicity)
+            with conn.begin():
+                self._insert_player_rows(conn, rows)
+
                 # Log to manifest so we skip next time
-                manifest_sql = text('''
-                    INSERT INTO ETL_JSON_Manifest (file_name, file_path, season, load_start_time, load_end_time, status, rows_processed)
-                    VALUES (:file_name, :file_path, :season, :load_start_time, :load_end_time, :status, :rows_processed)
-                ''')
-                conn.execute(manifest_sql, {
+                conn.execute(MANIFEST_INSERT_SQL, {
                     'file_name': file_path.name,
                     'file_path': file_key,
                     'season': season_year,
                     'load_start_time': load_start_time,
                     'load_end_time': load_end_time,
                     'status': 'SUCCESS',
-                    'rows_processed': total_rows
+                    'rows_processed': total_rows,
+                    'error_message': None
                 })
-                conn.commit()
             
             logger.info(f"✓ Loaded {total_rows} records from {file_key}")
+            return total_rows
         
         except Exception as e:
             logger.error(f"✗ Error processing {file_key}: {e}")
@@ -152,12 +264,10 @@ class JSONReader:
             
             # Log error to manifest
             try:
-                with self.engine.connect() as conn:
-                    manifest_sql = text('''
-                        INSERT INTO ETL_JSON_Manifest (file_name, file_path, season, load_start_time, load_end_time, status, rows_processed, error_message)
-                        VALUES (:file_name, :file_path, :season, :load_start_time, :load_end_time, :status, :rows_processed, :error_message)
-                    ''')
-                    conn.execute(manifest_sql, {
+                if conn.in_transaction():
+                    conn.rollback()
+                with conn.begin():
+                    conn.execute(MANIFEST_INSERT_SQL, {
                         'file_name': file_path.name,
                         'file_path': file_key,
                         'season': season_year,
@@ -167,16 +277,77 @@ class JSONReader:
                         'rows_processed': total_rows if total_rows > 0 else None,
                         'error_message': error_msg
                     })
-                    conn.commit()
             except Exception as log_error:
                 logger.error(f"Failed to log error: {log_error}")
+            return None
+
+    def benchmark(self, limit_files: int = None) -> dict:
+        """Measure parse and insert throughput over the Season_* tree.
+
+        Each file's executemany runs inside a transaction that is rolled back,
+        so the benchmark exercises the real insert path without touching
+        stg_player_raw or the manifest.
+
+        Args:
+            limit_files: Optional cap on the number of files to benchmark
+
+        Returns:
+            Dictionary with files, rows, parse/insert seconds and rows/sec
+        """
+        json_files = sorted(self.json_dir.glob('Season_*/*.json'))
+        if limit_files:
+            json_files = json_files[:limit_files]
+
+        total_rows = 0
+        parse_seconds = 0.0
+        insert_seconds = 0.0
+        for json_file in json_files:
+            t0 = perf_counter()
+            _, rows = self._parse_json_file(json_file, datetime.now())
+            t1 = perf_counter()
+            with self.engine.connect() as conn:
+                trans = conn.begin()
+                try:
+                    self._insert_player_rows(conn, rows)
+                finally:
+                    trans.rollback()
+            t2 = perf_counter()
+            total_rows += len(rows)
+            parse_seconds += t1 - t0
+            insert_seconds += t2 - t1
+
+        total_seconds = parse_seconds + insert_seconds
+        results = {
+            'files': len(json_files),
+            'rows': total_rows,
+            'parse_seconds': round(parse_seconds, 3),
+            'insert_seconds': round(insert_seconds, 3),
+            'rows_per_sec': round(total_rows / total_seconds, 1) if total_seconds else 0.0
+        }
+        logger.info(
+            f"Benchmark: {results['rows']} rows from {results['files']} files "
+            f"(parse {results['parse_seconds']}s, insert {results['insert_seconds']}s) "
+            f"→ {results['rows_per_sec']} rows/sec"
+        )
+        return results
     
     def close(self):
         """Cleanup database resources"""
         self.engine.dispose()
 
 if __name__ == '__main__':
-    json_reader = JSONReader('data/raw/json')
-    json_reader.read_json_files()
-    json_reader.close()
-    logger.info("✓ ETL process completed")
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Load player JSON dumps into stg_player_raw")
+    parser.add_argument("--json-dir", default='data/raw/json', help="Root folder holding Season_*/ subfolders")
+    parser.add_argument("--benchmark", action="store_true", help="Measure ingest throughput without persisting rows")
+    parser.add_argument("--limit-files", type=int, default=None, help="Limit the number of files used by --benchmark")
+    parser.add_argument("--workers", type=int, default=JSON_READER_WORKERS, help="Worker threads for concurrent ingestion")
+    args = parser.parse_args()
+
+    json_reader = JSONReader(args.json_dir)
+    if args.benchmark:
+        json_reader.benchmark(limit_files=args.limit_files)
+    else:
+        json_reader.read_json_files(workers=args.workers)
+        logger.info("✓ ETL process completed")
+    json_reader.close()
\ No newline at end of file
@@ -41,19 +41,26 @@ def _get_statsbomb_path() -> Path:
     """Get StatsBomb repository path (supports both git clone and downloaded ZIP).
     
     Looks for:
-    1. data/raw/open-data-master (extracted from ZIP)
-    2. data/raw/statsbomb_open (from git clone)
-    
+    1. STATSBOMB_DATA_DIR env var (e.g. a synthetic corpus from
+       src/data_generators/statsbomb_events_mock.py)
+    2. data/raw/open-data-master (extracted from ZIP)
+    3. data/raw/statsbomb_open (from git clone)
+
     Returns:
         Path to the statsbomb repository root
     """
     global STATSBOMB_LOCAL_PATH
     if STATSBOMB_LOCAL_PATH is None:
         project_root = Path(__file__).resolve().parents[3]
-        
+
+        # Explicit override wins (relative paths resolve against the project root)
+        override = os.getenv("STATSBOMB_DATA_DIR")
         # Try open-data-master first (from ZIP download)
         master_path = project_root / "data" / "raw" / "open-data-master"
-        if master_path.exists():
+        if override:
+            STATSBOMB_LOCAL_PATH = project_root / override
+            logger.info(f"✓ Using STATSBOMB_DATA_DIR at {STATSBOMB_LOCAL_PATH}")
+        elif master_path.exists():
             logger.info(f"✓ Using open-data-master repository at {master_path}")
             STATSBOMB_LOCAL_PATH = master_path
         else:
@@ -71,6 +78,10 @@ def clone_or_update_statsbomb_repo() -> bool:
     """
     statsbomb_path = _get_statsbomb_path()
     
+    if os.getenv("STATSBOMB_DATA_DIR"):
+        logger.info(f"✓ STATSBOMB_DATA_DIR set, using local corpus at {statsbomb_path} (no git sync)")
+        return statsbomb_path.exists()
+    
     try:
         if statsbomb_path.exists():
             logger.info(f"✓ StatsBomb repo exists at: {statsbomb_path}")
@@ -0,0 +1,54 @@
+"""Client-side rate limiting for extractors that call remote services.
+
+Exposed classes:
+- TokenBucket(rate_per_minute, capacity=None) -> thread-safe blocking limiter
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket honouring a per-minute request quota.
+
+    The bucket starts full, so up to `capacity` calls go out immediately and
+    further calls are released at `rate_per_minute / 60` per second. Every
+    worker of a concurrent extractor shares one bucket, so the combined call
+    rate never exceeds the quota.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate_per_sec = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_sec)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available, then consume them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate_per_sec
+            time.sleep(delay)
+            waited += delay
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the server answers 429 Too Many Requests."""
+        with self._lock:
+            self._tokens = 0.0
+            self._updated = time.monotonic()
@@ -1,6 +1,441 @@
-"""Bulk load facts into the warehouse."""
+"""Bulk load facts into the warehouse.
+
+fact_match_events is loaded in statsbomb_match_id range chunks instead of one
+INSERT ... SELECT over the whole staging table:
+1. Plan: the StatsBomb matches whose staging fingerprint differs from
+   ETL_Fact_Events_Manifest are split into ranges of EVENT_CHUNK_MATCHES matches
+2. Load: each range runs load_fact_match_events_step3_final.sql on its own
+   pooled connection, FACT_LOAD_WORKERS ranges at a time, and commits once
+   (delete + insert + manifest rows), so locks and undo stay chunk-sized
+3. Resume: the manifest rows committed with a chunk are its checkpoint; after
+   a failure the next run plans only the chunks that did not commit.
+   A chunk that hits a deadlock or lock wait timeout is retried.
+With a KeyResolver (ETL_FACT_KEY_RESOLUTION=python) a chunk reads its staged
+rows, resolves the surrogate keys in process and bulk-inserts the finished
+fact rows instead of running the SQL script (same rows, same checkpoints).
+
+fact_match_events is LIST-partitioned by season_id, one partition per
+dim_season row (ensure_event_partitions adds new seasons before a load).
+A whole season is reloaded by building it in a standalone table and swapping
+it in with EXCHANGE PARTITION (reload_event_season), and an old season leaves
+with DROP PARTITION (archive_event_season) instead of a multi-million-row DELETE.
+
+Exposed functions:
+- load_facts(engine, df, table_name, if_exists) -> True
+- plan_event_chunks(engine, chunk_matches) -> list of (range_low, range_high)
+- load_fact_match_events_chunked(engine, runner, script_path, chunk_matches, max_workers, resolver) -> summary dict
+- ensure_event_partitions(engine) -> names of the partitions added
+- reload_event_season(engine, runner, season_id, script_path) -> summary dict
+- archive_event_season(engine, season_id, keep_table) -> summary dict
+
+Private helpers:
+- _pending_matches(conn, chunk) -> rows of (statsbomb_match_id, rows_processed, load_end_time)
+- _sql_chunk_attempt(engine, runner, statements) -> events inserted
+- _resolved_chunk_attempt(engine, resolver, chunk) -> events inserted
+- _load_event_chunk(chunk, attempt) -> outcome dict
+- _event_partitions(conn) -> {partition name: season_id}
+- _season_partition(season_id) -> partition name
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import bindparam, text
+
+from ..config import EVENT_CHUNK_MATCHES, FACT_LOAD_WORKERS
+from ..event_log import get_event_logger
+from ..transform.key_resolver import FACT_EVENT_COLUMNS
+
+# Rows per executemany when bulk-loading resolved fact rows
+INSERT_BATCH_ROWS = 10_000
+
+# Retries for a chunk that lost a lock conflict to a concurrent chunk
+CHUNK_RETRIES = 2
+_RETRYABLE = ("1213", "1205", "Deadlock", "Lock wait timeout")
+
+SEASON_EXCHANGE_SCRIPT = Path(__file__).resolve().parents[2] / "sql" / "load_fact_match_events_season_exchange.sql"
 
 
 def load_facts(engine, df, table_name, if_exists="append"):
     df.to_sql(table_name, engine, if_exists=if_exists, index=False)
     return True
+
+
+def _pending_matches(conn, chunk: Optional[Tuple[int, int]] = None) -> list:
+    """StatsBomb matches whose staging fingerprint differs from the last load.
+
+    Same filters as step 3's tmp_pending_event_matches: only mapped matches
+    whose events are still staged, so matches the load cannot write (and would
+    never checkpoint) are not planned again on every run.
+    """
+    in_range = "AND dmm.statsbomb_match_id BETWEEN :low AND :high" if chunk else ""
+    return conn.execute(text(f"""
+        SELECT  dmm.statsbomb_match_id,
+                em.rows_processed,
+                em.load_end_time
+        FROM    ETL_Events_Manifest em
+        JOIN    dim_match_mapping dmm ON dmm.statsbomb_match_id = CAST(em.statsbomb_match_id AS UNSIGNED)
+        JOIN    fact_match fm ON fm.match_id = dmm.csv_match_id
+        LEFT JOIN ETL_Fact_Events_Manifest fl ON fl.statsbomb_match_id = dmm.statsbomb_match_id
+        WHERE   em.status = 'SUCCESS'
+          AND   (fl.statsbomb_match_id IS NULL
+                 OR NOT (fl.staged_events <=> em.rows_processed)
+                 OR NOT (fl.staged_at <=> em.load_end_time))
+          AND   EXISTS (SELECT 1 FROM stg_events_raw se WHERE se.statsbomb_match_id = dmm.statsbomb_match_id)
+          {in_range}
+        ORDER BY 1
+    """), {"low": chunk[0], "high": chunk[1]} if chunk else {}).all()
+
+
+def plan_event_chunks(engine, chunk_matches: int = EVENT_CHUNK_MATCHES) -> List[Tuple[int, int]]:
+    """Split the StatsBomb matches waiting to be (re)loaded into id ranges.
+
+    Args:
+        engine: SQLAlchemy engine connected to the data warehouse
+        chunk_matches: Matches per range
+
+    Returns:
+        Ascending, non-overlapping (range_low, range_high) tuples; empty if
+        every staged match is already materialized
+    """
+    with engine.connect() as conn:
+        match_ids = [row.statsbomb_match_id for row in _pending_matches(conn)]
+
+    chunk_matches = max(1, chunk_matches)
+    return [
+        (match_ids[i], match_ids[min(i + chunk_matches, len(match_ids)) - 1])
+        for i in range(0, len(match_ids), chunk_matches)
+    ]
+
+
+def _sql_chunk_attempt(engine, runner, statements: List[dict]) -> int:
+    """Run the step 3 statements of one range in a single transaction."""
+    rows = 0
+    with engine.connect() as conn:
+        for statement in statements:
+            entry, _ = runner.execute(conn, statement, commit=False)
+            if entry["status"] == "FAILED":
+                raise RuntimeError(f"{statement['name']} (line {statement['line']}): {entry['error_message']}")
+            if statement["name"].startswith("insert_fact_match_events"):
+                rows = entry["rows_affected"] or 0
+        conn.commit()
+    return rows
+
+
+def _resolved_chunk_attempt(engine, resolver, chunk: Tuple[int, int]) -> int:
+    """Load one range with in-process key resolution, in a single transaction.
+
+    Same rows as the step 3 script: pending matches that are mapped and still
+    staged are replaced, then their fingerprints are recorded.
+    """
+    with engine.begin() as conn:
+        pending = pd.DataFrame(_pending_matches(conn, chunk),
+                               columns=["statsbomb_match_id", "rows_processed", "load_end_time"])
+        staged = pd.read_sql(text("""
+            SELECT event_id, statsbomb_match_id, statsbomb_period, minute, type,
+                   player_name, team_id, team_name, status
+            FROM   stg_events_raw
+            WHERE  statsbomb_match_id BETWEEN :low AND :high
+        """), conn, params={"low": chunk[0], "high": chunk[1]})
+
+        match_id, _, _ = resolver.resolve_matches(pending["statsbomb_match_id"])
+        pending["match_id"] = match_id
+        pending = pending[(match_id >= 0) & pending["statsbomb_match_id"].isin(staged["statsbomb_match_id"])]
+        if pending.empty:
+            return 0
+
+        staged = staged[staged["statsbomb_match_id"].isin(pending["statsbomb_match_id"])
+                        & (staged["status"] == "LOADED")
+                        & staged["minute"].between(0, 120)]
+        facts = resolver.resolve_events(staged)
+        match_ids = pending["statsbomb_match_id"].tolist()
+
+        conn.execute(
+            text("DELETE FROM fact_match_events WHERE statsbomb_match_id IN :ids")
+            .bindparams(bindparam("ids", expanding=True)),
+            {"ids": match_ids},
+        )
+        insert = text(
+            f"INSERT INTO fact_match_events ({', '.join(FACT_EVENT_COLUMNS)}) "
+            f"VALUES ({', '.join(':' + c for c in FACT_EVENT_COLUMNS)}) "
+            "ON DUPLICATE KEY UPDATE "
+            + ", ".join(f"{c} = VALUES({c})" for c in FACT_EVENT_COLUMNS[3:])
+        )
+        records = facts.astype(object).to_dict("records")
+        for start in range(0, len(records), INSERT_BATCH_ROWS):
+            conn.execute(insert, records[start:start + INSERT_BATCH_ROWS])
+
+        loaded = facts["statsbomb_match_id"].value_counts()
+        conn.execute(text("""
+            INSERT INTO ETL_Fact_Events_Manifest
+                    (statsbomb_match_id, match_id, staged_events, staged_at, events_loaded, loaded_at)
+            VALUES  (:statsbomb_match_id, :match_id, :rows_processed, :load_end_time, :events_loaded, NOW())
+            ON DUPLICATE KEY UPDATE
+                    match_id = VALUES(match_id),
+                    staged_events = VALUES(staged_events),
+                    staged_at = VALUES(staged_at),
+                    events_loaded = VALUES(events_loaded),
+                    loaded_at = VALUES(loaded_at)
+        """), [
+            {**row, "events_loaded": int(loaded.get(row["statsbomb_match_id"], 0))}
+            for row in pending.astype(object).where(pending.notna(), None).to_dict("records")
+        ])
+    return len(records)
+
+
+def _load_event_chunk(chunk: Tuple[int, int], attempt) -> dict:
+    """Run one chunk, retrying lock conflicts with concurrent chunks.
+
+    Args:
+        chunk: (range_low, range_high)
+        attempt: Callable loading the chunk in one transaction; returns events inserted
+
+    Returns:
+        {'chunk': (low, high), 'rows': events inserted, 'seconds': float,
+         'attempts': int, 'error': message or None}
+    """
+    started = time.perf_counter()
+    for attempts in range(1, CHUNK_RETRIES + 2):
+        rows, error = 0, None
+        try:
+            rows = attempt()
+        except Exception as e:
+            error = str(e)
+        if error is None or attempts > CHUNK_RETRIES or not any(code in error for code in _RETRYABLE):
+            break
+        time.sleep(attempts)
+    return {"chunk": chunk, "rows": rows, "seconds": time.perf_counter() - started,
+            "attempts": attempts, "error": error}
+
+
+def load_fact_match_events_chunked(
+    engine,
+    runner,
+    script_path,
+    chunk_matches: int = EVENT_CHUNK_MATCHES,
+    max_workers: int = FACT_LOAD_WORKERS,
+    resolver=None,
+) -> dict:
+    """Load fact_match_events for new or re-staged matches, range by range.
+
+    Chunks run concurrently on separate connections; a failed chunk does not
+    stop the others (its matches stay pending for the next run).
+
+    Args:
+        engine: SQLAlchemy engine connected to the data warehouse
+        runner: SqlScriptRunner that profiles every chunk's statements
+        script_path: Path to load_fact_match_events_step3_final.sql
+        chunk_matches: StatsBomb matches per chunk
+        max_workers: Chunks loaded at once (1 = sequential)
+        resolver: KeyResolver; when given, chunks resolve keys in process and
+            bulk-insert instead of running script_path
+
+    Returns:
+        {'chunks': int, 'completed': int, 'failed': [outcome dicts],
+         'rows': events inserted, 'elapsed_seconds': float, 'success': bool}
+    """
+    events = get_event_logger(engine)
+    added = ensure_event_partitions(engine)
+    if added:
+        print(f"    [OK] Added fact_match_events partitions: {', '.join(added)}")
+    chunks = plan_event_chunks(engine, chunk_matches)
+    summary = {"chunks": len(chunks), "completed": 0, "failed": [], "rows": 0,
+               "elapsed_seconds": 0.0, "success": True}
+    if not chunks:
+        print("    [OK] No new or re-staged matches to load")
+        return summary
+
+    print(f"    Loading {len(chunks)} chunks of up to {chunk_matches} matches ({max_workers} workers)...")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="fact_events") as pool:
+        futures = []
+        for low, high in chunks:
+            if resolver is not None:
+                attempt = partial(_resolved_chunk_attempt, engine, resolver, (low, high))
+            else:
+                statements = runner.parse_file(script_path, {"range_low": low, "range_high": high})
+                for statement in statements:
+                    statement["name"] = f"{statement['name']}[{low}-{high}]"
+                attempt = partial(_sql_chunk_attempt, engine, runner, statements)
+            futures.append(pool.submit(_load_event_chunk, (low, high), attempt))
+        for done, future in enumerate(as_completed(futures), 1):
+            outcome = future.result()
+            low, high = outcome["chunk"]
+            retried = f", {outcome['attempts']} attempts" if outcome["attempts"] > 1 else ""
+            if outcome["error"] is None:
+                summary["completed"] += 1
+                summary["rows"] += outcome["rows"]
+                print(f"    [{done}/{len(chunks)}] [OK] matches {low}-{high}: "
+                      f"{outcome['rows']:,} events ({outcome['seconds']:.2f}s{retried})")
+            else:
+                summary["failed"].append(outcome)
+                print(f"    [{done}/{len(chunks)}] [ERROR] matches {low}-{high}: {outcome['error'][:300]}")
+            events.log(
+                job_name="load_fact_match_events",
+                phase_step=f"chunk {low}-{high}",
+                status="COMPLETED" if outcome["error"] is None else "FAILED",
+                end_time=datetime.now(),
+                rows_processed=outcome["rows"],
+                message=outcome["error"][:300] if outcome["error"] else
+                        f"[OK] {outcome['rows']} events ({outcome['seconds']:.2f}s{retried})",
+            )
+
+    summary["elapsed_seconds"] = time.perf_counter() - started
+    summary["success"] = not summary["failed"]
+    return summary
+
+
+def _season_partition(season_id: int) -> str:
+    return f"p_season_{int(season_id)}"
+
+
+def _event_partitions(conn) -> Dict[str, int]:
+    """Current partitions of fact_match_events and the season each one holds."""
+    rows = conn.execute(text("""
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION
+        FROM   information_schema.PARTITIONS
+        WHERE  TABLE_SCHEMA = DATABASE()
+          AND  TABLE_NAME = 'fact_match_events'
+          AND  PARTITION_NAME IS NOT NULL
+    """)).all()
+    return {row[0]: int(row[1]) for row in rows}
+
+
+def ensure_event_partitions(engine) -> List[str]:
+    """Add a fact_match_events partition for every dim_season row without one.
+
+    A row whose season has no partition is rejected by MySQL (error 1526), so
+    this runs before each load; adding an empty LIST partition is metadata only.
+
+    Args:
+        engine: SQLAlchemy engine connected to the data warehouse
+
+    Returns:
+        Names of the partitions added (empty if all seasons already had one)
+    """
+    with engine.connect() as conn:
+        covered = set(_event_partitions(conn).values())
+        seasons = conn.execute(text("SELECT season_id FROM dim_season WHERE season_id > 0 ORDER BY season_id")).scalars().all()
+        added = []
+        for season_id in seasons:
+            if season_id in covered:
+                continue
+            name = _season_partition(season_id)
+            conn.execute(text(
+                f"ALTER TABLE fact_match_events ADD PARTITION (PARTITION {name} VALUES IN ({int(season_id)}))"
+            ))
+            added.append(name)
+    return added
+
+
+def reload_event_season(engine, runner, season_id: int, script_path=SEASON_EXCHANGE_SCRIPT) -> dict:
+    """Rebuild one season of fact_match_events and swap it in with EXCHANGE PARTITION.
+
+    The season's staged matches are resolved from stg_events_raw, its other
+    matches keep their current rows; readers see the old partition until the
+    exchange and the new one right after it.
+
+    Args:
+        engine: SQLAlchemy engine connected to the data warehouse
+        runner: SqlScriptRunner that profiles the script's statements
+        season_id: dim_season.season_id to reload
+        script_path: Path to load_fact_match_events_season_exchange.sql
+
+    Returns:
+        {'season_id', 'partition', 'events': rows in the partition afterwards,
+         'matches_reloaded', 'elapsed_seconds', 'success', 'error'}
+    """
+    started = time.perf_counter()
+    ensure_event_partitions(engine)
+    partition = _season_partition(season_id)
+    summary = {"season_id": season_id, "partition": partition, "events": 0, "matches_reloaded": 0,
+               "elapsed_seconds": 0.0, "success": False, "error": None}
+
+    with engine.connect() as conn:
+        if partition not in _event_partitions(conn):
+            summary["error"] = f"Season {season_id} is not in dim_season"
+            return summary
+        next_event_id = conn.execute(text("SELECT COALESCE(MAX(event_id), 0) + 1 FROM fact_match_events")).scalar()
+        statements = runner.parse_file(script_path, {
+            "season_id": int(season_id), "partition": partition, "next_event_id": next_event_id,
+        })
+        for statement in statements:
+            entry, rows = runner.execute(conn, statement)
+            if entry["status"] == "FAILED":
+                summary["error"] = f"{statement['name']} (line {statement['line']}): {entry['error_message']}"
+                break
+            if statement["name"] == "verify_season" and rows:
+                summary["events"], summary["matches_reloaded"] = int(rows[0][1]), int(rows[0][3])
+
+        # Leave nothing behind after a failure; before the exchange the partition is untouched
+        conn.execute(text("DROP TABLE IF EXISTS fact_match_events_swap"))
+        conn.execute(text("DROP TEMPORARY TABLE IF EXISTS tmp_season_event_matches"))
+        # The exchange may reset the counter below ids that are now in the table
+        next_event_id = conn.execute(text("SELECT COALESCE(MAX(event_id), 0) + 1 FROM fact_match_events")).scalar()
+        conn.execute(text(f"ALTER TABLE fact_match_events AUTO_INCREMENT = {int(next_event_id)}"))
+        conn.commit()
+
+    summary["elapsed_seconds"] = time.perf_counter() - started
+    summary["success"] = summary["error"] is None
+    get_event_logger(engine).log(
+        job_name="load_fact_match_events",
+        phase_step=f"reload season {season_id}",
+        status="COMPLETED" if summary["success"] else "FAILED",
+        end_time=datetime.now(),
+        rows_processed=summary["events"],
+        message=summary["error"][:300] if summary["error"] else
+                f"[OK] {partition}: {summary['events']} events, {summary['matches_reloaded']} matches "
+                f"reloaded ({summary['elapsed_seconds']:.2f}s)",
+    )
+    return summary
+
+
+def archive_event_season(engine, season_id: int, keep_table: bool = True) -> dict:
+    """Take one season out of fact_match_events by dropping its partition.
+
+    Args:
+        engine: SQLAlchemy engine connected to the data warehouse
+        season_id: dim_season.season_id to archive
+        keep_table: Exchange the rows into fact_match_events_archive_<season_id>
+            first (a standalone table that can be dumped or exchanged back);
+            False discards them
+
+    Returns:
+        {'season_id', 'events': rows taken out, 'archive_table': name or None}
+
+    Raises:
+        ValueError: if the season has no partition
+    """
+    partition = _season_partition(season_id)
+    archive_table = f"fact_match_events_archive_{int(season_id)}" if keep_table else None
+    with engine.connect() as conn:
+        if partition not in _event_partitions(conn):
+            raise ValueError(f"fact_match_events has no partition for season {season_id}")
+        events = conn.execute(text(f"SELECT COUNT(*) FROM fact_match_events PARTITION ({partition})")).scalar()
+        if archive_table:
+            conn.execute(text(f"DROP TABLE IF EXISTS {archive_table}"))
+            conn.execute(text(f"CREATE TABLE {archive_table} LIKE fact_match_events"))
+            conn.execute(text(f"ALTER TABLE {archive_table} REMOVE PARTITIONING"))
+            conn.execute(text(f"ALTER TABLE fact_match_events EXCHANGE PARTITION {partition} WITH TABLE {archive_table}"))
+        conn.execute(text(f"ALTER TABLE fact_match_events DROP PARTITION {partition}"))
+        # Without checkpoints the season's matches load again once they are re-staged
+        conn.execute(text("""
+            DELETE fl FROM ETL_Fact_Events_Manifest fl
+            JOIN   fact_match fm ON fm.match_id = fl.match_id
+            WHERE  fm.season_id = :season_id
+        """), {"season_id": season_id})
+        conn.commit()
+
+    get_event_logger(engine).log(
+        job_name="load_fact_match_events",
+        phase_step=f"archive season {season_id}",
+        status="COMPLETED",
+        end_time=datetime.now(),
+        rows_processed=events,
+        message=f"[OK] {partition} dropped ({events} events" + (f", kept in {archive_table})" if archive_table else ")"),
+    )
+    return {"season_id": season_id, "events": events, "archive_table": archive_table}
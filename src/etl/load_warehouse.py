@@ -12,6 +12,7 @@ from src.etl.staging.load_staging import load_all_staging
 from src.etl.transform.clean import clean_player_names
 from src.etl.transform.clean_and_upsert_dim import run_all_upserts
 from src.etl.db import get_engine
+from sqlalchemy import text
 import pandas as pd
 import logging
 
@@ -19,13 +20,74 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 
+# Rows per keyset page when streaming player names through clean_player_names
+CLEAN_CHUNK_SIZE = 50_000
+
+# (table, column, extra filter) trimmed in place, one set-based UPDATE each
+TRIM_COLUMNS = [
+    ("stg_player_raw", "player_name", "status = 'SUCCESS'"),
+    ("stg_team_raw", "name", "status = 'SUCCESS'"),
+    ("stg_e0_match_raw", "HomeTeam", None),
+    ("stg_e0_match_raw", "AwayTeam", None),
+]
+
+
+def _trim_in_place(conn, table, column, where=None):
+    """TRIM one staging column in place; only rows that actually change are written."""
+    sql = (f"UPDATE {table} SET {column} = TRIM({column}) "
+           f"WHERE CHAR_LENGTH({column}) <> CHAR_LENGTH(TRIM({column}))")
+    if where:
+        sql += f" AND {where}"
+    return conn.execute(text(sql)).rowcount
+
+
+def _title_case_player_names(engine, chunk_size=CLEAN_CHUNK_SIZE):
+    """Title-case all-upper or all-lower stg_player_raw.player_name values in bounded chunks.
+
+    MySQL has no INITCAP, so names are streamed by json_id (keyset pages of
+    chunk_size rows, two columns only), cleaned with clean_player_names and
+    written back with one executemany UPDATE per chunk for changed rows only.
+    Mixed-case names are kept as staged: the source casing is authoritative
+    ('Scott McTominay', 'Virgil van Dijk') and str.title() would break it.
+
+    Returns:
+        Number of rows updated
+    """
+    select_sql = text("""
+        SELECT json_id, player_name
+        FROM stg_player_raw
+        WHERE status = 'SUCCESS' AND player_name IS NOT NULL AND json_id > :last_id
+        ORDER BY json_id
+        LIMIT :chunk_size
+    """)
+    update_sql = text("UPDATE stg_player_raw SET player_name = :player_name WHERE json_id = :json_id")
+
+    last_id, updated = 0, 0
+    while True:
+        with engine.connect() as conn:
+            chunk = pd.read_sql(select_sql, conn, params={"last_id": last_id, "chunk_size": chunk_size})
+        if chunk.empty:
+            return updated
+        last_id = int(chunk["json_id"].iloc[-1])
+        names = chunk["player_name"].astype(str)
+        single_case = chunk[names.str.isupper() | names.str.islower()]
+        cleaned = clean_player_names(single_case.copy(), "player_name")
+        changed = cleaned[cleaned["player_name"] != single_case["player_name"]]
+        if not changed.empty:
+            with engine.begin() as conn:
+                conn.execute(update_sql, changed.to_dict("records"))
+            updated += len(changed)
+
+
 def clean_staging_data():
-    """Clean data in staging tables.
+    """Clean data in staging tables, in place.
     
     Applies transformations:
-    - Player names: strip, title case
-    - Remove NULL values where required
-    - Data validation
+    - Player names, team names, match HomeTeam/AwayTeam: strip (set-based UPDATEs)
+    - Player names: title case when staged all upper- or lower-case (streamed
+      in CLEAN_CHUNK_SIZE chunks); mixed-case names keep their source casing
+    
+    Only rows whose value changes are rewritten, so a second run is a no-op.
     """
     print("\n" + "="*70)
     print("STEP 2: CLEANING STAGING DATA")
@@ -34,47 +96,16 @@ def clean_staging_data():
     engine = get_engine()
     
     try:
-        # Clean stg_player_raw
-        print("\nCleaning stg_player_raw...")
-        player_df = pd.read_sql("SELECT * FROM stg_player_raw WHERE status = 'SUCCESS'", engine)
-        
-        if len(player_df) > 0:
-            player_df = clean_player_names(player_df, "player_name")
-            
-            # Log cleaning results
-            logger.info(f"Cleaned {len(player_df)} player records")
-            print(f"[OK] Cleaned {len(player_df)} player records")
-        else:
-            print("! No successfully loaded player records to clean")
-        
-        # Clean stg_team_raw
-        print("\nCleaning stg_team_raw...")
-        team_df = pd.read_sql("SELECT * FROM stg_team_raw WHERE status = 'SUCCESS'", engine)
-        
-        if len(team_df) > 0:
-            # Clean team names
-            if 'name' in team_df.columns:
-                team_df['name'] = team_df['name'].astype(str).str.strip()
-            
-            logger.info(f"Cleaned {len(team_df)} team records")
-            print(f"[OK] Cleaned {len(team_df)} team records")
-        else:
-            print("! No successfully loaded team records to clean")
-        
-        # Clean stg_e0_match_raw
-        print("\nCleaning stg_e0_match_raw...")
-        match_df = pd.read_sql("SELECT * FROM stg_e0_match_raw LIMIT 100000", engine)
+        with engine.begin() as conn:
+            for table, column, where in TRIM_COLUMNS:
+                rows = _trim_in_place(conn, table, column, where)
+                logger.info(f"Trimmed {rows} {table}.{column} values")
+                print(f"[OK] {table}.{column}: {rows} values trimmed")
         
-        if len(match_df) > 0:
-            # Clean team names in match data
-            for col in ['HomeTeam', 'AwayTeam']:
-                if col in match_df.columns:
-                    match_df[col] = match_df[col].astype(str).str.strip()
-            
-            logger.info(f"Cleaned {len(match_df)} match records")
-            print(f"[OK] Cleaned {len(match_df)} match records")
-        else:
-            print("! No match records to clean")
+        print("\nTitle-casing stg_player_raw.player_name...")
+        rows = _title_case_player_names(engine)
+        logger.info(f"Title-cased {rows} player names")
+        print(f"[OK] stg_player_raw.player_name: {rows} values title-cased")
         
         return True
     
@@ -153,10 +184,9 @@ def run_complete_etl_pipeline(limit_data=None):
     
     if transform_status:
         print("\nDimensions Loaded:")
-        print(f"  - dim_player: {transform_results.get('dim_player', (0,0))[0]} rows")
-        print(f"  - dim_team: {transform_results.get('dim_team', (0,0))[0]} rows")
-        print(f"  - dim_stadium: {transform_results.get('dim_stadium', (0,0))[0]} rows")
-        print(f"  - dim_referee: {transform_results.get('dim_referee', (0,0))[0]} rows")
+        for dim in ('dim_player', 'dim_team', 'dim_stadium', 'dim_referee'):
+            inserted, updated, unchanged = transform_results.get(dim, (0, 0, 0))
+            print(f"  - {dim}: {inserted} inserted, {updated} updated, {unchanged} unchanged")
     
     print("="*70)
 
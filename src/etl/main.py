@@ -4,9 +4,14 @@ from .extract import csv_reader
 from .transform import clean
 from .staging import load_staging
 from .load_warehouse import run_complete_etl_pipeline
-from .config import RAW_DATA_DIR
+from .config import RAW_DATA_DIR, FACT_KEY_RESOLUTION
 from pathlib import Path
 from .db import get_engine
+from .event_log import get_event_logger
+from .sql_runner import SqlScriptRunner
+from .load.load_facts import load_fact_match_events_chunked, reload_event_season, archive_event_season
+from .transform.key_resolver import KeyResolver
+from .transform.team_alias import TEAM_ALIAS_SOURCES, register_team_aliases
 from sqlalchemy import text
 import subprocess
 import os
@@ -46,40 +51,41 @@ def generate_player_stats_mock_data():
     
     engine = get_engine()
     
+    rows = [
+        {
+            'pname': player_name,
+            'tname': team_name,
+            'mins': 2000 + (idx * 150),
+            'goals': (idx + 1) % 20,
+            'assists': (idx + 1) % 10,
+            'xg': float(2 + (idx % 15)),
+            'xa': float((idx % 8)),
+            'yc': idx % 3,
+            'rc': 0,
+            'shots': 3 + (idx % 10),
+            'sot': 1 + (idx % 5),
+            'season': f'{season_year}-{season_year+1}'
+        }
+        for team_name, player_list in PLAYERS_BY_TEAM.items()
+        for season_year in range(2017, 2025)
+        for idx, player_name in enumerate(player_list)
+    ]
+    
     try:
-        with engine.connect() as conn:
+        with engine.begin() as conn:
             # Clear existing data
             conn.execute(text('DELETE FROM stg_player_stats_fbref'))
             
-            row_count = 0
-            for team_name, player_list in PLAYERS_BY_TEAM.items():
-                for season_year in range(2017, 2025):
-                    season = f'{season_year}-{season_year+1}'
-                    for idx, player_name in enumerate(player_list):
-                        conn.execute(text('''
-                            INSERT INTO stg_player_stats_fbref 
-                            (player_name, team_name, minutes_played, goals, assists, xg, xa, 
-                             yellow_cards, red_cards, shots, shots_on_target, season_label)
-                            VALUES (:pname, :tname, :mins, :goals, :assists, :xg, :xa, :yc, :rc, :shots, :sot, :season)
-                        '''), {
-                            'pname': player_name,
-                            'tname': team_name,
-                            'mins': 2000 + (idx * 150),
-                            'goals': (idx + 1) % 20,
-                            'assists': (idx + 1) % 10,
-                            'xg': float(2 + (idx % 15)),
-                            'xa': float((idx % 8)),
-                            'yc': idx % 3,
-                            'rc': 0,
-                            'shots': 3 + (idx % 10),
-                            'sot': 1 + (idx % 5),
-                            'season': season
-                        })
-                        row_count += 1
+            # One executemany for all rows instead of a round trip per row
+            conn.execute(text('''
+                INSERT INTO stg_player_stats_fbref 
+                (player_name, team_name, minutes_played, goals, assists, xg, xa, 
+                 yellow_cards, red_cards, shots, shots_on_target, season_label)
+                VALUES (:pname, :tname, :mins, :goals, :assists, :xg, :xa, :yc, :rc, :shots, :sot, :season)
+            '''), rows)
             
-            conn.commit()
-            print(f"[SUCCESS] Generated {row_count} player stats records with valid team names")
-            return True
+        print(f"[SUCCESS] Generated {len(rows)} player stats records with valid team names")
+        return True
             
     except Exception as e:
         print(f"[ERROR] Failed to generate player stats mock data: {str(e)}")
@@ -174,6 +180,15 @@ def run_full_etl_and_facts(limit_data=None):
         print(f"\n[ERROR] Integrated pipeline failed: {str(e)}")
         return False
 
+def _print_profile(runner, top=5):
+    """Print the slowest statements of a SqlScriptRunner run and write its JSON report."""
+    print(f"\nSlowest statements ({runner.job_name}):")
+    for entry in runner.slowest(top):
+        rows = entry['rows_affected'] if entry['rows_affected'] is not None else '-'
+        print(f"  {entry['elapsed_seconds']:9.2f}s  {entry['script_name']:<42} {entry['statement_name']:<32} rows={rows}")
+    print(f"Profile report: {runner.write_report()} (rows in ETL_Sql_Profile, run_id={runner.run_id})")
+
+
 def load_fact_tables():
     """Load fact tables using optimized SQL scripts with progress bar and logging"""
     print("\n" + "="*80)
@@ -194,6 +209,7 @@ def load_fact_tables():
     # Get SQL directory path (src/sql)
     sql_dir = Path(__file__).parent.parent / "sql"
     engine = get_engine()
+    events = get_event_logger(engine)
     
     # Scripts to run in order (includes load_fact_match as step 1!)
     scripts = [
@@ -201,29 +217,23 @@ def load_fact_tables():
         ("load_fact_player_stats.sql", "Load fact_player_stats from staging (1600 records)"),
         ("load_fact_match_events_step1.sql", "Step 1: Create temporary aggregation table"),
         ("load_fact_match_events_step2.sql", "Step 2: Verify match mappings"),
-        ("load_fact_match_events_step3_final.sql", "Step 3: Load 1.36M events into fact_match_events"),
+        ("load_fact_match_events_step3_final.sql", "Step 3: Load events of new or re-staged matches into fact_match_events"),
         ("load_fact_match_events_step4_verify.sql", "Step 4: Verify loaded data"),
         ("final_row_count.sql", "Final verification: Show all table row counts"),
     ]
     
     # Log start to ETL_Log
     start_time = datetime.now()
-    try:
-        with engine.connect() as conn:
-            log_query = text("""
-                INSERT INTO etl_log (job_name, phase_step, status, start_time, message)
-                VALUES (:job, :phase, :stat, :start, :msg)
-            """)
-            conn.execute(log_query, {
-                "job": "load_fact_tables",
-                "phase": "initialization",
-                "stat": "STARTED",
-                "start": start_time,
-                "msg": f"Starting fact table load with {len(scripts)} scripts"
-            })
-            conn.commit()
-    except Exception as e:
-        print(f"[WARNING] Could not log to ETL_Log: {str(e)}")
+    events.log(
+        job_name="load_fact_tables",
+        phase_step="initialization",
+        status="STARTED",
+        start_time=start_time,
+        message=f"Starting fact table load with {len(scripts)} scripts",
+    )
+    
+    # Per-statement timings go to ETL_Sql_Profile and a JSON report
+    runner = SqlScriptRunner(engine, "load_fact_tables")
     
     # Progress bar for overall scripts
     print("\nExecuting SQL scripts with progress:\n")
@@ -239,116 +249,177 @@ def load_fact_tables():
             
             print(f"\n  [{idx}/{len(scripts)}] {description}")
             
-            # Read SQL file
-            with open(script_path, 'r') as f:
-                sql_content = f.read()
+            # Events are loaded in statsbomb_match_id range chunks, in parallel
+            if script_name == "load_fact_match_events_step3_final.sql":
+                resolver = None
+                if FACT_KEY_RESOLUTION == "python":
+                    resolver = KeyResolver.load(engine)
+                    print(f"    [OK] Key maps loaded: {len(resolver.matches)} matches, {len(resolver.team_aliases)} team "
+                          f"aliases, {len(resolver.teams)} team versions, {len(resolver.players)} player versions "
+                          f"({resolver.load_seconds:.2f}s)")
+                summary = load_fact_match_events_chunked(engine, runner, script_path, resolver=resolver)
+                step_end = datetime.now()
+                if not summary['success']:
+                    print(f"  [ABORT] {len(summary['failed'])} of {summary['chunks']} event chunks failed "
+                          f"({summary['completed']} committed; the next run resumes with the rest)")
+                    events.log(
+                        job_name="load_fact_tables",
+                        phase_step=script_name,
+                        status="FAILED",
+                        start_time=step_start,
+                        end_time=step_end,
+                        rows_processed=summary['rows'],
+                        message=f"Failed: {len(summary['failed'])}/{summary['chunks']} chunks",
+                    )
+                    print(f"  Profile report: {runner.write_report()}")
+                    events.flush()
+                    return False
+                events.log(
+                    job_name="load_fact_tables",
+                    phase_step=script_name,
+                    status="COMPLETED",
+                    start_time=step_start,
+                    end_time=step_end,
+                    rows_processed=summary['rows'],
+                    message=f"[OK] {description}: {summary['rows']} events in {summary['chunks']} chunks "
+                            f"({summary['elapsed_seconds']:.2f}s)",
+                )
+                continue
             
             # Execute statements
             try:
+                statements = runner.parse_file(script_path)
                 with engine.connect() as conn:
-                    statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-                    
                     # Progress bar for statements in this script
                     for statement in tqdm(statements, desc=f"    {script_name}", leave=False, unit="stmt", ascii=True, disable=False):
-                        try:
-                            result = conn.execute(text(statement))
-                            conn.commit()
-                            
-                            # Print results if SELECT
-                            if statement.strip().upper().startswith("SELECT"):
-                                rows = result.fetchall()
-                                if rows:
-                                    for row in rows[:5]:  # Limit output
-                                        print(f"    -> {row}")
-                                    if len(rows) > 5:
-                                        print(f"    ... and {len(rows)-5} more rows")
-                            # Print INSERT row count
-                            elif statement.strip().upper().startswith("INSERT"):
-                                print(f"    [OK] Inserted {result.rowcount:,} rows")
-                        except Exception as e:
-                            error_msg = str(e)
-                            print(f"\n  [ERROR] Statement error in {script_name}:")
+                        entry, rows = runner.execute(conn, statement)
+                        if entry['status'] == 'FAILED':
+                            error_msg = entry['error_message']
+                            print(f"\n  [ERROR] Statement error in {script_name} ({statement['name']}, line {statement['line']}):")
                             print(f"    {error_msg}")
-                            print(f"    First 200 chars of SQL: {statement[:200]}...")
-                            conn.rollback()
+                            print(f"    First 200 chars of SQL: {statement['sql'][:200]}...")
                             # Log failure
-                            try:
-                                with engine.connect() as log_conn:
-                                    log_conn.execute(text("""
-                                        INSERT INTO etl_log (job_name, phase_step, status, end_time, message)
-                                        VALUES (:job, :phase, :stat, :end, :msg)
-                                    """), {
-                                        "job": "load_fact_tables",
-                                        "phase": script_name,
-                                        "stat": "FAILED",
-                                        "end": datetime.now(),
-                                        "msg": f"Failed: {error_msg[:300]}"
-                                    })
-                                    log_conn.commit()
-                            except:
-                                pass
+                            events.log(
+                                job_name="load_fact_tables",
+                                phase_step=script_name,
+                                status="FAILED",
+                                end_time=datetime.now(),
+                                message=f"Failed: {error_msg[:300]}",
+                            )
                             print(f"  [ABORT] Fact loading aborted due to error in {script_name}")
+                            print(f"  Profile report: {runner.write_report()}")
+                            events.flush()
                             return False
+                        
+                        # Print results if SELECT
+                        if rows:
+                            for row in rows[:5]:  # Limit output
+                                print(f"    -> {row}")
+                            if len(rows) > 5:
+                                print(f"    ... and {len(rows)-5} more rows")
+                        # Print INSERT row count
+                        elif statement['type'] == "INSERT":
+                            print(f"    [OK] Inserted {entry['rows_affected']:,} rows ({entry['elapsed_seconds']:.2f}s)")
                 
                 # Log successful completion of this step
                 step_end = datetime.now()
                 step_duration = (step_end - step_start).total_seconds()
-                try:
-                    with engine.connect() as log_conn:
-                        log_conn.execute(text("""
-                            INSERT INTO etl_log (job_name, phase_step, status, start_time, end_time, message)
-                            VALUES (:job, :phase, :stat, :start, :end, :msg)
-                        """), {
-                            "job": "load_fact_tables",
-                            "phase": script_name,
-                            "stat": "COMPLETED",
-                            "start": step_start,
-                            "end": step_end,
-                            "msg": f"[OK] {description} ({step_duration:.2f}s)"
-                        })
-                        log_conn.commit()
-                except Exception as e:
-                    print(f"[WARNING] Could not log step completion: {str(e)}")
+                events.log(
+                    job_name="load_fact_tables",
+                    phase_step=script_name,
+                    status="COMPLETED",
+                    start_time=step_start,
+                    end_time=step_end,
+                    message=f"[OK] {description} ({step_duration:.2f}s)",
+                )
                     
             except Exception as e:
                 print(f"\n  [ERROR] Step failed: {str(e)}")
+                events.flush()
                 return False
         
         # Log completion
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
-        try:
-            with engine.connect() as conn:
-                conn.execute(text("""
-                    INSERT INTO etl_log (job_name, phase_step, status, end_time, message)
-                    VALUES (:job, :phase, :stat, :end, :msg)
-                """), {
-                    "job": "load_fact_tables",
-                    "phase": "completion",
-                    "stat": "COMPLETED",
-                    "end": end_time,
-                    "msg": f"All fact tables loaded successfully in {duration:.2f} seconds"
-                })
-                conn.commit()
-        except Exception as e:
-            print(f"[WARNING] Could not log completion: {str(e)}")
+        events.log(
+            job_name="load_fact_tables",
+            phase_step="completion",
+            status="COMPLETED",
+            end_time=end_time,
+            message=f"All fact tables loaded successfully in {duration:.2f} seconds",
+        )
         
         print("\n" + "="*80)
         print(f"[SUCCESS] FACT TABLE LOADING COMPLETED SUCCESSFULLY ({duration:.2f}s)")
         print("="*80)
+        _print_profile(runner)
         
         # Truncate staging tables after successful fact load
         print("\n📋 NOW CLEANING UP STAGING TABLES (per DWH best practices)...")
         if not truncate_staging_tables("load_fact_tables"):
             print("⚠️  WARNING: Fact tables loaded but staging cleanup had issues")
+            events.flush()
             return False
         
         return True
         
     except Exception as e:
         print(f"\n[ERROR] Fact table loading failed: {str(e)}")
+        events.flush()
         return False
 
+def _season_id(engine, season):
+    """dim_season.season_id for a season name ('2023/2024' or '2023-2024') or id; None if unknown."""
+    with engine.connect() as conn:
+        if str(season).lstrip("-").isdigit():
+            return conn.execute(text("SELECT season_id FROM dim_season WHERE season_id = :id"),
+                                {"id": int(season)}).scalar()
+        return conn.execute(text("SELECT season_id FROM dim_season WHERE season_name = :name"),
+                            {"name": str(season).replace("-", "/")}).scalar()
+
+
+def reload_events_season(season):
+    """Rebuild one season of fact_match_events from staging and swap its partition in."""
+    print("\n" + "="*80)
+    print(f"RELOADING FACT_MATCH_EVENTS FOR SEASON {season}")
+    print("="*80)
+    engine = get_engine()
+    season_id = _season_id(engine, season)
+    if season_id is None:
+        print(f"[ERROR] Unknown season: {season}")
+        return False
+
+    runner = SqlScriptRunner(engine, "reload_events_season")
+    summary = reload_event_season(engine, runner, season_id)
+    get_event_logger(engine).flush()
+    if not summary['success']:
+        print(f"[ERROR] Season reload failed: {summary['error']}")
+        return False
+    print(f"[OK] {summary['partition']}: {summary['events']:,} events, "
+          f"{summary['matches_reloaded']} matches reloaded ({summary['elapsed_seconds']:.2f}s)")
+    _print_profile(runner)
+    return True
+
+
+def archive_events_season(season, keep_table=True):
+    """Drop one season's fact_match_events partition (kept in an archive table by default)."""
+    engine = get_engine()
+    season_id = _season_id(engine, season)
+    if season_id is None:
+        print(f"[ERROR] Unknown season: {season}")
+        return False
+    try:
+        result = archive_event_season(engine, season_id, keep_table=keep_table)
+    except Exception as e:
+        print(f"[ERROR] Season archive failed: {str(e)}")
+        return False
+    finally:
+        get_event_logger(engine).flush()
+    kept = f", kept in {result['archive_table']}" if result['archive_table'] else ""
+    print(f"[OK] Season {season} removed from fact_match_events ({result['events']:,} events{kept})")
+    return True
+
+
 def load_player_stats():
     """Load fact_player_stats from staging table"""
     print("\n" + "="*80)
@@ -364,119 +435,81 @@ def load_player_stats():
         return False
     
     engine = get_engine()
+    events = get_event_logger(engine)
     start_time = datetime.now()
     
     # Log start to ETL_Log
-    try:
-        with engine.connect() as conn:
-            log_query = text("""
-                INSERT INTO etl_log (job_name, phase_step, status, start_time, message)
-                VALUES (:job, :phase, :stat, :start, :msg)
-            """)
-            conn.execute(log_query, {
-                "job": "load_player_stats",
-                "phase": "initialization",
-                "stat": "STARTED",
-                "start": start_time,
-                "msg": "Starting player stats load"
-            })
-            conn.commit()
-    except Exception as e:
-        print(f"[WARNING] Could not log to ETL_Log: {str(e)}")
+    events.log(
+        job_name="load_player_stats",
+        phase_step="initialization",
+        status="STARTED",
+        start_time=start_time,
+        message="Starting player stats load",
+    )
     
     try:
-        # Read and execute SQL
-        with open(script_path, 'r') as f:
-            sql_content = f.read()
+        runner = SqlScriptRunner(engine, "load_player_stats")
+        # Team keys come from dim_team_alias.team_id: resolve the aliases first
+        # (the team_alias block of the mapping script) when run on its own
+        alias_statements = [stmt for stmt in runner.parse_file(sql_dir / "create_mapping_tables.sql")
+                            if stmt['block'] == 'team_alias']
+        statements = alias_statements + runner.parse_file(script_path)
         
         print("\nExecuting player stats load:\n")
         
         with engine.connect() as conn:
-            # Split statements and execute
-            statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-            
             for i, statement in enumerate(tqdm(statements, desc="Loading", unit="stmt", ascii=True, disable=False), 1):
-                step_start = datetime.now()
-                try:
-                    result = conn.execute(text(statement))
-                    conn.commit()
-                    
-                    # Display results if SELECT
-                    if statement.strip().upper().startswith("SELECT"):
-                        rows = result.fetchall()
-                        if rows:
-                            for row in rows:
-                                print(f"  ✓ {row}")
-                    
-                    # Log successful statement
-                    step_end = datetime.now()
-                    step_duration = (step_end - step_start).total_seconds()
-                    try:
-                        with engine.connect() as log_conn:
-                            log_conn.execute(text("""
-                                INSERT INTO etl_log (job_name, phase_step, status, start_time, end_time, message)
-                                VALUES (:job, :phase, :stat, :start, :end, :msg)
-                            """), {
-                                "job": "load_player_stats",
-                                "phase": f"statement_{i}",
-                                "stat": "COMPLETED",
-                                "start": step_start,
-                                "end": step_end,
-                                "msg": f"✓ Statement {i}/{len(statements)} ({step_duration:.2f}s)"
-                            })
-                            log_conn.commit()
-                    except Exception as e:
-                        print(f"[WARNING] Could not log statement: {str(e)}")
-                        
-                except Exception as e:
-                    print(f"\n  ❌ [ERROR] {str(e)}")
+                entry, rows = runner.execute(conn, statement)
+                if entry['status'] == 'FAILED':
+                    print(f"\n  ❌ [ERROR] {entry['error_message']}")
                     # Log failure
-                    try:
-                        with engine.connect() as log_conn:
-                            log_conn.execute(text("""
-                                INSERT INTO etl_log (job_name, phase_step, status, end_time, message)
-                                VALUES (:job, :phase, :stat, :end, :msg)
-                            """), {
-                                "job": "load_player_stats",
-                                "phase": f"statement_{i}",
-                                "stat": "FAILED",
-                                "end": datetime.now(),
-                                "msg": f"Failed: {str(e)}"
-                            })
-                            log_conn.commit()
-                    except:
-                        pass
-                    conn.rollback()
+                    events.log(
+                        job_name="load_player_stats",
+                        phase_step=f"statement_{i}",
+                        status="FAILED",
+                        end_time=datetime.now(),
+                        message=f"Failed: {entry['error_message']}",
+                    )
+                    print(f"  Profile report: {runner.write_report()}")
+                    events.flush()
                     return False
+                
+                # Display results if SELECT
+                for row in rows or []:
+                    print(f"  ✓ {row}")
+                
+                # Log successful statement
+                events.log(
+                    job_name="load_player_stats",
+                    phase_step=f"statement_{i}",
+                    status="COMPLETED",
+                    start_time=entry['started_at'],
+                    end_time=datetime.now(),
+                    message=f"✓ Statement {i}/{len(statements)} ({entry['elapsed_seconds']:.2f}s)",
+                )
         
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
         
         # Log completion
-        try:
-            with engine.connect() as conn:
-                conn.execute(text("""
-                    INSERT INTO etl_log (job_name, phase_step, status, end_time, message)
-                    VALUES (:job, :phase, :stat, :end, :msg)
-                """), {
-                    "job": "load_player_stats",
-                    "phase": "completion",
-                    "stat": "COMPLETED",
-                    "end": end_time,
-                    "msg": f"All player stats loaded successfully in {duration:.2f} seconds"
-                })
-                conn.commit()
-        except Exception as e:
-            print(f"[WARNING] Could not log completion: {str(e)}")
+        events.log(
+            job_name="load_player_stats",
+            phase_step="completion",
+            status="COMPLETED",
+            end_time=end_time,
+            message=f"All player stats loaded successfully in {duration:.2f} seconds",
+        )
         
         print("\n" + "="*80)
         print(f"✅ PLAYER STATS LOADING COMPLETED SUCCESSFULLY ({duration:.2f}s)")
         print("="*80)
+        _print_profile(runner)
         
         # Clean up staging tables after successful player stats load
         print("\n📋 NOW CLEANING UP STAGING TABLES (per DWH best practices)...")
         if not truncate_staging_tables("load_player_stats"):
             print("⚠️  WARNING: Player stats loaded but staging cleanup had issues")
+            events.flush()
             return False
         
         return True
@@ -484,21 +517,14 @@ def load_player_stats():
     except Exception as e:
         print(f"\n[ERROR] Player stats loading failed: {str(e)}")
         # Log overall failure
-        try:
-            with engine.connect() as conn:
-                conn.execute(text("""
-                    INSERT INTO etl_log (job_name, phase_step, status, end_time, message)
-                    VALUES (:job, :phase, :stat, :end, :msg)
-                """), {
-                    "job": "load_player_stats",
-                    "phase": "overall",
-                    "stat": "FAILED",
-                    "end": datetime.now(),
-                    "msg": f"Player stats loading failed: {str(e)}"
-                })
-                conn.commit()
-        except:
-            pass
+        events.log(
+            job_name="load_player_stats",
+            phase_step="overall",
+            status="FAILED",
+            end_time=datetime.now(),
+            message=f"Player stats loading failed: {str(e)}",
+        )
+        events.flush()
         return False
 
 def truncate_staging_tables(log_job_name="etl_pipeline"):
@@ -527,24 +553,17 @@ def truncate_staging_tables(log_job_name="etl_pipeline"):
     ]
     
     engine = get_engine()
+    events = get_event_logger(engine)
     start_time = datetime.now()
     
     # Log start
-    try:
-        with engine.connect() as conn:
-            conn.execute(text("""
-                INSERT INTO etl_log (job_name, phase_step, status, start_time, message)
-                VALUES (:job, :phase, :stat, :start, :msg)
-            """), {
-                "job": log_job_name,
-                "phase": "staging_cleanup",
-                "stat": "STARTED",
-                "start": start_time,
-                "msg": f"Starting truncation of {len(staging_tables)} staging tables"
-            })
-            conn.commit()
-    except Exception as e:
-        print(f"[WARNING] Could not log to ETL_Log: {str(e)}")
+    events.log(
+        job_name=log_job_name,
+        phase_step="staging_cleanup",
+        status="STARTED",
+        start_time=start_time,
+        message=f"Starting truncation of {len(staging_tables)} staging tables",
+    )
     
     try:
         with engine.connect() as conn:
@@ -568,21 +587,14 @@ def truncate_staging_tables(log_job_name="etl_pipeline"):
                 except Exception as e:
                     print(f"   ❌ {table}: {str(e)}")
                     # Log failure but continue with other tables
-                    try:
-                        with engine.connect() as log_conn:
-                            log_conn.execute(text("""
-                                INSERT INTO etl_log (job_name, phase_step, status, end_time, message)
-                                VALUES (:job, :phase, :stat, :end, :msg)
-                            """), {
-                                "job": log_job_name,
-                                "phase": f"truncate_{table}",
-                                "stat": "FAILED",
-                                "end": datetime.now(),
-                                "msg": f"Failed to truncate {table}: {str(e)}"
-                            })
-                            log_conn.commit()
-                    except:
-                        pass
+                    events.log(
+                        job_name=log_job_name,
+                        phase_step=f"truncate_{table}",
+                        status="FAILED",
+                        end_time=datetime.now(),
+                        message=f"Failed to truncate {table}: {str(e)}",
+                    )
+                    events.flush()
                     return False
             
             # Verify truncation
@@ -597,22 +609,14 @@ def truncate_staging_tables(log_job_name="etl_pipeline"):
         # Log successful completion
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
-        try:
-            with engine.connect() as conn:
-                conn.execute(text("""
-                    INSERT INTO etl_log (job_name, phase_step, status, start_time, end_time, message)
-                    VALUES (:job, :phase, :stat, :start, :end, :msg)
-                """), {
-                    "job": log_job_name,
-                    "phase": "staging_cleanup",
-                    "stat": "COMPLETED",
-                    "start": start_time,
-                    "end": end_time,
-                    "msg": f"Cleaned staging: {total_rows_before:,} rows removed in {duration:.2f}s. Audit trail preserved in etl_log."
-                })
-                conn.commit()
-        except Exception as e:
-            print(f"[WARNING] Could not log cleanup completion: {str(e)}")
+        events.log(
+            job_name=log_job_name,
+            phase_step="staging_cleanup",
+            status="COMPLETED",
+            start_time=start_time,
+            end_time=end_time,
+            message=f"Cleaned staging: {total_rows_before:,} rows removed in {duration:.2f}s. Audit trail preserved in etl_log.",
+        )
         
         print("\n" + "="*80)
         print(f"[SUCCESS] STAGING TABLES CLEANED ({total_rows_before:,} rows removed)")
@@ -623,21 +627,14 @@ def truncate_staging_tables(log_job_name="etl_pipeline"):
     except Exception as e:
         print(f"\n❌ [ERROR] Staging table cleanup failed: {str(e)}")
         # Log failure
-        try:
-            with engine.connect() as conn:
-                conn.execute(text("""
-                    INSERT INTO etl_log (job_name, phase_step, status, end_time, message)
-                    VALUES (:job, :phase, :stat, :end, :msg)
-                """), {
-                    "job": log_job_name,
-                    "phase": "staging_cleanup",
-                    "stat": "FAILED",
-                    "end": datetime.now(),
-                    "msg": f"Staging cleanup failed: {str(e)}"
-                })
-                conn.commit()
-        except:
-            pass
+        events.log(
+            job_name=log_job_name,
+            phase_step="staging_cleanup",
+            status="FAILED",
+            end_time=datetime.now(),
+            message=f"Staging cleanup failed: {str(e)}",
+        )
+        events.flush()
         return False
 
 def populate_mapping_tables():
@@ -654,127 +651,79 @@ def populate_mapping_tables():
         return False
     
     engine = get_engine()
+    events = get_event_logger(engine)
     start_time = datetime.now()
     
     # Log start
-    try:
-        with engine.connect() as conn:
-            conn.execute(text("""
-                INSERT INTO etl_log (job_name, phase_step, status, start_time, message)
-                VALUES (:job, :phase, :stat, :start, :msg)
-            """), {
-                "job": "populate_mappings",
-                "phase": "initialization",
-                "stat": "STARTED",
-                "start": start_time,
-                "msg": "Starting mapping table population"
-            })
-            conn.commit()
-    except Exception as e:
-        print(f"[WARNING] Could not log to ETL_Log: {str(e)}")
+    events.log(
+        job_name="populate_mappings",
+        phase_step="initialization",
+        status="STARTED",
+        start_time=start_time,
+        message="Starting mapping table population",
+    )
     
     try:
-        with open(script_path, 'r') as f:
-            sql_content = f.read()
-        
-        statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+        runner = SqlScriptRunner(engine, "populate_mappings")
+        statements = runner.parse_file(script_path)
         
         print(f"\nExecuting {len(statements)} SQL statements...\n")
         
         with engine.connect() as conn:
             for idx, stmt in enumerate(tqdm(statements, desc="Mapping", unit="stmt", ascii=True, disable=False), 1):
-                step_start = datetime.now()
-                try:
-                    result = conn.execute(text(stmt))
-                    conn.commit()
-                    
-                    if stmt.strip().upper().startswith("SELECT"):
-                        rows = result.fetchall()
-                        if rows:
-                            for row in rows:
-                                print(f"  [OK] {row}")
-                    
-                    # Log successful statement
-                    step_end = datetime.now()
-                    step_duration = (step_end - step_start).total_seconds()
-                    try:
-                        with engine.connect() as log_conn:
-                            log_conn.execute(text("""
-                                INSERT INTO etl_log (job_name, phase_step, status, start_time, end_time, message)
-                                VALUES (:job, :phase, :stat, :start, :end, :msg)
-                            """), {
-                                "job": "populate_mappings",
-                                "phase": f"statement_{idx}",
-                                "stat": "COMPLETED",
-                                "start": step_start,
-                                "end": step_end,
-                                "msg": f"[OK] Statement {idx}/{len(statements)} ({step_duration:.2f}s)"
-                            })
-                            log_conn.commit()
-                    except Exception as e:
-                        print(f"[WARNING] Could not log statement: {str(e)}")
-                        
-                except Exception as e:
-                    print(f"\n  [WARNING] Warning: {str(e)[:100]}")
+                entry, rows = runner.execute(conn, stmt)
+                if entry['status'] == 'FAILED':
+                    print(f"\n  [WARNING] Warning: {entry['error_message'][:100]}")
                     # Log warning
-                    try:
-                        with engine.connect() as log_conn:
-                            log_conn.execute(text("""
-                                INSERT INTO etl_log (job_name, phase_step, status, end_time, message)
-                                VALUES (:job, :phase, :stat, :end, :msg)
-                            """), {
-                                "job": "populate_mappings",
-                                "phase": f"statement_{idx}",
-                                "stat": "WARNING",
-                                "end": datetime.now(),
-                                "msg": f"Warning: {str(e)[:200]}"
-                            })
-                            log_conn.commit()
-                    except:
-                        pass
-                    conn.rollback()
+                    events.log(
+                        job_name="populate_mappings",
+                        phase_step=f"statement_{idx}",
+                        status="WARNING",
+                        end_time=datetime.now(),
+                        message=f"Warning: {entry['error_message'][:200]}",
+                    )
+                    continue
+                
+                for row in rows or []:
+                    print(f"  [OK] {row}")
+                
+                # Log successful statement
+                events.log(
+                    job_name="populate_mappings",
+                    phase_step=f"statement_{idx}",
+                    status="COMPLETED",
+                    start_time=entry['started_at'],
+                    end_time=datetime.now(),
+                    message=f"[OK] Statement {idx}/{len(statements)} ({entry['elapsed_seconds']:.2f}s)",
+                )
         
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
         
         # Log completion
-        try:
-            with engine.connect() as conn:
-                conn.execute(text("""
-                    INSERT INTO etl_log (job_name, phase_step, status, end_time, message)
-                    VALUES (:job, :phase, :stat, :end, :msg)
-                """), {
-                    "job": "populate_mappings",
-                    "phase": "completion",
-                    "stat": "COMPLETED",
-                    "end": end_time,
-                    "msg": f"Mapping tables populated successfully in {duration:.2f} seconds"
-                })
-                conn.commit()
-        except Exception as e:
-            print(f"[WARNING] Could not log completion: {str(e)}")
+        events.log(
+            job_name="populate_mappings",
+            phase_step="completion",
+            status="COMPLETED",
+            end_time=end_time,
+            message=f"Mapping tables populated successfully in {duration:.2f} seconds",
+        )
         
         print("\n[SUCCESS] Mapping tables populated successfully!")
+        _print_profile(runner)
         return True
         
     except Exception as e:
         print(f"[ERROR] Mapping table population failed: {str(e)}")
         # Log failure
-        try:
-            with engine.connect() as conn:
-                conn.execute(text("""
-                    INSERT INTO etl_log (job_name, phase_step, status, end_time, message)
-                    VALUES (:job, :phase, :stat, :end, :msg)
-                """), {
-                    "job": "populate_mappings",
-                    "phase": "overall",
-                    "stat": "FAILED",
-                    "end": datetime.now(),
-                    "msg": f"Mapping population failed: {str(e)}"
-                })
-                conn.commit()
-        except:
-            pass
+        events.log(
+            job_name="populate_mappings",
+            phase_step="overall",
+            status="FAILED",
+            end_time=datetime.now(),
+            message=f"Mapping population failed: {str(e)}",
+        )
+        events.flush()
         return False
 
 def run_complete_player_pipeline():
@@ -789,19 +738,12 @@ def run_complete_player_pipeline():
         sql_dir = Path(__file__).parent.parent / "sql"
         schema_file = sql_dir / "create_schema.sql"
         
-        with open(schema_file, 'r') as f:
-            sql_content = f.read()
-        
         engine = get_engine()
+        runner = SqlScriptRunner(engine, "create_schema")
         with engine.connect() as conn:
-            for stmt in sql_content.split(';'):
-                if stmt.strip():
-                    try:
-                        conn.execute(text(stmt))
-                        conn.commit()
-                    except Exception as e:
-                        if "already exists" not in str(e):
-                            pass
+            # Statement errors are recorded in the profile and skipped, as before
+            for stmt in runner.parse_file(schema_file):
+                runner.execute(conn, stmt)
         print("✅ Schema recreated with seasons 2017-2026")
     except Exception as e:
         print(f"❌ Schema recreation failed: {str(e)}")
@@ -819,72 +761,20 @@ def run_complete_player_pipeline():
     try:
         import pandas as pd
         from pathlib import Path as PathlibPath
-        from random import randint, seed
-        
-        seed(42)
-        TEAMS = [
-            'Manchester City', 'Liverpool', 'Manchester United', 'Chelsea',
-            'Arsenal', 'Tottenham', 'Leicester City', 'West Ham',
-            'Newcastle', 'Brighton', 'Aston Villa', 'Everton',
-            'Fulham', 'Brentford', 'Crystal Palace', 'Wolves',
-            'Southampton', 'Nottingham Forest', 'Luton Town', 'Bournemouth',
-        ]
-        BASE_PLAYERS = [
+        from ..data_generators.fbref_player_stats_mock import generate_player_stats, player_names, write_csv
+        
+        # Same teams (the first 20 of TEAMS) and squad names (no ' Jr.' variants)
+        # this pipeline has always generated; squads are a fixed 23 players
+        pipeline_players = [
             'De Bruyne', 'Haaland', 'Salah', 'Van Dijk', 'Cancelo',
             'Rodri', 'Dias', 'Nunez', 'Son', 'Kane', 'Saka', 'Martinelli',
             'Shaw', 'Mount', 'Antony', 'Rashford', 'Bruno Fernandes',
             'Zinchenko', 'Ødegaard', 'Rice', 'Palmer', 'Mudryk', 'Foden',
         ]
-        SEASONS = ['2017-2018', '2018-2019', '2019-2020', '2020-2021', '2021-2022', '2022-2023', '2023-2024']
-        
-        output_dir = PathlibPath("data/raw/fbref_player_stats")
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        total_rows = 0
-        for season in SEASONS:
-            rows = []
-            for team in TEAMS:
-                num_players = 22 + len(team) % 4
-                for i in range(num_players):
-                    player_name = BASE_PLAYERS[i % len(BASE_PLAYERS)]
-                    team_hash = hash(team) % 1000
-                    player_hash = hash(player_name + team + season) % 1000
-                    
-                    if randint(1, 100) <= 70:
-                        minutes_base = 1200 + (player_hash % 1500)
-                        minutes_played = max(0, minutes_base)
-                    else:
-                        minutes_played = 0
-                    
-                    minute_factor = minutes_played / 1500.0 if minutes_played > 0 else 0
-                    goals = max(0, int(minute_factor * (5 + (player_hash % 10))) - 2)
-                    assists = max(0, int(minute_factor * (3 + (player_hash % 8))) - 1)
-                    shots = max(0, int(minute_factor * (4 + (player_hash % 6))))
-                    shots_on_target = max(0, int(shots * 0.4))
-                    yellow_cards = randint(0, 3) if minutes_played > 500 else 0
-                    red_cards = 1 if randint(1, 100) > 95 and minutes_played > 1000 else 0
-                    xg = round(minute_factor * (2.5 + (player_hash % 100) / 100.0), 2)
-                    xa = round(minute_factor * (1.5 + (player_hash % 100) / 100.0), 2)
-                    
-                    rows.append({
-                        'Player': player_name,
-                        'Squad': team,
-                        'Min': minutes_played,
-                        'Gls': goals,
-                        'Ast': assists,
-                        'Sh': shots,
-                        'SoT': shots_on_target,
-                        'CrdY': yellow_cards,
-                        'CrdR': red_cards,
-                        'xG': xg,
-                        'xA': xa,
-                        'Season': season,
-                    })
-            
-            df = pd.DataFrame(rows)
-            output_file = output_dir / f"{season}_player_stats.csv"
-            df.to_csv(output_file, index=False)
-            total_rows += len(df)
+        df = generate_player_stats(n_teams=20, players_per_team=len(pipeline_players),
+                                   names=player_names(len(pipeline_players), pipeline_players, juniors=False))
+        write_csv(df, PathlibPath("data/raw/fbref_player_stats"))
+        total_rows = len(df)
         
         print(f"✅ Generated {total_rows:,} mock FBRef player stats rows")
     except Exception as e:
@@ -968,6 +858,10 @@ def main():
     parser.add_argument("--load-fact-tables", action="store_true", help="Load fact tables from staging data (run after --full-etl)")
     parser.add_argument("--load-player-stats", action="store_true", help="Load fact_player_stats from staging data")
     parser.add_argument("--complete-player-pipeline", action="store_true", help="Master orchestration: Schema + Full ETL + Mock FBRef + Staging + Load Player Stats (all-in-one)")
+    parser.add_argument("--reload-events-season", metavar="SEASON", help="Rebuild one season of fact_match_events from staging by partition exchange (e.g. 2023/2024 or a season_id)")
+    parser.add_argument("--archive-events-season", metavar="SEASON", help="Move one season out of fact_match_events into fact_match_events_archive_<season_id>")
+    parser.add_argument("--drop-archive", action="store_true", help="With --archive-events-season: discard the season's events instead of keeping an archive table")
+    parser.add_argument("--team-alias", nargs=3, metavar=("SOURCE", "ALIAS", "TEAM_NAME"), help=f"Add or repoint a team alias in dim_team_alias (SOURCE: {', '.join(TEAM_ALIAS_SOURCES)})")
     parser.add_argument("--limit-data", type=int, default=None, help="Limit the number of StatsBomb JSON files to process (e.g., 10 out of 380 for testing)")
     
     args = parser.parse_args()
@@ -985,6 +879,17 @@ def main():
         load_fact_tables()
     elif args.load_player_stats:
         load_player_stats()
+    elif args.team_alias:
+        source_system, alias, team_name = args.team_alias
+        try:
+            register_team_aliases(get_engine(), source_system, {alias: team_name})
+            print(f"[OK] {source_system} alias '{alias}' -> '{team_name}'")
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+    elif args.reload_events_season:
+        reload_events_season(args.reload_events_season)
+    elif args.archive_events_season:
+        archive_events_season(args.archive_events_season, keep_table=not args.drop_archive)
     elif args.staging:
         print("\nRunning staging load only...")
         load_staging.load_all_staging(limit_data=args.limit_data)
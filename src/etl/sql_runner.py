@@ -0,0 +1,312 @@
+"""SQL script runner: tokenizer-aware splitting plus a per-statement profile.
+
+The fact/mapping loaders used to run .sql files with sql.split(';'), which
+breaks on a semicolon inside a string literal or comment, and only ever
+reported the total time. This module splits scripts the way the mysql client
+does and profiles every statement it executes.
+
+Splitting:
+  - ';' ends a statement only outside '...', "..." and `...` (with '' and
+    backslash escapes), -- / # line comments and /* */ block comments
+  - DELIMITER lines change the terminator (for routines/triggers)
+  - line comments are dropped from the executed text; block comments are
+    kept, so optimizer hints and /*! */ sections still reach the server
+
+Directives (in line comments):
+  -- @block <name>         statements that follow belong to block <name>
+  -- @name <name>          names the next statement (default <block>.<n>)
+  -- @set <var> = <value>  defines ${var} for the statements that follow
+Variables passed to parse_file() and @set values replace ${var} in the
+statement text; an undefined variable is a ValueError.
+
+Profiling: execute() records wall time, rows affected and status of every
+statement, optionally with the query plan (explain=True or ETL_SQL_EXPLAIN=1:
+EXPLAIN ANALYZE after a SELECT, EXPLAIN FORMAT=JSON before DML, which does not
+run the statement twice). Entries are queued to ETL_Sql_Profile through the
+buffered event logger and written as one JSON report per run by write_report().
+
+Exposed:
+- split_sql(sql, variables, script_name) -> list of statement dicts
+- SqlScriptRunner(engine, job_name, explain, report_dir) -> runner
+- SqlScriptRunner.parse_file(path, variables) -> list of statement dicts
+- SqlScriptRunner.execute(conn, statement, commit) -> (profile entry dict, result rows or None)
+- SqlScriptRunner.write_report() -> Path of the JSON report
+- SqlScriptRunner.slowest(n) -> n slowest profile entries
+"""
+import json
+import re
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .config import SQL_EXPLAIN, SQL_PROFILE_DIR
+from .event_log import get_event_logger
+
+PROFILE_TABLE = "ETL_Sql_Profile"
+
+_DIRECTIVE = re.compile(r"^@(name|block|set)\b\s*(.*?)\s*$")
+_SET_VALUE = re.compile(r"^(\w+)\s*=\s*(.*)$")
+_VARIABLE = re.compile(r"\$\{(\w+)\}")
+_DELIMITER = re.compile(r"DELIMITER[ \t]+(\S+)[ \t]*(?:\r?\n|$)", re.IGNORECASE)
+_FIRST_WORD = re.compile(r"\s*(?:/\*.*?\*/\s*)*(\w+)", re.DOTALL)
+
+# Statement types whose plan comes from EXPLAIN ANALYZE (executes the query)
+# vs EXPLAIN FORMAT=JSON (estimate only, nothing is modified)
+_ANALYZE_TYPES = {"SELECT", "WITH", "TABLE"}
+_ESTIMATE_TYPES = {"INSERT", "REPLACE", "UPDATE", "DELETE"}
+
+
+def _statement_type(sql: str) -> str:
+    match = _FIRST_WORD.match(sql)
+    return match.group(1).upper() if match else ""
+
+
+def split_sql(sql: str, variables: Optional[Dict[str, object]] = None,
+              script_name: str = "script") -> List[dict]:
+    """Split a script into statements, honouring quotes, comments and DELIMITER.
+
+    Args:
+        sql: Script text
+        variables: Initial ${var} values (extended by -- @set directives)
+        script_name: Used in default statement names and error messages
+
+    Returns:
+        List of {'no', 'name', 'block', 'type', 'line', 'sql'} in script order
+
+    Raises:
+        ValueError: on an undefined ${var} or a malformed @set directive
+    """
+    variables = {k: str(v) for k, v in (variables or {}).items()}
+    statements: List[dict] = []
+    buf: List[str] = []
+    has_content = False
+    start_line = 1
+    line = 1
+    delimiter = ";"
+    block: Optional[str] = None
+    block_count = 0
+    next_name: Optional[str] = None
+    i, n = 0, len(sql)
+
+    def emit():
+        nonlocal has_content, next_name, block_count
+        body = "".join(buf).strip()
+        buf.clear()
+        has_content = False
+        if not body:
+            return
+
+        def substitute(match):
+            if match.group(1) not in variables:
+                raise ValueError(f"{script_name}:{start_line}: undefined variable ${{{match.group(1)}}}")
+            return variables[match.group(1)]
+
+        body = _VARIABLE.sub(substitute, body)
+        block_count += 1
+        default = f"{block}.{block_count}" if block else f"{script_name}:{len(statements) + 1}"
+        statements.append({
+            "no": len(statements) + 1,
+            "name": next_name or default,
+            "block": block,
+            "type": _statement_type(body),
+            "line": start_line,
+            "sql": body,
+        })
+        next_name = None
+
+    while i < n:
+        ch = sql[i]
+
+        if not has_content and (i == 0 or sql[i - 1] == "\n"):
+            match = _DELIMITER.match(sql, i)
+            if match:
+                delimiter = match.group(1)
+                line += match.group(0).count("\n")
+                i = match.end()
+                continue
+
+        if sql.startswith(delimiter, i):
+            emit()
+            i += len(delimiter)
+            continue
+
+        if ch in ("'", '"', "`"):
+            j = i + 1
+            while j < n:
+                if sql[j] == "\\" and ch != "`":
+                    j += 2
+                    continue
+                if sql[j] == ch:
+                    if j + 1 < n and sql[j + 1] == ch:  # doubled quote
+                        j += 2
+                        continue
+                    break
+                j += 1
+            token = sql[i:j + 1]
+        elif ch == "#" or (sql.startswith("--", i) and (i + 2 >= n or sql[i + 2] in " \t\r\n")):
+            end = sql.find("\n", i)
+            end = n if end == -1 else end
+            comment = sql[i + (1 if ch == "#" else 2):end].strip()
+            directive = _DIRECTIVE.match(comment)
+            if directive:
+                kind, value = directive.groups()
+                if kind == "block":
+                    block, block_count = value or None, 0
+                elif kind == "name":
+                    next_name = value or None
+                else:
+                    assignment = _SET_VALUE.match(value)
+                    if not assignment:
+                        raise ValueError(f"{script_name}:{line}: expected '-- @set name = value'")
+                    variables[assignment.group(1)] = assignment.group(2)
+            i = end
+            continue
+        elif sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            token = sql[i:] if end == -1 else sql[i:end + 2]
+        else:
+            token = ch
+
+        if not has_content and not token.isspace():
+            has_content = True
+            start_line = line
+        if has_content:
+            buf.append(token)
+        line += token.count("\n")
+        i += len(token)
+
+    emit()
+    return statements
+
+
+class SqlScriptRunner:
+    """Executes parsed statements and keeps a timing profile for one run."""
+
+    def __init__(self, engine, job_name: str, explain: bool = SQL_EXPLAIN,
+                 report_dir=SQL_PROFILE_DIR):
+        """
+        Args:
+            engine: SQLAlchemy engine (profile rows are written with it)
+            job_name: Pipeline step the run belongs to (e.g. "load_fact_tables")
+            explain: Capture a query plan per statement
+            report_dir: Directory for the JSON report (relative to the project root)
+        """
+        self.engine = engine
+        self.job_name = job_name
+        self.explain = explain
+        self.report_dir = Path(report_dir)
+        if not self.report_dir.is_absolute():
+            self.report_dir = Path(__file__).resolve().parents[2] / self.report_dir
+        self.run_id = uuid.uuid4().hex
+        self.started_at = datetime.now()
+        self.entries: List[dict] = []
+        self._events = get_event_logger(engine)
+
+    def parse_file(self, path, variables: Optional[Dict[str, object]] = None) -> List[dict]:
+        """Read and split one .sql file; statements remember their script name."""
+        path = Path(path)
+        statements = split_sql(path.read_text(encoding="utf-8"), variables, path.stem)
+        for statement in statements:
+            statement["script"] = path.name
+        return statements
+
+    def _plan(self, conn, statement: dict, analyze: bool) -> Optional[str]:
+        prefix = "EXPLAIN ANALYZE " if analyze else "EXPLAIN FORMAT=JSON "
+        try:
+            rows = conn.exec_driver_sql(prefix + statement["sql"]).fetchall()
+            return "\n".join(str(row[0]) for row in rows)
+        except Exception as e:
+            return f"EXPLAIN failed: {e}"
+
+    def execute(self, conn, statement: dict, commit: bool = True) -> Tuple[dict, Optional[list]]:
+        """Run one statement, commit it (or roll back on error) and profile it.
+
+        The text goes to the driver unchanged (exec_driver_sql), so colons and
+        percent signs in literals are not treated as bind parameters.
+
+        Args:
+            conn: Open connection; session state (temp tables, @vars) is kept
+                across calls on the same connection
+            statement: Dict from split_sql/parse_file
+            commit: Commit after the statement; pass False to group several
+                statements into one transaction (the caller commits). A failed
+                statement always rolls back the open transaction.
+
+        Returns:
+            (profile entry, fetched rows for row-returning statements else None).
+            Errors are not raised: the entry has status 'FAILED' and 'error'.
+        """
+        plan = None
+        if self.explain and statement["type"] in _ESTIMATE_TYPES:
+            plan = self._plan(conn, statement, analyze=False)
+
+        started_at = datetime.now()
+        started = time.perf_counter()
+        rows, rowcount, error = None, None, None
+        try:
+            result = conn.exec_driver_sql(statement["sql"])
+            if result.returns_rows:
+                rows = result.fetchall()
+                rowcount = len(rows)
+            else:
+                rowcount = result.rowcount
+            if commit:
+                conn.commit()
+        except Exception as e:
+            error = str(e)
+            conn.rollback()
+        seconds = time.perf_counter() - started
+
+        if self.explain and error is None and statement["type"] in _ANALYZE_TYPES:
+            plan = self._plan(conn, statement, analyze=True)
+
+        entry = {
+            "run_id": self.run_id,
+            "job_name": self.job_name,
+            "script_name": statement.get("script", ""),
+            "statement_no": statement["no"],
+            "block_name": statement["block"],
+            "statement_name": statement["name"],
+            "statement_type": statement["type"],
+            "source_line": statement["line"],
+            "started_at": started_at,
+            "elapsed_seconds": round(seconds, 6),
+            "rows_affected": rowcount,
+            "status": "FAILED" if error else "SUCCESS",
+            "error_message": error[:2000] if error else None,
+            "explain_plan": plan,
+            "sql_text": statement["sql"],
+        }
+        self.entries.append(entry)
+        self._events.record(PROFILE_TABLE, entry)
+        return entry, rows
+
+    def slowest(self, n: int = 5) -> List[dict]:
+        return sorted(self.entries, key=lambda e: e["elapsed_seconds"], reverse=True)[:n]
+
+    def write_report(self) -> Path:
+        """Write the run's profile (statements, per-block totals) as JSON."""
+        blocks: Dict[str, dict] = {}
+        for entry in self.entries:
+            key = f"{entry['script_name']}:{entry['block_name'] or '-'}"
+            total = blocks.setdefault(key, {"statements": 0, "seconds": 0.0, "rows_affected": 0})
+            total["statements"] += 1
+            total["seconds"] += entry["elapsed_seconds"]
+            total["rows_affected"] += max(entry["rows_affected"] or 0, 0)
+
+        report = {
+            "run_id": self.run_id,
+            "job_name": self.job_name,
+            "started_at": self.started_at.isoformat(),
+            "total_seconds": round(sum(e["elapsed_seconds"] for e in self.entries), 6),
+            "failed": sum(e["status"] == "FAILED" for e in self.entries),
+            "blocks": blocks,
+            "slowest": [f"{e['script_name']} {e['statement_name']}" for e in self.slowest()],
+            "statements": [{**e, "started_at": e["started_at"].isoformat()} for e in self.entries],
+        }
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        path = self.report_dir / f"{self.job_name}_{self.started_at:%Y%m%d_%H%M%S}_{self.run_id[:8]}.json"
+        path.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+        return path
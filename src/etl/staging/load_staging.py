@@ -7,6 +7,7 @@ from ..extract.excel_reader import load_excel_data
 from ..extract.statsbomb_reader import fetch_and_load_statsbomb_events
 from importlib_metadata import files
 from ..db import get_engine
+from ..config import JSON_READER_WORKERS
 from sqlalchemy import text
 import pandas as pd
 import datetime as dateTime
@@ -100,8 +101,9 @@ def write_staging_from_json():
             return False
         
         reader = JSONReader(str(json_dir))
-        reader.read_json_files()
-        print("JSON data loading completed successfully!")
+        summary = reader.read_json_files(workers=JSON_READER_WORKERS)
+        print(f"JSON data loading completed successfully! "
+              f"{summary['rows']} rows at {summary['rows_per_sec']} rows/sec")
         return True
     except Exception as e:
         print(f"Error loading JSON data: {e}")
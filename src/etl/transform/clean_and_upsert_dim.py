@@ -1,71 +1,119 @@
 """Clean and upsert dimension tables from staging tables.
 
 This module provides idempotent, re-entrant functions to transform and load
-dimension tables using INSERT...ON DUPLICATE KEY UPDATE (MySQL dialect).
+dimension tables (MySQL dialect).
 
 Each upsert function:
-1. Reads distinct records from staging table
+1. Reads distinct records staged since its last successful run (watermark)
 2. Cleanses the data
-3. Upserts to corresponding dimension table
-4. Logs the operation to etl_log table
+3. Applies them to the dimension by row_hash: inserts new keys, changes only
+   rows whose tracked attributes changed, leaves the rest untouched.
+   dim_stadium and dim_referee are SCD Type 1 (changed rows are updated in
+   place); dim_player and dim_team are SCD Type 2 (the current version is
+   expired and a new version inserted, see _apply_scd2)
+4. Advances its watermark in ETL_Watermark (same transaction as the upsert)
+5. Logs the operation to etl_log (buffered, see event_log)
+
+Watermarks: staging tables accumulate across runs, so every upsert only reads
+rows whose load timestamp falls in [last high-watermark, current MAX]. The
+lower bound is inclusive because the upserts are idempotent, so rows staged in
+the same second as the previous run's MAX are never missed. Pass
+full_refresh=True (or set ETL_FULL_REFRESH=1) for a full reconciliation over
+the whole staging table; it also resets the watermark.
 
 Exposed functions:
-- upsert_dim_player(engine) -> (rows_inserted, rows_updated)
-- upsert_dim_team(engine) -> (rows_inserted, rows_updated)
-- upsert_dim_stadium(engine) -> (rows_inserted, rows_updated)
-- upsert_dim_referee(engine) -> (rows_inserted, rows_updated)
+- upsert_dim_player(engine, full_refresh) -> (keys_inserted, keys_versioned, keys_unchanged)
+- upsert_dim_team(engine, full_refresh) -> (keys_inserted, keys_versioned, keys_unchanged)
+- upsert_dim_stadium(engine, full_refresh) -> (rows_inserted, rows_updated, rows_unchanged)
+- upsert_dim_referee(engine, full_refresh) -> (rows_inserted, rows_updated, rows_unchanged)
+- run_all_upserts(engine, max_workers, full_refresh) -> summary dict (runs UPSERT_PLAN)
 
 Private helpers:
-- _log_run(engine, process, rows, status, msg) -> None
+- _watermark_window(conn, process, source_table, column, full_refresh) -> (low, high) or None
+- _advance_watermark(conn, process, source_table, column, high, rows, full_refresh) -> None
+- _apply_hash_diff(conn, dim_table, key, columns, keep_existing, staged_sql, params) -> counts
+- _apply_scd2(conn, dim_table, bk, columns, keep_existing, staged_sql, params) -> counts
+- _refresh_referee_aliases(conn) -> derived dim_referee_alias rows written
+- _upsert_with_watermark(engine, process, entity, source_table, column, full_refresh, apply) -> counts
+- _timed_upsert(func, engine) -> outcome dict
+- _execute_upsert_plan(engine, plan, max_workers) -> {name: outcome dict}
 """
 
-from datetime import datetime
-from typing import Tuple
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta
+from typing import Sequence, Tuple
 from sqlalchemy import create_engine, Engine, text
 from sqlalchemy.exc import SQLAlchemyError
 
+from ..config import FULL_REFRESH, UPSERT_WORKERS, WATERMARK_LAG_SECONDS
+from ..event_log import get_event_logger
+
+# Lower bound used for a full reconciliation (and before the first run)
+WATERMARK_FLOOR = datetime(1900, 1, 1)
+
+# Validity range of an SCD2 version (match the dim_team/dim_player defaults)
+SCD_START = date(1900, 1, 1)
+SCD_END = date(9999, 12, 31)
+
+
+def _watermark_window(conn, process: str, source_table: str, column: str, full_refresh: bool):
+    """Load window [low, high] for an incremental upsert.
+
+    high is captured as MAX(column) before the upsert runs, so rows staged
+    while it runs are picked up next time rather than half-processed now.
+    low trails the stored watermark by WATERMARK_LAG_SECONDS: a row stamped
+    before high but committed after this upsert read the table (another
+    loader's open transaction) is still inside the next window. Re-reading
+    rows already applied is harmless, the upserts only write changes.
 
-def _log_run(
-    engine: Engine,
-    process: str,
-    rows: int,
-    status: str,
-    msg: str = ""
-) -> None:
-    """Log a dimension upsert operation to etl_log table.
-    
-    Private helper function to centralize logging across all upsert operations.
-    
     Args:
-        engine: SQLAlchemy engine connected to the data warehouse
-        process: Name of the process (e.g., "upsert_dim_player")
-        rows: Number of rows affected (inserted + updated)
-        status: Operation status ('SUCCESS', 'FAILED', 'PARTIAL')
-        msg: Optional message for additional context
-    
+        conn: Open connection (inside the upsert's transaction)
+        process: Watermark key (upsert name)
+        source_table: Staging table read by the upsert
+        column: Load timestamp column of source_table
+        full_refresh: Ignore the stored watermark and read everything
+
     Returns:
-        None
+        (low, high) datetimes, or None when the staging table is empty
     """
-    try:
-        with engine.connect() as conn:
-            insert_log = text("""
-                INSERT INTO etl_log 
-                (job_name, phase_step, status, start_time, end_time, rows_processed, message)
-                VALUES (:job_name, :phase_step, :status, :start_time, :end_time, :rows_processed, :message)
-            """)
-            
-            conn.execute(insert_log, {
-                "job_name": process,
-                "phase_step": "transform",
-                "status": status,
-                "start_time": datetime.now(),
-                "end_time": datetime.now(),
-                "rows_processed": rows,
-                "message": msg
-            })
-            conn.commit()
-    except SQLAlchemyError as e:
-        print(f"[WARNING] Failed to log operation {process}: {e}")
+    high = conn.execute(text(f"SELECT MAX({column}) FROM {source_table}")).scalar()
+    if high is None:
+        return None
+    low = None
+    if not full_refresh:
+        low = conn.execute(
+            text("SELECT high_watermark FROM ETL_Watermark WHERE process_name = :process"),
+            {"process": process}
+        ).scalar()
+    if low is None:
+        return (WATERMARK_FLOOR, high)
+    return (max(low - timedelta(seconds=WATERMARK_LAG_SECONDS), WATERMARK_FLOOR), high)
+
+
+def _advance_watermark(conn, process: str, source_table: str, column: str,
+                       high, rows: int, full_refresh: bool) -> None:
+    """Record the high-watermark of a successful upsert (same transaction)."""
+    conn.execute(text("""
+        INSERT INTO ETL_Watermark
+        (process_name, source_table, watermark_column, high_watermark, last_run_mode, last_run_rows, last_run_time)
+        VALUES (:process, :source_table, :column, :high, :mode, :rows, :run_time)
+        ON DUPLICATE KEY UPDATE
+            source_table = VALUES(source_table),
+            watermark_column = VALUES(watermark_column),
+            high_watermark = VALUES(high_watermark),
+            last_run_mode = VALUES(last_run_mode),
+            last_run_rows = VALUES(last_run_rows),
+            last_run_time = VALUES(last_run_time)
+    """), {
+        "process": process,
+        "source_table": source_table,
+        "column": column,
+        "high": high,
+        "mode": "FULL" if full_refresh else "INCREMENTAL",
+        "rows": rows,
+        "run_time": datetime.now(),
+    })
 
 
 def check_staging_data_quality(engine: Engine) -> dict:
@@ -129,298 +177,662 @@ def check_staging_data_quality(engine: Engine) -> dict:
     return quality_report
 
 
-def upsert_dim_player(engine: Engine) -> Tuple[int, int]:
-    """Upserts players using a single, robust, idempotent INSERT...ON DUPLICATE KEY UPDATE."""
-    process_name = "upsert_dim_player"
-    rows_affected = 0
-    status = "SUCCESS"
-    msg = ""
+def _row_hash_sql(columns) -> str:
+    """MD5 over the tracked columns; NULL is encoded distinctly from ''."""
+    parts = ", ".join(f"COALESCE(CAST(m.{c} AS CHAR), '\\\\N')" for c in columns)
+    return f"MD5(CONCAT_WS('|', {parts}))"
 
-    # This single query handles insertion of new players and updates of existing ones.
-    # It uses a subquery to select distinct players and their most complete JSON data.
-    # The ON DUPLICATE KEY UPDATE clause uses COALESCE to avoid overwriting
-    # existing data with NULLs if a less complete record is processed.
-    sql = text("""
-        INSERT INTO dim_player (
-            external_id,
-            player_name,
-            birth_date,
-            nationality,
-            position,
-            player_bk
-        )
+
+def _apply_hash_diff(
+    conn,
+    dim_table: str,
+    key_column: str,
+    columns: Sequence[str],
+    keep_existing: Sequence[str],
+    staged_sql: str,
+    params: dict,
+) -> Tuple[int, int, int]:
+    """Apply staged rows to a dimension, touching only rows whose hash changed.
+
+    1. Merge staged rows (one per key) with the current dimension row into a
+       temporary table; columns in keep_existing keep the dimension value
+       when the staged value is NULL. The row_hash is computed over the
+       merged values, so it equals the stored hash when nothing would change.
+    2. Count new / changed / unchanged keys.
+    3. UPDATE only changed rows, then INSERT only new keys.
+
+    Args:
+        conn: Open connection (inside the upsert's transaction)
+        dim_table: Target dimension table (must have a row_hash column)
+        key_column: Business key; unique in dim_table and in staged_sql
+        columns: Tracked attribute columns (written and hashed)
+        keep_existing: Subset of columns where NULL never overwrites a value
+        staged_sql: SELECT yielding key_column + columns, one row per key
+        params: Bind parameters for staged_sql
+
+    Returns:
+        Tuple of (rows_inserted, rows_updated, rows_unchanged)
+    """
+    tmp = f"tmp_{dim_table}_changes"
+    hashed = list(columns) or [key_column]
+    merged = ", ".join(
+        f"COALESCE(s.{c}, d.{c}) AS {c}" if c in keep_existing else f"s.{c} AS {c}"
+        for c in columns
+    )
+    select_cols = f"s.{key_column} AS {key_column}" + (f", {merged}" if merged else "")
+
+    conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {tmp}"))
+    conn.execute(text(f"""
+        CREATE TEMPORARY TABLE {tmp} AS
+        SELECT m.*, {_row_hash_sql(hashed)} AS row_hash
+        FROM (
+            SELECT {select_cols},
+                   d.{key_column} IS NOT NULL AS is_existing,
+                   d.row_hash AS old_hash
+            FROM ({staged_sql}) AS s
+            LEFT JOIN {dim_table} d ON d.{key_column} = s.{key_column}
+        ) AS m
+    """), params)
+
+    inserted, updated, unchanged = conn.execute(text(f"""
         SELECT
-            s.player_id_str,
-            s.player_name,
-            s.birth_date,
-            s.nationality,
-            s.position,
-            s.player_id_str
+            COALESCE(SUM(is_existing = 0), 0),
+            COALESCE(SUM(is_existing = 1 AND (old_hash IS NULL OR old_hash <> row_hash)), 0),
+            COALESCE(SUM(is_existing = 1 AND old_hash = row_hash), 0)
+        FROM {tmp}
+    """)).one()
+
+    if updated:
+        assignments = ", ".join(f"d.{c} = t.{c}" for c in columns)
+        conn.execute(text(f"""
+            UPDATE {dim_table} d
+            JOIN {tmp} t ON d.{key_column} = t.{key_column}
+            SET {assignments + ', ' if assignments else ''}d.row_hash = t.row_hash
+            WHERE t.is_existing = 1 AND (t.old_hash IS NULL OR t.old_hash <> t.row_hash)
+        """))
+
+    if inserted:
+        insert_cols = ", ".join([key_column, *columns, "row_hash"])
+        # ON DUPLICATE KEY only fires on a collision with another unique key
+        # of the target, matching the previous upsert behaviour
+        conn.execute(text(f"""
+            INSERT INTO {dim_table} ({insert_cols})
+            SELECT {insert_cols} FROM {tmp} WHERE is_existing = 0
+            ON DUPLICATE KEY UPDATE
+                {', '.join(f'{c} = VALUES({c})' for c in [*columns, 'row_hash'])}
+        """))
+
+    conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {tmp}"))
+    return (int(inserted), int(updated), int(unchanged))
+
+
+def _apply_scd2(
+    conn,
+    dim_table: str,
+    bk_column: str,
+    columns: Sequence[str],
+    keep_existing: Sequence[str],
+    staged_sql: str,
+    params: dict,
+) -> Tuple[int, int, int]:
+    """Apply staged rows to an SCD Type 2 dimension with set-based statements.
+
+    Versions are ranges [eff_start, eff_end] with is_current = 'Y' on the open
+    one; a changed row_hash closes the current version and opens a new one.
+
+    1. Merge staged rows (one per key and version_date) with the key's current
+       version into a temporary table and hash the merged values. Staged rows
+       older than the current version's eff_start are ignored.
+    2. A staged row dated on the current version's eff_start with a different
+       hash is a correction of that version (e.g. a re-staged season file with
+       a fixed nationality): its attributes and row_hash are updated in place.
+    3. Keep only change points: rows whose hash differs from the previous
+       staged row of the same key (the first one is compared with the current,
+       possibly corrected, version), so repeated identical snapshots collapse
+       to one version.
+    4. Expire the current version of every changed key in one UPDATE
+       (eff_end = day before its first change, is_current = 'N').
+    5. INSERT all new versions in one statement; each ends the day before
+       the next one starts and only the last is current. A brand-new key's
+       first version starts at SCD_START so historical facts still resolve.
+
+    Args:
+        conn: Open connection (inside the upsert's transaction)
+        dim_table: Target dimension (bk_column, eff_start, eff_end, is_current, row_hash)
+        bk_column: Business key shared by all versions of a member
+        columns: Tracked attribute columns (written and hashed)
+        keep_existing: Subset of columns where NULL keeps the current version's value
+        staged_sql: SELECT yielding bk_column, version_date and columns,
+            one row per (bk_column, version_date)
+        params: Bind parameters for staged_sql
+
+    Returns:
+        Tuple of (keys_inserted, keys_changed, keys_unchanged); a key is
+        changed when it got a new version or its current version was corrected
+    """
+    staged = f"tmp_{dim_table}_scd_staged"
+    changes = f"tmp_{dim_table}_scd_changes"
+    merged = ", ".join(
+        f"COALESCE(s.{c}, d.{c}) AS {c}" if c in keep_existing else f"s.{c} AS {c}"
+        for c in columns
+    )
+
+    conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {staged}"))
+    conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {changes}"))
+    conn.execute(text(f"""
+        CREATE TEMPORARY TABLE {staged} AS
+        SELECT m.*, {_row_hash_sql(columns)} AS row_hash
         FROM (
-            SELECT DISTINCT
-                CAST(player_id AS CHAR) AS player_id_str,
-                TRIM(player_name) AS player_name,
-                STR_TO_DATE(JSON_UNQUOTE(JSON_EXTRACT(raw_data, '$.dateOfBirth')), '%b %d, %Y') AS birth_date,
-                JSON_UNQUOTE(JSON_EXTRACT(raw_data, '$.nationality[0]')) AS nationality,
-                JSON_UNQUOTE(JSON_EXTRACT(raw_data, '$.position')) AS position
-            FROM stg_player_raw
-            WHERE status = 'SUCCESS' AND player_name IS NOT NULL AND TRIM(player_name) <> ''
-        ) AS s
-        ON DUPLICATE KEY UPDATE
-            player_name = VALUES(player_name),
-            birth_date = COALESCE(VALUES(birth_date), dim_player.birth_date),
-            nationality = COALESCE(VALUES(nationality), dim_player.nationality),
-            position = COALESCE(VALUES(position), dim_player.position),
-            player_bk = VALUES(player_bk);
-    """)
+            SELECT s.{bk_column} AS {bk_column}, s.version_date, {merged},
+                   d.{bk_column} IS NOT NULL AS is_existing,
+                   d.row_hash AS cur_hash,
+                   d.eff_start AS cur_start
+            FROM ({staged_sql}) AS s
+            LEFT JOIN {dim_table} d ON d.{bk_column} = s.{bk_column} AND d.is_current = 'Y'
+        ) AS m
+    """), params)
+
+    # WHERE runs before the outer window functions, so LEAD sees change points only
+    conn.execute(text(f"""
+        CREATE TEMPORARY TABLE {changes} AS
+        SELECT c.*,
+               LEAD(version_date) OVER (PARTITION BY {bk_column} ORDER BY version_date) AS next_start,
+               ROW_NUMBER() OVER (PARTITION BY {bk_column} ORDER BY version_date) AS change_seq
+        FROM (
+            SELECT v.*, LAG(row_hash) OVER (PARTITION BY {bk_column} ORDER BY version_date) AS prev_hash
+            FROM {staged} v
+            WHERE is_existing = 0 OR version_date >= cur_start
+        ) AS c
+        WHERE c.row_hash <> COALESCE(c.prev_hash, c.cur_hash, '')
+          -- a row on the current version's start date corrects it (below), no new version
+          AND NOT (c.is_existing = 1 AND c.version_date = c.cur_start)
+    """))
+
+    inserted, versioned = conn.execute(text(f"""
+        SELECT COUNT(DISTINCT CASE WHEN is_existing = 0 THEN {bk_column} END),
+               COUNT(DISTINCT CASE WHEN is_existing = 1 THEN {bk_column} END)
+        FROM {changes}
+    """)).one()
+    existing, changed = conn.execute(text(f"""
+        SELECT COUNT(DISTINCT s.{bk_column}),
+               COUNT(DISTINCT CASE WHEN (s.version_date = s.cur_start AND NOT (s.row_hash <=> s.cur_hash))
+                                     OR EXISTS (SELECT 1 FROM {changes} c WHERE c.{bk_column} = s.{bk_column})
+                                   THEN s.{bk_column} END)
+        FROM {staged} s
+        WHERE s.is_existing = 1
+    """)).one()
+
+    # Same-day corrections, before any newer version expires the current one
+    assignments = ", ".join(f"d.{c} = s.{c}" for c in [*columns, "row_hash"])
+    conn.execute(text(f"""
+        UPDATE {dim_table} d
+        JOIN {staged} s ON s.{bk_column} = d.{bk_column}
+                       AND s.is_existing = 1
+                       AND s.version_date = d.eff_start
+                       AND NOT (s.row_hash <=> d.row_hash)
+        SET {assignments}
+        WHERE d.is_current = 'Y'
+    """))
+
+    if versioned:
+        conn.execute(text(f"""
+            UPDATE {dim_table} d
+            JOIN (
+                SELECT {bk_column}, MIN(version_date) AS first_change
+                FROM {changes}
+                WHERE is_existing = 1
+                GROUP BY {bk_column}
+            ) AS c ON d.{bk_column} = c.{bk_column}
+            SET d.eff_end = DATE_SUB(c.first_change, INTERVAL 1 DAY),
+                d.is_current = 'N'
+            WHERE d.is_current = 'Y'
+        """))
+
+    if inserted or versioned:
+        insert_cols = ", ".join([bk_column, *columns, "row_hash"])
+        conn.execute(text(f"""
+            INSERT INTO {dim_table} ({insert_cols}, eff_start, eff_end, is_current)
+            SELECT {insert_cols},
+                   CASE WHEN is_existing = 0 AND change_seq = 1 THEN :scd_start ELSE version_date END,
+                   COALESCE(DATE_SUB(next_start, INTERVAL 1 DAY), :scd_end),
+                   CASE WHEN next_start IS NULL THEN 'Y' ELSE 'N' END
+            FROM {changes}
+        """), {"scd_start": SCD_START, "scd_end": SCD_END})
+
+    conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {changes}"))
+    conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {staged}"))
+    return (int(inserted), int(changed or 0), int(existing or 0) - int(changed or 0))
+
+
+def _refresh_referee_aliases(conn) -> int:
+    """Rebuild the derived spellings in dim_referee_alias from dim_referee.
+
+    Every referee gets its full name, the short form ('M Oliver', as the
+    football-data.co.uk E0 files write it) and the dotted initial ('M. Oliver').
+    A full name wins over a derived spelling of another referee; a derived
+    spelling shared by several referees maps to -1 (ambiguous). Manually
+    added aliases (alias_kind 'manual') are kept.
+
+    Args:
+        conn: Open connection (inside the upsert's transaction)
+
+    Returns:
+        Number of derived aliases written
+    """
+    conn.execute(text("DELETE FROM dim_referee_alias WHERE alias_kind <> 'manual'"))
+    return conn.execute(text("""
+        INSERT IGNORE INTO dim_referee_alias (alias, referee_id, alias_kind)
+        SELECT alias,
+               CASE WHEN COUNT(DISTINCT referee_id) = 1 THEN MIN(referee_id) ELSE -1 END,
+               MIN(alias_kind)
+        FROM (
+            SELECT alias, referee_id, alias_kind,
+                   RANK() OVER (PARTITION BY alias ORDER BY priority) AS rnk
+            FROM (
+                SELECT TRIM(referee_name) AS alias, referee_id, 'full' AS alias_kind, 1 AS priority
+                FROM dim_referee WHERE referee_id > 0
+                UNION ALL
+                SELECT TRIM(referee_name_short), referee_id, 'short', 2
+                FROM dim_referee WHERE referee_id > 0
+                UNION ALL
+                SELECT CONCAT(LEFT(TRIM(SUBSTRING_INDEX(TRIM(referee_name), ' ', 1)), 1), '. ',
+                              TRIM(SUBSTRING_INDEX(TRIM(referee_name), ' ', -1))),
+                       referee_id, 'initial_dot', 2
+                FROM dim_referee WHERE referee_id > 0 AND TRIM(referee_name) LIKE '% %'
+            ) AS spellings
+            WHERE alias IS NOT NULL AND alias <> ''
+        ) AS ranked
+        WHERE rnk = 1
+        GROUP BY alias
+    """)).rowcount
+
+
+def _upsert_with_watermark(
+    engine: Engine,
+    process_name: str,
+    entity: str,
+    source_table: str,
+    watermark_column: str,
+    full_refresh: bool,
+    apply,
+) -> Tuple[int, int, int]:
+    """Shared run/log/watermark wrapper around one dimension's hash-diff apply.
+
+    Args:
+        engine: SQLAlchemy engine connected to the data warehouse
+        process_name: Name used for etl_log and ETL_Watermark
+        entity: Human-readable record type for messages
+        source_table: Staging table the upsert reads
+        watermark_column: Load timestamp column of source_table
+        full_refresh: Ignore the stored watermark
+        apply: callable(conn, params) -> (inserted, updated, unchanged)
+
+    Returns:
+        Tuple of (rows_inserted, rows_updated, rows_unchanged)
+    """
+    counts = (0, 0, 0)
+    status = "SUCCESS"
+    msg = ""
+    started = datetime.now()
 
     try:
         with engine.begin() as conn:
-            result = conn.execute(sql)
-            rows_affected = result.rowcount or 0
-            msg = f"Upserted {rows_affected} player records from JSON."
+            window = _watermark_window(conn, process_name, source_table, watermark_column, full_refresh)
+            if window is None:
+                msg = f"No staged {entity} records"
+            else:
+                counts = apply(conn, {"wm_low": window[0], "wm_high": window[1]})
+                _advance_watermark(conn, process_name, source_table, watermark_column,
+                                   window[1], counts[0] + counts[1], full_refresh)
+                msg = (f"{entity} records staged since {window[0]}: {counts[0]} inserted, "
+                       f"{counts[1]} updated, {counts[2]} unchanged")
             print(f"[OK] {process_name}: {msg}")
     except SQLAlchemyError as e:
-        status, msg = "FAILED", str(e)
+        status = "FAILED"
+        msg = f"Error during {entity} upsert: {str(e)}"
         print(f"[ERROR] {process_name}: {msg}")
         raise
     finally:
-        _log_run(engine, process_name, rows_affected, status, msg)
+        events = get_event_logger(engine)
+        events.log(process_name, "transform", status, started, datetime.now(),
+                   counts[0] + counts[1], msg)
+        if status == "FAILED":
+            events.flush()
+
+    return counts
+
 
-    return (rows_affected, 0)
+def upsert_dim_player(engine: Engine, full_refresh: bool = FULL_REFRESH) -> Tuple[int, int, int]:
+    """Apply players from the typed stg_player_raw columns to dim_player (SCD Type 2).
+
+    Business key: player_bk (StatsBomb/JSON player_id)
+    Tracked columns: external_id, player_name, team_name, birth_date,
+    nationality, position
+
+    Only players staged since the last successful run (stg_player_raw.created_at
+    watermark) are read unless full_refresh is set. Each staged season is a
+    snapshot dated 1 July of its start year; a transfer or any other change
+    of the tracked columns closes the current version and opens a new one.
+    Seasons older than a player's current version are ignored. NULL
+    birth_date/nationality/position never overwrite existing values.
+
+    Args:
+        engine: SQLAlchemy engine connected to the data warehouse
+        full_refresh: Re-read the whole staging table and reset the watermark
+
+    Returns:
+        Tuple of (players_inserted, players_versioned, players_unchanged)
+
+    Raises:
+        SQLAlchemyError: if database operation fails
+    """
+    staged_sql = """
+        SELECT player_bk, version_date, external_id, player_name, team_name,
+               birth_date, nationality, position
+        FROM (
+            SELECT p.*,
+                   ROW_NUMBER() OVER (PARTITION BY player_bk, version_date
+                                      ORDER BY created_at DESC, json_id DESC) AS rn
+            FROM (
+                SELECT
+                    CAST(player_id AS CHAR) AS player_bk,
+                    COALESCE(MAKEDATE(season, 1) + INTERVAL 6 MONTH, DATE(created_at)) AS version_date,
+                    CAST(player_id AS CHAR) AS external_id,
+                    TRIM(player_name) AS player_name,
+                    NULLIF(TRIM(team), '') AS team_name,
+                    birth_date,
+                    nationality,
+                    position,
+                    created_at,
+                    json_id
+                FROM stg_player_raw
+                WHERE status = 'SUCCESS' AND player_id IS NOT NULL
+                  AND player_name IS NOT NULL AND TRIM(player_name) <> ''
+                  AND created_at BETWEEN :wm_low AND :wm_high
+            ) AS p
+        ) AS ranked
+        WHERE rn = 1
+    """
+    return _upsert_with_watermark(
+        engine, "upsert_dim_player", "player", "stg_player_raw", "created_at", full_refresh,
+        lambda conn, params: _apply_scd2(
+            conn, "dim_player", "player_bk",
+            ["external_id", "player_name", "team_name", "birth_date", "nationality", "position"],
+            ["birth_date", "nationality", "position"],
+            staged_sql, params,
+        ),
+    )
 
 
-def upsert_dim_team(engine: Engine) -> Tuple[int, int]:
-    """Upsert distinct teams from stg_team_raw to dim_team.
+def upsert_dim_team(engine: Engine, full_refresh: bool = FULL_REFRESH) -> Tuple[int, int, int]:
+    """Apply teams from stg_team_raw to dim_team (SCD Type 2).
     
-    Business key: team_name
-    Columns populated: team_name, team_code, city
+    Business key: team_bk (football-data.org team id; the trimmed name for
+    rows staged before the id was kept)
+    Tracked columns: team_name, team_code, city
     
     Data flow:
-    1. Extract distinct teams from stg_team_raw with team_code and city
-    2. team_code: from shortName field
-    3. city: extracted from address field (first part before comma)
+    1. Extract teams staged since the last run (created_at watermark), latest
+       per team and load date; the load date is the version's start
+    2. team_code: from shortName field (tla as fallback)
+    3. city: extracted from address field (word before the postcode)
     4. Clean: strip whitespace, remove NULL values
-    5. Upsert to dim_team with ON DUPLICATE KEY UPDATE
+    5. Hash-diff against the current version: a rename (or any tracked
+       change) expires it and inserts a new version; unchanged teams are skipped
     6. Log operation to etl_log
     
     Args:
         engine: SQLAlchemy engine connected to the data warehouse
+        full_refresh: Re-read the whole staging table and reset the watermark
     
     Returns:
-        Tuple of (rows_inserted, rows_updated)
-        Note: MySQL ON DUPLICATE KEY UPDATE does not distinguish between insert/update,
-              so we return (total_affected, 0) for compatibility
+        Tuple of (teams_inserted, teams_versioned, teams_unchanged)
     
     Raises:
         SQLAlchemyError: if database operation fails
     """
-    process_name = "upsert_dim_team"
-    rows_affected = 0
-    status = "SUCCESS"
-    msg = ""
-    
-    try:
-        with engine.begin() as conn:
-            # Upsert distinct teams from staging to dimension
-            # City extraction: get the word before the last postcode segment
-            # UK postcodes are format "XX# #XX" so we extract the word before last 2 words
-            upsert_sql = text("""
-                INSERT INTO dim_team (team_name, team_code, city)
-                SELECT DISTINCT 
+    # City extraction: get the word before the last postcode segment
+    # UK postcodes are format "XX# #XX" so we extract the word before last 2 words
+    staged_sql = """
+        SELECT team_bk, version_date, team_name, team_code, city
+        FROM (
+            SELECT t.*,
+                   ROW_NUMBER() OVER (PARTITION BY team_bk, version_date
+                                      ORDER BY created_at DESC, api_id DESC) AS rn
+            FROM (
+                SELECT
+                    COALESCE(CAST(team_id AS CHAR), TRIM(name)) AS team_bk,
+                    DATE(created_at) AS version_date,
                     TRIM(name) AS team_name,
                     COALESCE(TRIM(shortName), TRIM(tla)) AS team_code,
-                    TRIM(SUBSTRING_INDEX(SUBSTRING_INDEX(address, ' ', -3), ' ', 1)) AS city
+                    TRIM(SUBSTRING_INDEX(SUBSTRING_INDEX(address, ' ', -3), ' ', 1)) AS city,
+                    created_at,
+                    api_id
                 FROM stg_team_raw
-                WHERE name IS NOT NULL 
+                WHERE name IS NOT NULL
                   AND TRIM(name) != ''
-                ON DUPLICATE KEY UPDATE
-                    team_name = VALUES(team_name),
-                    team_code = COALESCE(VALUES(team_code), dim_team.team_code),
-                    city = COALESCE(VALUES(city), dim_team.city)
-            """)
-            
-            result = conn.execute(upsert_sql)
-            rows_affected = result.rowcount or 0
-            msg = f"Upserted {rows_affected} distinct team records"
-            
-    except SQLAlchemyError as e:
-        status = "FAILED"
-        msg = f"Error during team upsert: {str(e)}"
-        print(f"[ERROR] {process_name}: {msg}")
-        raise
-    
-    finally:
-        _log_run(engine, process_name, rows_affected, status, msg)
-    
-    return (rows_affected, 0)
+                  AND created_at BETWEEN :wm_low AND :wm_high
+            ) AS t
+        ) AS ranked
+        WHERE rn = 1
+    """
+    return _upsert_with_watermark(
+        engine, "upsert_dim_team", "team", "stg_team_raw", "created_at", full_refresh,
+        lambda conn, params: _apply_scd2(
+            conn, "dim_team", "team_bk", ["team_name", "team_code", "city"], ["team_code", "city"],
+            staged_sql, params,
+        ),
+    )
 
 
-def upsert_dim_stadium(engine: Engine) -> Tuple[int, int]:
+def upsert_dim_stadium(engine: Engine, full_refresh: bool = FULL_REFRESH) -> Tuple[int, int, int]:
     """Upsert distinct stadiums from stg_e0_match_raw to dim_stadium.
     
     Business key: stadium_name (stadium venue)
     
     Data flow:
-    1. Extract distinct venue from stg_e0_match_raw (HomeTeam venue)
+    1. Extract distinct venue from stg_e0_match_raw (HomeTeam venue) for rows
+       staged since the last run (load_timestamp watermark)
     2. Clean: strip whitespace, remove NULL values
-    3. Upsert to dim_stadium with ON DUPLICATE KEY UPDATE
+    3. Insert venues not yet in dim_stadium (existing ones are unchanged)
     4. Log operation to etl_log
     
     Args:
         engine: SQLAlchemy engine connected to the data warehouse
+        full_refresh: Re-read the whole staging table and reset the watermark
     
     Returns:
-        Tuple of (rows_inserted, rows_updated)
-        Note: MySQL ON DUPLICATE KEY UPDATE does not distinguish between insert/update,
-              so we return (total_affected, 0) for compatibility
+        Tuple of (rows_inserted, rows_updated, rows_unchanged)
     
     Raises:
         SQLAlchemyError: if database operation fails
     """
-    process_name = "upsert_dim_stadium"
-    rows_affected = 0
-    status = "SUCCESS"
-    msg = ""
-    
-    try:
-        with engine.begin() as conn:
-            # Upsert distinct stadiums from stg_e0_match_raw
-            upsert_sql = text("""
-                INSERT INTO dim_stadium (stadium_name)
-                SELECT DISTINCT 
-                    TRIM(HomeTeam) AS stadium_name
-                FROM stg_e0_match_raw
-                WHERE HomeTeam IS NOT NULL
-                ON DUPLICATE KEY UPDATE
-                    stadium_name = VALUES(stadium_name)
-            """)
-            
-            result = conn.execute(upsert_sql)
-            rows_affected = result.rowcount or 0
-            msg = f"Upserted {rows_affected} distinct stadium records"
-            
-    except SQLAlchemyError as e:
-        status = "FAILED"
-        msg = f"Error during stadium upsert: {str(e)}"
-        print(f"[ERROR] {process_name}: {msg}")
-        raise
-    
-    finally:
-        _log_run(engine, process_name, rows_affected, status, msg)
-    
-    return (rows_affected, 0)
+    staged_sql = """
+        SELECT DISTINCT TRIM(HomeTeam) AS stadium_name
+        FROM stg_e0_match_raw
+        WHERE HomeTeam IS NOT NULL
+          AND load_timestamp BETWEEN :wm_low AND :wm_high
+    """
+    return _upsert_with_watermark(
+        engine, "upsert_dim_stadium", "stadium", "stg_e0_match_raw", "load_timestamp", full_refresh,
+        lambda conn, params: _apply_hash_diff(
+            conn, "dim_stadium", "stadium_name", [], [], staged_sql, params,
+        ),
+    )
 
 
-def upsert_dim_referee(engine: Engine) -> Tuple[int, int]:
+def upsert_dim_referee(engine: Engine, full_refresh: bool = FULL_REFRESH) -> Tuple[int, int, int]:
     """Upsert distinct referees from stg_referee_raw to dim_referee.
     
-    Business key: referee_name
+    Business key: referee_bk (trimmed referee_name)
+    Tracked columns: referee_name, referee_name_short, date_of_birth,
+    nationality, premier_league_debut, status
     
     Data flow:
-    1. Extract distinct referees from stg_referee_raw
-    2. Clean: strip whitespace, handle NULL values, parse dates
-    3. Upsert to dim_referee with ON DUPLICATE KEY UPDATE
-    4. Log operation to etl_log
+    1. Extract referees staged since the last run (created_at watermark), latest per name
+    2. Clean: strip whitespace, handle NULL values, derive short name
+    3. Hash-diff against dim_referee: insert new, update changed, skip unchanged
+    4. Rebuild dim_referee_alias (full name, short form, dotted initial), which
+       load_fact_match.sql joins on its primary key
+    5. Log operation to etl_log
     
     Args:
         engine: SQLAlchemy engine connected to the data warehouse
+        full_refresh: Re-read the whole staging table and reset the watermark
     
     Returns:
-        Tuple of (rows_inserted, rows_updated)
-        Note: MySQL ON DUPLICATE KEY UPDATE does not distinguish between insert/update,
-              so we return (total_affected, 0) for compatibility
+        Tuple of (rows_inserted, rows_updated, rows_unchanged)
     
     Raises:
         SQLAlchemyError: if database operation fails
     """
-    process_name = "upsert_dim_referee"
-    rows_affected = 0
-    status = "SUCCESS"
-    msg = ""
-    
+    staged_sql = """
+        SELECT referee_bk, referee_name, referee_name_short, date_of_birth,
+               nationality, premier_league_debut, status
+        FROM (
+            SELECT
+                TRIM(referee_name) AS referee_bk,
+                TRIM(referee_name) AS referee_name,
+                CONCAT(LEFT(TRIM(SUBSTRING_INDEX(referee_name, ' ', 1)), 1), ' ', TRIM(SUBSTRING_INDEX(referee_name, ' ', -1))) AS referee_name_short,
+                date_of_birth,
+                TRIM(nationality) AS nationality,
+                premier_league_debut,
+                TRIM(ref_status) AS status,
+                ROW_NUMBER() OVER (PARTITION BY TRIM(referee_name) ORDER BY created_at DESC, referee_id DESC) AS rn
+            FROM stg_referee_raw
+            WHERE referee_name IS NOT NULL
+              AND TRIM(referee_name) != ''
+              AND status = 'LOADED'
+              AND created_at BETWEEN :wm_low AND :wm_high
+        ) AS ranked
+        WHERE rn = 1
+    """
+
+    def apply(conn, params):
+        counts = _apply_hash_diff(
+            conn, "dim_referee", "referee_bk",
+            ["referee_name", "referee_name_short", "date_of_birth", "nationality",
+             "premier_league_debut", "status"],
+            ["date_of_birth", "nationality", "premier_league_debut", "status"],
+            staged_sql, params,
+        )
+        _refresh_referee_aliases(conn)
+        return counts
+
+    return _upsert_with_watermark(
+        engine, "upsert_dim_referee", "referee", "stg_referee_raw", "created_at", full_refresh, apply,
+    )
+
+
+# Dimension upserts and the dimensions each one depends on. Upserts whose
+# dependencies have all succeeded run concurrently, each on its own pooled
+# connection. The four current dimensions read disjoint staging tables and
+# write disjoint dimension tables, so none of them depends on another.
+UPSERT_PLAN = {
+    'dim_player': (upsert_dim_player, ()),
+    'dim_team': (upsert_dim_team, ()),
+    'dim_stadium': (upsert_dim_stadium, ()),
+    'dim_referee': (upsert_dim_referee, ()),
+}
+
+
+def _timed_upsert(func, engine: Engine, full_refresh: bool = False) -> dict:
+    """Run one upsert, capturing its result, wall time and any exception."""
+    started = time.perf_counter()
     try:
-        with engine.begin() as conn:
-            # First, try to upsert from stg_referee_raw (Excel data with full details)
-            upsert_sql = text("""
-                INSERT INTO dim_referee (
-                    referee_name,
-                    referee_name_short,
-                    date_of_birth,
-                    nationality,
-                    premier_league_debut,
-                    status,
-                    referee_bk
-                )
-                SELECT DISTINCT 
-                    TRIM(referee_name) AS referee_name,
-                    CONCAT(LEFT(TRIM(SUBSTRING_INDEX(referee_name, ' ', 1)), 1), ' ', TRIM(SUBSTRING_INDEX(referee_name, ' ', -1))) AS referee_name_short,
-                    date_of_birth,
-                    TRIM(nationality) AS nationality,
-                    premier_league_debut,
-                    TRIM(ref_status) AS status,
-                    TRIM(referee_name) AS referee_bk
-                FROM stg_referee_raw
-                WHERE referee_name IS NOT NULL
-                  AND TRIM(referee_name) != ''
-                  AND status = 'LOADED'
-                ON DUPLICATE KEY UPDATE
-                    referee_name = VALUES(referee_name),
-                    referee_name_short = VALUES(referee_name_short),
-                    date_of_birth = COALESCE(VALUES(date_of_birth), dim_referee.date_of_birth),
-                    nationality = COALESCE(VALUES(nationality), dim_referee.nationality),
-                    premier_league_debut = COALESCE(VALUES(premier_league_debut), dim_referee.premier_league_debut),
-                    status = COALESCE(VALUES(status), dim_referee.status),
-                    referee_bk = VALUES(referee_bk)
-            """)
-            
-            result = conn.execute(upsert_sql)
-            rows_affected = result.rowcount or 0
-            msg = f"Upserted {rows_affected} distinct referee records from Excel"
-            
-    except SQLAlchemyError as e:
-        status = "FAILED"
-        msg = f"Error during referee upsert: {str(e)}"
-        print(f"[ERROR] {process_name}: {msg}")
-        raise
-    
-    finally:
-        _log_run(engine, process_name, rows_affected, status, msg)
-    
-    return (rows_affected, 0)
+        result = func(engine, full_refresh=full_refresh)
+        error = None
+    except Exception as e:
+        result, error = (0, 0, 0), e
+    return {'result': result, 'seconds': time.perf_counter() - started, 'error': error}
+
+
+def _execute_upsert_plan(engine: Engine, plan: dict, max_workers: int, full_refresh: bool = False) -> dict:
+    """Run a dependency plan on a thread pool.
 
+    Each upsert is submitted as soon as all of its dependencies have
+    succeeded; if a dependency failed, the dependent upsert is skipped and
+    reported as failed.
 
-def run_all_upserts(engine: Engine) -> dict:
-    """Execute all dimension upserts in sequence.
+    Args:
+        engine: SQLAlchemy engine connected to the data warehouse
+        plan: {name: (upsert function, tuple of dependency names)}
+        max_workers: Maximum upserts running at once
+        full_refresh: Passed to every upsert (ignore watermarks)
+
+    Returns:
+        {name: {'result': (inserted, updated, unchanged), 'seconds': float, 'error': Exception or None}}
+
+    Raises:
+        ValueError: if the plan references unknown dependencies or has a cycle
+    """
+    for name, (_, deps) in plan.items():
+        unknown = [d for d in deps if d not in plan]
+        if unknown:
+            raise ValueError(f"{name} depends on unknown upserts {unknown}")
+
+    pending = dict(plan)
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='upsert') as pool:
+        running = {}
+        while pending or running:
+            for name, (func, deps) in list(pending.items()):
+                failed = [d for d in deps if d in outcomes and outcomes[d]['error'] is not None]
+                if failed:
+                    outcomes[name] = {'result': (0, 0, 0), 'seconds': 0.0,
+                                      'error': RuntimeError(f"skipped, dependency failed: {failed}")}
+                    del pending[name]
+                elif all(d in outcomes for d in deps):
+                    running[pool.submit(_timed_upsert, func, engine, full_refresh)] = name
+                    del pending[name]
+            if not running:
+                if pending:
+                    raise ValueError(f"Dependency cycle among upserts: {sorted(pending)}")
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                outcomes[running.pop(future)] = future.result()
+    return outcomes
+
+
+def run_all_upserts(engine: Engine, max_workers: int = UPSERT_WORKERS,
+                    full_refresh: bool = FULL_REFRESH) -> dict:
+    """Execute all dimension upserts, running independent ones concurrently.
     
-    This is the main orchestration function that runs all four upsert operations
-    in a defined order: Players → Teams → Stadiums → Referees.
+    Upserts are scheduled from UPSERT_PLAN: every upsert whose dependencies
+    have completed runs on its own pooled connection, up to max_workers at a
+    time. Results are aggregated in plan order, so the summary is the same
+    regardless of completion order.
     
-    Each upsert is wrapped in error handling to allow subsequent operations
-    to continue even if one fails.
+    Each upsert is wrapped in error handling to allow the others to continue
+    even if one fails.
     
     Args:
         engine: SQLAlchemy engine connected to the data warehouse
+        max_workers: Maximum concurrent upserts (1 = sequential)
+        full_refresh: Reconcile against the whole staging tables instead of
+            only rows staged since each dimension's watermark
     
     Returns:
         Dictionary with summary of all operations:
         {
-            'dim_player': (inserted, updated),
-            'dim_team': (inserted, updated),
-            'dim_stadium': (inserted, updated),
-            'dim_referee': (inserted, updated),
-            'total_rows': total number of rows affected,
+            'dim_player': (inserted, updated, unchanged),
+            'dim_team': (inserted, updated, unchanged),
+            'dim_stadium': (inserted, updated, unchanged),
+            'dim_referee': (inserted, updated, unchanged),
+            'timings': {dimension: seconds},
+            'elapsed_seconds': wall time of the whole run,
+            'total_rows': total number of rows written (inserted + updated),
             'success': boolean indicating all operations succeeded
         }
     """
-    results = {
-        'dim_player': (0, 0),
-        'dim_team': (0, 0),
-        'dim_stadium': (0, 0),
-        'dim_referee': (0, 0),
+    results = {name: (0, 0, 0) for name in UPSERT_PLAN}
+    results.update({
+        'timings': {},
+        'elapsed_seconds': 0.0,
         'total_rows': 0,
         'success': True
-    }
+    })
     
     print("\n" + "="*70)
     print("DIMENSION TABLE UPSERT ORCHESTRATION")
@@ -429,65 +841,38 @@ def run_all_upserts(engine: Engine) -> dict:
     # Check data quality before upserting
     quality_report = check_staging_data_quality(engine)
     
-    # Upsert Players
-    print("\n[1/4] Upserting dim_player...")
-    try:
-        inserted, updated = upsert_dim_player(engine)
-        results['dim_player'] = (inserted, updated)
-        print(f"    [OK] dim_player: {inserted} rows affected")
-    except Exception as e:
-        print(f"    [ERROR] dim_player failed: {e}")
-        results['success'] = False
-    
-    # Upsert Teams
-    print("\n[2/4] Upserting dim_team...")
-    try:
-        inserted, updated = upsert_dim_team(engine)
-        results['dim_team'] = (inserted, updated)
-        print(f"    [OK] dim_team: {inserted} rows affected")
-    except Exception as e:
-        print(f"    [ERROR] dim_team failed: {e}")
-        results['success'] = False
-    
-    # Upsert Stadiums
-    print("\n[3/4] Upserting dim_stadium...")
-    try:
-        inserted, updated = upsert_dim_stadium(engine)
-        results['dim_stadium'] = (inserted, updated)
-        print(f"    [OK] dim_stadium: {inserted} rows affected")
-    except Exception as e:
-        print(f"    [ERROR] dim_stadium failed: {e}")
-        results['success'] = False
-    
-    # Upsert Referees
-    print("\n[4/4] Upserting dim_referee...")
-    try:
-        inserted, updated = upsert_dim_referee(engine)
-        results['dim_referee'] = (inserted, updated)
-        print(f"    [OK] dim_referee: {inserted} rows affected")
-    except Exception as e:
-        print(f"    [ERROR] dim_referee failed: {e}")
-        results['success'] = False
+    mode = "full refresh" if full_refresh else "incremental"
+    print(f"\nUpserting {len(UPSERT_PLAN)} dimensions ({max_workers} workers, {mode})...")
+    started = time.perf_counter()
+    outcomes = _execute_upsert_plan(engine, UPSERT_PLAN, max_workers, full_refresh)
+    results['elapsed_seconds'] = time.perf_counter() - started
+    
+    for idx, name in enumerate(UPSERT_PLAN, 1):
+        outcome = outcomes[name]
+        results[name] = outcome['result']
+        results['timings'][name] = outcome['seconds']
+        if outcome['error'] is None:
+            ins, upd, unch = outcome['result']
+            print(f"    [{idx}/{len(UPSERT_PLAN)}] [OK] {name}: {ins} inserted, {upd} updated, "
+                  f"{unch} unchanged ({outcome['seconds']:.2f}s)")
+        else:
+            print(f"    [{idx}/{len(UPSERT_PLAN)}] [ERROR] {name} failed: {outcome['error']}")
+            results['success'] = False
     
     # Calculate totals
-    total = sum(ins + upd for ins, upd in [
-        results['dim_player'],
-        results['dim_team'],
-        results['dim_stadium'],
-        results['dim_referee']
-    ])
+    total = sum(ins + upd for ins, upd, _ in (results[name] for name in UPSERT_PLAN))
     results['total_rows'] = total
     
     # Print summary
     print("\n" + "="*70)
     print("UPSERT SUMMARY")
     print("="*70)
-    print(f"dim_player:  {results['dim_player'][0]:6d} rows affected")
-    print(f"dim_team:    {results['dim_team'][0]:6d} rows affected")
-    print(f"dim_stadium: {results['dim_stadium'][0]:6d} rows affected")
-    print(f"dim_referee: {results['dim_referee'][0]:6d} rows affected")
+    print(f"{'':<13}{'inserted':>9}{'updated':>9}{'unchanged':>10}{'seconds':>9}")
+    for name in UPSERT_PLAN:
+        ins, upd, unch = results[name]
+        print(f"{name + ':':<13}{ins:9d}{upd:9d}{unch:10d}{results['timings'][name]:9.2f}")
     print("-"*70)
-    print(f"TOTAL:       {total:6d} rows affected")
+    print(f"TOTAL:       {total:6d} rows written  {results['elapsed_seconds']:7.2f}s wall")
     print(f"Status:      {'[OK] SUCCESS' if results['success'] else '[ERROR] FAILED'}")
     print("="*70 + "\n")
     
@@ -496,6 +881,11 @@ def run_all_upserts(engine: Engine) -> dict:
 
 if __name__ == "__main__":
     """Main entry point: use project's config to build engine and run all upserts."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Upsert dimension tables from staging")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="Reconcile against the whole staging tables, ignoring watermarks")
+    full_refresh = parser.parse_args().full_refresh or FULL_REFRESH
     
     # Import project config
     try:
@@ -516,7 +906,7 @@ if __name__ == "__main__":
         print("[OK] Database connection successful\n")
         
         # Run all upsert operations
-        results = run_all_upserts(engine)
+        results = run_all_upserts(engine, full_refresh=full_refresh)
         
         # Exit with appropriate code
         exit_code = 0 if results['success'] else 1
@@ -0,0 +1,253 @@
+"""In-process surrogate key resolution for fact loads.
+
+The SQL fact loads resolve keys with LEFT JOINs inside MySQL (dim_player by
+player_name, dim_team_mapping, dim_match_mapping) for every staged row. The
+KeyResolver loads each dimension's natural key -> surrogate key map once, into
+numpy arrays behind a pandas hash index, and resolves a whole batch of staged
+rows with array operations:
+  - static maps (statsbomb_match_id -> match, statsbomb_team_id -> team) are
+    one hash lookup (Index.get_indexer) plus a gather
+  - SCD Type 2 maps (dim_player, dim_team) also take the row's match date:
+    versions are sorted by (natural key, eff_start) and one searchsorted picks
+    the version whose [eff_start, eff_end] contains the date
+  - teams go StatsBomb team name -> dim_team_alias (TeamAliasResolver, source
+    'statsbomb') -> team_bk -> version valid on the match day; the
+    dim_team_mapping id map is the fallback for names without an alias
+Unresolved keys fall back to the unknown sentinels (player 6808, team -1),
+as the SQL loads do with COALESCE.
+
+Natural keys are compared the way the utf8mb4_0900_ai_ci columns compare them
+(case- and accent-insensitive), so both paths resolve the same rows.
+
+Exposed:
+- UNKNOWN_PLAYER_ID, UNKNOWN_TEAM_ID
+- KeyResolver.load(engine) -> KeyResolver with all maps loaded
+- KeyResolver.resolve_matches(statsbomb_match_ids) -> (match_id, match_day, season_id), -1 where unmapped
+- KeyResolver.resolve_teams(statsbomb_team_ids, team_names, match_days) -> team_id array
+- KeyResolver.resolve_players(player_names, match_days) -> player_id array
+- KeyResolver.resolve_events(staged) -> fact_match_events rows (DataFrame)
+- normalize_keys(values) -> collation-equivalent string keys
+
+Private helpers:
+- _to_days(values) -> int64 days since 1970-01-01
+- _StaticKeyMap, _Scd2KeyMap
+"""
+import time
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+# Unknown members seeded by 000_create_schema.sql
+UNKNOWN_PLAYER_ID = 6808
+UNKNOWN_TEAM_ID = -1
+
+# Composite SCD2 search key: natural-key code in the high bits, day in the low
+# bits (days are offset so 1900-01-01 .. 9999-12-31 stay positive)
+_DAY_BITS = 22
+_DAY_OFFSET = 1 << 16
+
+# Lookup result for a key that is not in a map (never a real surrogate key)
+_MISS = np.iinfo(np.int64).min
+
+FACT_EVENT_COLUMNS = [
+    "source_event_id", "season_id", "statsbomb_match_id", "match_id", "event_type",
+    "player_id", "team_id", "minute", "extra_time",
+]
+
+
+def normalize_keys(values) -> pd.Series:
+    """Case- and accent-insensitive string keys (as utf8mb4_0900_ai_ci compares)."""
+    return (pd.Series(values, dtype="object").astype("string")
+            .str.normalize("NFKD")
+            .str.replace("[\u0300-\u036f]", "", regex=True)
+            .str.casefold())
+
+
+def _to_days(values) -> np.ndarray:
+    """Dates as int64 days since the epoch (pandas datetime64 cannot hold 9999-12-31)."""
+    return np.array([v.toordinal() for v in pd.Series(values, dtype="object")], dtype=np.int64) \
+        - 719163  # date(1970, 1, 1).toordinal()
+
+
+class _StaticKeyMap:
+    """natural key -> surrogate key(s) without history."""
+
+    def __init__(self, keys, *values: np.ndarray):
+        self.index = pd.Index(keys)
+        if not self.index.is_unique:
+            raise ValueError("Duplicate natural keys in static key map")
+        self.values = values
+
+    def __len__(self):
+        return len(self.index)
+
+    def positions(self, keys) -> np.ndarray:
+        return self.index.get_indexer(keys)
+
+    def lookup(self, keys, default) -> Tuple[np.ndarray, ...]:
+        pos = self.positions(keys)
+        found = pos >= 0
+        return tuple(np.where(found, column[np.where(found, pos, 0)], default) for column in self.values)
+
+
+class _Scd2KeyMap:
+    """(natural key, date) -> surrogate key of the version valid on that date."""
+
+    def __init__(self, keys: pd.Series, eff_start, eff_end, surrogate):
+        codes, uniques = pd.factorize(normalize_keys(keys), use_na_sentinel=True)
+        self.codes = pd.Index(uniques)
+        start = _to_days(eff_start)
+        order = np.lexsort((start, codes))
+        keep = order[codes[order] >= 0]  # versions without a natural key never match
+        self.version_code = codes[keep].astype(np.int64)
+        self.version_key = (self.version_code << _DAY_BITS) | (start[keep] + _DAY_OFFSET)
+        self.version_end = _to_days(eff_end)[keep]
+        self.surrogate = np.asarray(surrogate, dtype=np.int64)[keep]
+
+    def __len__(self):
+        return len(self.surrogate)
+
+    def lookup(self, keys, days: np.ndarray, default: int) -> np.ndarray:
+        if len(self.surrogate) == 0:
+            return np.full(len(days), default, dtype=np.int64)
+        code = self.codes.get_indexer(normalize_keys(keys)).astype(np.int64)
+        query = (code << _DAY_BITS) | (days + _DAY_OFFSET)
+        idx = np.searchsorted(self.version_key, query, side="right") - 1
+        safe = np.maximum(idx, 0)
+        hit = (code >= 0) & (idx >= 0) & (self.version_code[safe] == code) & (days <= self.version_end[safe])
+        return np.where(hit, self.surrogate[safe], default)
+
+
+class KeyResolver:
+    """Natural key -> surrogate key maps for the fact_match_events load."""
+
+    def __init__(self, matches: _StaticKeyMap, team_mapping: _StaticKeyMap,
+                 teams: _Scd2KeyMap, players: _Scd2KeyMap, team_aliases=None,
+                 load_seconds: float = 0.0):
+        """
+        Args:
+            matches: statsbomb_match_id -> (match_id, match day, season_id)
+            team_mapping: statsbomb_team_id -> (dim_team_id, team_bk)
+            teams: (team_bk, date) -> team_id
+            players: (player_name, date) -> player_id
+            team_aliases: TeamAliasResolver (StatsBomb team name -> team_bk);
+                None resolves teams through team_mapping only
+            load_seconds: Time spent reading the maps
+        """
+        self.matches = matches
+        self.team_mapping = team_mapping
+        self.team_aliases = team_aliases
+        self.teams = teams
+        self.players = players
+        self.load_seconds = load_seconds
+
+    @classmethod
+    def load(cls, engine) -> "KeyResolver":
+        """Read every map with one query per dimension.
+
+        Args:
+            engine: SQLAlchemy engine connected to the data warehouse
+
+        Returns:
+            KeyResolver ready to resolve batches (read-only, safe to share across threads)
+        """
+        # team_alias imports normalize_keys from this module
+        from .team_alias import TeamAliasResolver
+
+        started = time.perf_counter()
+        team_aliases = TeamAliasResolver.load(engine)
+        with engine.connect() as conn:
+            matches = pd.read_sql(text("""
+                SELECT dmm.statsbomb_match_id, fm.match_id, dd.cal_date, fm.season_id
+                FROM   dim_match_mapping dmm
+                JOIN   fact_match fm ON fm.match_id = dmm.csv_match_id
+                JOIN   dim_date dd ON dd.date_id = fm.date_id
+            """), conn)
+            # dim_team_mapping names one version of a team: keep its business key
+            team_mapping = pd.read_sql(text("""
+                SELECT dtm.statsbomb_team_id, dtm.dim_team_id, dt.team_bk
+                FROM   dim_team_mapping dtm
+                LEFT JOIN dim_team dt ON dt.team_id = dtm.dim_team_id
+            """), conn)
+            teams = pd.read_sql(text("SELECT team_id, team_bk, eff_start, eff_end FROM dim_team"), conn)
+            players = pd.read_sql(text("SELECT player_id, player_name, eff_start, eff_end FROM dim_player"), conn)
+
+        return cls(
+            _StaticKeyMap(matches["statsbomb_match_id"].to_numpy(np.int64),
+                          matches["match_id"].to_numpy(np.int64), _to_days(matches["cal_date"]),
+                          matches["season_id"].fillna(-1).to_numpy(np.int64)),
+            _StaticKeyMap(team_mapping["statsbomb_team_id"].to_numpy(np.int64),
+                          team_mapping["dim_team_id"].to_numpy(np.int64),
+                          team_mapping["team_bk"].to_numpy(object)),
+            _Scd2KeyMap(teams["team_bk"], teams["eff_start"], teams["eff_end"], teams["team_id"]),
+            _Scd2KeyMap(players["player_name"], players["eff_start"], players["eff_end"], players["player_id"]),
+            team_aliases=team_aliases,
+            load_seconds=time.perf_counter() - started,
+        )
+
+    def resolve_matches(self, statsbomb_match_ids) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(match_id, match day, season_id) per row; -1 for all three where the match is not mapped."""
+        return self.matches.lookup(np.asarray(statsbomb_match_ids, dtype=np.int64), -1)
+
+    def resolve_teams(self, statsbomb_team_ids, team_names, match_days: np.ndarray) -> np.ndarray:
+        """team_id of the version valid on the match day.
+
+        The team's business key comes from its StatsBomb name through
+        dim_team_alias, else from dim_team_mapping by id. Falls back to the
+        mapped version when no version covers the date, then to
+        UNKNOWN_TEAM_ID, as COALESCE(dt.team_id, dtm.dim_team_id, -1) does.
+        """
+        team_ids = pd.Series(statsbomb_team_ids).astype("Int64").fillna(-1).to_numpy(np.int64)
+        pos = self.team_mapping.positions(team_ids)
+        found = pos >= 0
+        if len(self.team_mapping):
+            dim_team_id, team_bk = (column[np.where(found, pos, 0)] for column in self.team_mapping.values)
+        else:
+            dim_team_id, team_bk = np.full(len(pos), UNKNOWN_TEAM_ID), np.full(len(pos), None, dtype=object)
+        team_bk = np.where(found, team_bk, None)
+        if self.team_aliases is not None:
+            alias_bk = self.team_aliases.resolve("statsbomb", team_names)
+            team_bk = np.where(pd.notna(alias_bk), alias_bk, team_bk)
+        versioned = self.teams.lookup(team_bk, match_days, _MISS)
+        return np.where(versioned != _MISS, versioned, np.where(found, dim_team_id, UNKNOWN_TEAM_ID))
+
+    def resolve_players(self, player_names, match_days: np.ndarray) -> np.ndarray:
+        """player_id of the version valid on the match day, else UNKNOWN_PLAYER_ID."""
+        return self.players.lookup(player_names, match_days, UNKNOWN_PLAYER_ID)
+
+    def resolve_events(self, staged: pd.DataFrame) -> pd.DataFrame:
+        """Turn staged stg_events_raw rows into fact_match_events rows.
+
+        Mirrors load_fact_match_events_step3_final.sql: rows of unmapped matches
+        are dropped (inner join), player/team fall back to the sentinels.
+
+        Args:
+            staged: Columns event_id, statsbomb_match_id, statsbomb_period,
+                minute, type, player_name, team_id, team_name
+
+        Returns:
+            DataFrame with FACT_EVENT_COLUMNS
+        """
+        match_id, match_day, season_id = self.resolve_matches(staged["statsbomb_match_id"])
+        mapped = match_id >= 0
+        staged, match_id, match_day, season_id = \
+            staged[mapped], match_id[mapped], match_day[mapped], season_id[mapped]
+
+        minute = staged["minute"].to_numpy(np.int64)
+        period = staged["statsbomb_period"].fillna(0).to_numpy(np.int64)
+        extra_time = np.where((period == 2) & (minute > 45), minute - 45,
+                              np.where(period >= 3, minute, 0))
+        return pd.DataFrame({
+            "source_event_id": staged["event_id"].to_numpy(object),
+            "season_id": season_id,
+            "statsbomb_match_id": staged["statsbomb_match_id"].to_numpy(np.int64),
+            "match_id": match_id,
+            "event_type": staged["type"].to_numpy(object),
+            "player_id": self.resolve_players(staged["player_name"].to_numpy(object), match_day),
+            "team_id": self.resolve_teams(staged["team_id"].to_numpy(object),
+                                          staged["team_name"].to_numpy(object), match_day),
+            "minute": minute,
+            "extra_time": extra_time,
+        }, columns=FACT_EVENT_COLUMNS)
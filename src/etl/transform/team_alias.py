@@ -0,0 +1,135 @@
+"""Team name conformance through dim_team_alias.
+
+Every source spells teams its own way ('Man City' in the E0 CSV, 'Manchester
+Utd' on FBref, 'Manchester City' in StatsBomb). dim_team_alias maps
+(source_system, alias) -> conformed dim_team.team_name, and team_id of the
+team's current version (resolved by create_mapping_tables.sql). The SQL loads
+join it on its primary key; Python loaders use TeamAliasResolver, which holds
+the whole table in one hash index. Both go from the alias to the team's
+business key (team_bk) and pick the SCD2 version valid on the fact's date from
+there (KeyResolver.resolve_teams), never the current version directly.
+
+Names without an alias pass through unchanged, so a conformed name (or a
+source that already uses them) resolves as well, through the 'dim_team'
+self-aliases.
+
+Exposed:
+- TEAM_ALIAS_SOURCES: known source_system values
+- register_team_aliases(engine, source_system, aliases) -> rows written
+- TeamAliasResolver.load(engine) -> resolver over dim_team_alias
+- TeamAliasResolver.conform(source_system, names) -> conformed team names
+- TeamAliasResolver.resolve(source_system, names) -> team_bk array (None if unresolved)
+"""
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from .key_resolver import normalize_keys
+
+TEAM_ALIAS_SOURCES = ("e0_csv", "fbref", "statsbomb", "stadium_club", "dim_team")
+
+_SEPARATOR = "\x1f"
+
+
+def register_team_aliases(engine, source_system: str, aliases: Mapping[str, str]) -> int:
+    """Add or repoint aliases and resolve their team_id in one transaction.
+
+    Args:
+        engine: SQLAlchemy engine connected to the data warehouse
+        source_system: One of TEAM_ALIAS_SOURCES
+        aliases: {source spelling: conformed dim_team.team_name}
+
+    Returns:
+        Number of aliases written
+
+    Raises:
+        ValueError: if source_system is unknown
+    """
+    if source_system not in TEAM_ALIAS_SOURCES:
+        raise ValueError(f"Unknown source_system '{source_system}' (expected one of {TEAM_ALIAS_SOURCES})")
+    rows = [{"source_system": source_system, "alias": alias.strip(), "team_name": team_name.strip()}
+            for alias, team_name in aliases.items()]
+    if not rows:
+        return 0
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO dim_team_alias (source_system, alias, team_name)
+            VALUES (:source_system, :alias, :team_name)
+            ON DUPLICATE KEY UPDATE team_name = VALUES(team_name)
+        """), rows)
+        conn.execute(text("""
+            UPDATE dim_team_alias a
+            LEFT JOIN (
+                SELECT v.team_name, MIN(cur.team_id) AS team_id
+                FROM dim_team v
+                JOIN dim_team cur ON cur.team_bk = v.team_bk AND cur.is_current = 'Y'
+                GROUP BY v.team_name
+                HAVING COUNT(DISTINCT v.team_bk) = 1  -- a name shared by two teams stays unresolved
+            ) t ON t.team_name = a.team_name
+            SET a.team_id = t.team_id
+            WHERE a.source_system = :source_system
+        """), {"source_system": source_system})
+    return len(rows)
+
+
+class TeamAliasResolver:
+    """In-memory (source_system, alias) -> (team_name, team_bk) lookup."""
+
+    def __init__(self, aliases: pd.DataFrame):
+        """
+        Args:
+            aliases: dim_team_alias rows (source_system, alias, team_name) with
+                team_bk of their resolved team (None if unresolved)
+        """
+        keys = aliases["source_system"].astype(str).to_numpy() + _SEPARATOR \
+            + normalize_keys(aliases["alias"]).to_numpy(dtype=object)
+        self.index = pd.Index(keys)
+        if not self.index.is_unique:
+            # alias is unique per source under the table's ai_ci collation
+            raise ValueError("Duplicate aliases in dim_team_alias")
+        self.team_names = aliases["team_name"].to_numpy(dtype=object)
+        self.team_bks = aliases["team_bk"].astype(object).where(aliases["team_bk"].notna(), None).to_numpy(dtype=object)
+
+    def __len__(self):
+        return len(self.index)
+
+    @classmethod
+    def load(cls, engine) -> "TeamAliasResolver":
+        """Read dim_team_alias once (a few hundred rows)."""
+        with engine.connect() as conn:
+            aliases = pd.read_sql(text("""
+                SELECT a.source_system, a.alias, a.team_name, dt.team_bk
+                FROM   dim_team_alias a
+                LEFT JOIN dim_team dt ON dt.team_id = a.team_id
+            """), conn)
+        return cls(aliases)
+
+    def _positions(self, source_system: str, names) -> np.ndarray:
+        normalized = normalize_keys(pd.Series(names, dtype="object").str.strip())
+        pos = self.index.get_indexer((source_system + _SEPARATOR + normalized).to_numpy(dtype=object))
+        # No alias in this source: the name may already be a conformed one
+        fallback = self.index.get_indexer(("dim_team" + _SEPARATOR + normalized).to_numpy(dtype=object))
+        return np.where(pos >= 0, pos, fallback)
+
+    def conform(self, source_system: str, names) -> pd.Series:
+        """Conformed team names; names without an alias are returned stripped."""
+        names = pd.Series(names, dtype="object")
+        pos = self._positions(source_system, names)
+        if len(self.team_names) == 0:
+            return names.str.strip()
+        conformed = self.team_names[np.maximum(pos, 0)]
+        return pd.Series(np.where(pos >= 0, conformed, names.str.strip()), index=names.index, dtype="object")
+
+    def resolve(self, source_system: str, names) -> np.ndarray:
+        """team_bk of each name's team, None if unresolved.
+
+        A business key, not a surrogate: the caller picks the version valid on
+        its own date (KeyResolver.teams), as the SQL loads do.
+        """
+        pos = self._positions(source_system, names)
+        if len(self.team_bks) == 0:
+            return np.full(len(pos), None, dtype=object)
+        return np.where(pos >= 0, self.team_bks[np.maximum(pos, 0)], None)
@@ -1,17 +1,119 @@
 """Upsert helpers for slowly-changing dimensions.
 
-This module contains simple patterns that can be adapted for SCD Type 1/2.
+This module contains the SCD Type 1 (overwrite in place) pattern for
+DataFrame-sourced dimensions. SCD Type 2 history for dim_player and dim_team
+is applied in SQL by clean_and_upsert_dim._apply_scd2.
+
+upsert_dim is a generic, set-based bulk upsert for any dimension keyed by one
+or more business-key columns:
+1. Stage the DataFrame into a session temporary table (chunked executemany)
+2. Count staged keys that already exist (-> rows_updated)
+3. Apply one statement against the target:
+   - MySQL: INSERT ... SELECT ... ON DUPLICATE KEY UPDATE
+     (the key columns must carry a PRIMARY/UNIQUE key on the target)
+   - other dialects, or strategy="delete_insert": DELETE matching keys, then
+     INSERT ... SELECT from the temp table (matched rows are re-created, so
+     auto-increment surrogate keys change; prefer upsert where available)
+All steps run in one transaction, so a failure leaves the dimension untouched.
+
+Exposed functions:
+- upsert_dim(engine, table_name, df, key_columns, update_columns=None, strategy=None) -> (rows_inserted, rows_updated)
 """
-from sqlalchemy import text
+import uuid
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+from sqlalchemy import Engine, text
+
+STAGE_CHUNK_SIZE = 10_000
+
+
+def _records(df: pd.DataFrame) -> List[dict]:
+    """DataFrame rows as dicts with NaN/NaT turned into None for the driver."""
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def upsert_dim(
+    engine: Engine,
+    table_name: str,
+    df: pd.DataFrame,
+    key_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+    strategy: Optional[str] = None,
+) -> Tuple[int, int]:
+    """Bulk upsert a DataFrame into a dimension table in one transaction.
 
+    Args:
+        engine: SQLAlchemy engine connected to the data warehouse
+        table_name: Target dimension table
+        df: Rows to upsert; column names must match the target's columns
+        key_columns: Business-key columns identifying a row
+        update_columns: Columns overwritten on key match (default: all non-key columns)
+        strategy: "upsert" or "delete_insert"; default picks upsert on MySQL
+            and delete_insert elsewhere
+
+    Returns:
+        Tuple of (rows_inserted, rows_updated)
+
+    Raises:
+        ValueError: if a key column is missing from df or strategy is unknown
+        SQLAlchemyError: if a database operation fails (transaction rolled back)
+    """
+    key_columns = list(key_columns)
+    missing = [k for k in key_columns if k not in df.columns]
+    if missing:
+        raise ValueError(f"Key columns {missing} not in DataFrame columns {list(df.columns)}")
+    if df.empty:
+        return (0, 0)
+
+    columns = list(df.columns)
+    if update_columns is None:
+        update_columns = [c for c in columns if c not in key_columns]
+    if strategy is None:
+        strategy = "upsert" if engine.dialect.name == "mysql" else "delete_insert"
+    if strategy not in ("upsert", "delete_insert"):
+        raise ValueError(f"Unknown strategy '{strategy}' (expected 'upsert' or 'delete_insert')")
+
+    # Last occurrence wins, as it would with row-by-row upserts
+    df = df.drop_duplicates(subset=key_columns, keep="last")
+
+    quote = engine.dialect.identifier_preparer.quote
+    target = quote(table_name)
+    temp = quote(f"tmp_{table_name}_{uuid.uuid4().hex[:8]}")
+    col_list = ", ".join(quote(c) for c in columns)
+    key_match = " AND ".join(f"t.{quote(k)} = s.{quote(k)}" for k in key_columns)
 
-def upsert_dim(engine, table_name, df, key_columns):
-    
     with engine.begin() as conn:
-        for _, row in df.iterrows():
-            where_clause = " AND ".join([f"{k} = :{k}" for k in key_columns])
-            delete_sql = f"DELETE FROM {table_name} WHERE {where_clause}"
-            params = {k: row[k] for k in key_columns}
-            conn.execute(text(delete_sql), params)
-        
-    return True
+        # Empty temp table with the target's column types
+        conn.execute(text(f"CREATE TEMPORARY TABLE {temp} AS SELECT {col_list} FROM {target} WHERE 1 = 0"))
+        try:
+            stage_sql = text(
+                f"INSERT INTO {temp} ({col_list}) VALUES ({', '.join(':' + c for c in columns)})"
+            )
+            for start in range(0, len(df), STAGE_CHUNK_SIZE):
+                conn.execute(stage_sql, _records(df.iloc[start:start + STAGE_CHUNK_SIZE]))
+
+            rows_updated = conn.execute(text(
+                f"SELECT COUNT(*) FROM {temp} s JOIN {target} t ON {key_match}"
+            )).scalar() or 0
+
+            if strategy == "upsert":
+                assignments = update_columns or key_columns[:1]
+                conn.execute(text(
+                    f"INSERT INTO {target} ({col_list}) SELECT {col_list} FROM {temp} "
+                    f"ON DUPLICATE KEY UPDATE "
+                    + ", ".join(f"{quote(c)} = VALUES({quote(c)})" for c in assignments)
+                ))
+            else:
+                conn.execute(text(
+                    f"DELETE FROM {target} WHERE EXISTS "
+                    f"(SELECT 1 FROM {temp} s WHERE "
+                    + " AND ".join(f"{target}.{quote(k)} = s.{quote(k)}" for k in key_columns)
+                    + ")"
+                ))
+                conn.execute(text(f"INSERT INTO {target} ({col_list}) SELECT {col_list} FROM {temp}"))
+        finally:
+            drop = "DROP TEMPORARY TABLE" if engine.dialect.name == "mysql" else "DROP TABLE"
+            conn.execute(text(f"{drop} IF EXISTS {temp}"))
+
+    return (len(df) - rows_updated, rows_updated)
@@ -12,12 +12,18 @@ SET FOREIGN_KEY_CHECKS = 0;
 
 -- Drop in safe order (idempotent)
 DROP TABLE IF EXISTS fact_player_stats;
+DROP TABLE IF EXISTS fact_match_events_swap;
 DROP TABLE IF EXISTS fact_match_events;
 DROP TABLE IF EXISTS fact_match;
+DROP TABLE IF EXISTS team_season_match;
+-- Tracks what fact_match_events holds, so it goes with the facts
+DROP TABLE IF EXISTS ETL_Fact_Events_Manifest;
 
 DROP TABLE IF EXISTS dim_team_mapping;
+DROP TABLE IF EXISTS dim_team_alias;
 DROP TABLE IF EXISTS dim_match_mapping;
 
+DROP TABLE IF EXISTS dim_referee_alias;
 DROP TABLE IF EXISTS dim_referee;
 DROP TABLE IF EXISTS dim_stadium;
 DROP TABLE IF EXISTS dim_player;
@@ -29,6 +35,8 @@ DROP TABLE IF EXISTS ETL_Log;
 DROP TABLE IF EXISTS ETL_File_Manifest;
 DROP TABLE IF EXISTS ETL_Api_Manifest;
 DROP TABLE IF EXISTS ETL_Excel_Manifest;
+-- Dimensions are rebuilt from scratch, so their watermarks must go too
+DROP TABLE IF EXISTS ETL_Watermark;
 
 DROP TABLE IF EXISTS staging_matches;
 DROP TABLE IF EXISTS staging_players;
@@ -55,6 +63,43 @@ CREATE TABLE IF NOT EXISTS ETL_Log (
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
+-- High-watermark per incremental dimension upsert (clean_and_upsert_dim.py)
+CREATE TABLE IF NOT EXISTS ETL_Watermark (
+    process_name VARCHAR(100) NOT NULL PRIMARY KEY,
+    source_table VARCHAR(100) NOT NULL,
+    watermark_column VARCHAR(64) NOT NULL,
+    high_watermark DATETIME NOT NULL,
+    last_run_mode VARCHAR(20) NOT NULL,
+    last_run_rows INT,
+    last_run_time DATETIME NOT NULL,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- Per-statement timings of SQL scripts run through src/etl/sql_runner.py
+-- (kept across schema rebuilds, like the JSON reports)
+CREATE TABLE IF NOT EXISTS ETL_Sql_Profile (
+    profile_id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    run_id CHAR(32) NOT NULL,
+    job_name VARCHAR(100) NOT NULL,
+    script_name VARCHAR(255) NOT NULL,
+    statement_no INT NOT NULL,
+    block_name VARCHAR(100),
+    statement_name VARCHAR(255) NOT NULL,
+    statement_type VARCHAR(20),
+    source_line INT,
+    started_at DATETIME(6) NOT NULL,
+    elapsed_seconds DECIMAL(14,6) NOT NULL,
+    rows_affected BIGINT,
+    status VARCHAR(20) NOT NULL,
+    error_message TEXT,
+    explain_plan MEDIUMTEXT,
+    sql_text MEDIUMTEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_run (run_id),
+    INDEX idx_script_statement (script_name, statement_no),
+    INDEX idx_elapsed (elapsed_seconds)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
 CREATE TABLE IF NOT EXISTS ETL_File_Manifest (
     file_id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
     file_name VARCHAR(255) NOT NULL UNIQUE,
@@ -116,6 +161,34 @@ CREATE TABLE IF NOT EXISTS ETL_Events_Manifest (
     INDEX idx_status (status)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
+-- StatsBomb matches materialized into fact_match_events, with the staging
+-- fingerprint (ETL_Events_Manifest rows_processed/load_end_time) they were loaded from
+CREATE TABLE IF NOT EXISTS ETL_Fact_Events_Manifest (
+    statsbomb_match_id INT NOT NULL PRIMARY KEY,
+    match_id INT NOT NULL,
+    staged_events INT,
+    staged_at DATETIME,
+    events_loaded INT NOT NULL DEFAULT 0,
+    loaded_at DATETIME NOT NULL,
+    INDEX idx_match_id (match_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- One row per FBref (competition, season) backfilled by extract_seasons; SUCCESS rows are skipped on resume
+CREATE TABLE IF NOT EXISTS ETL_Fbref_Manifest (
+    fbref_manifest_id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    competition_id VARCHAR(10) NOT NULL,
+    season_label VARCHAR(9) NOT NULL,
+    url VARCHAR(512),
+    load_start_time DATETIME NOT NULL,
+    load_end_time DATETIME,
+    status VARCHAR(20) NOT NULL,
+    rows_processed INT,
+    error_message TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uk_fbref_season (competition_id, season_label),
+    INDEX idx_status (status)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
 -- STAGING
 CREATE TABLE IF NOT EXISTS stg_e0_match_raw (
     match_source_key VARCHAR(255) NOT NULL PRIMARY KEY,
@@ -144,7 +217,8 @@ CREATE TABLE IF NOT EXISTS stg_e0_match_raw (
     AY INT,
     HR INT,
     AR INT,
-    load_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    load_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_load_timestamp (load_timestamp)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 CREATE TABLE IF NOT EXISTS stg_team_raw (
@@ -206,9 +280,15 @@ CREATE TABLE IF NOT EXISTS stg_player_stats_fbref (
     shots           INT,
     shots_on_target INT,
     season_label    VARCHAR(9),
+    competition_id  VARCHAR(10) DEFAULT '9',
     load_timestamp  DATETIME DEFAULT CURRENT_TIMESTAMP
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- stg_player_stats_fbref is kept across runs: add competition_id to existing warehouses
+SET @c := (SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA=DATABASE() AND TABLE_NAME='stg_player_stats_fbref' AND COLUMN_NAME='competition_id');
+SELECT IF(@c=0, 'ALTER TABLE stg_player_stats_fbref ADD COLUMN competition_id VARCHAR(10) DEFAULT ''9'' AFTER season_label;', 'SELECT "competition_id exists";') INTO @s;
+PREPARE stmt FROM @s; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
 CREATE TABLE IF NOT EXISTS stg_referee_raw (
     referee_id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
     file_name VARCHAR(255),
@@ -285,6 +365,9 @@ CREATE TABLE IF NOT EXISTS stg_player_raw (
     player_name VARCHAR(255),
     team VARCHAR(255),
     position VARCHAR(50),
+    -- Typed attributes parsed from raw_data by JSONReader at load time
+    birth_date DATE,
+    nationality VARCHAR(100),
     raw_data JSON,
     -- Indexes for performance and audit trail
     INDEX idx_file_name (file_name),
@@ -293,10 +376,19 @@ CREATE TABLE IF NOT EXISTS stg_player_raw (
     INDEX idx_player_id (player_id),
     INDEX idx_team (team),
     INDEX idx_status (status),
+    INDEX idx_status_player (status, player_id),
     INDEX idx_load_start_time (load_start_time),
     INDEX idx_created_at (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
+-- stg_player_raw is kept across runs: add the typed columns to existing warehouses
+SET @c := (SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA=DATABASE() AND TABLE_NAME='stg_player_raw' AND COLUMN_NAME='birth_date');
+SELECT IF(@c=0, 'ALTER TABLE stg_player_raw ADD COLUMN birth_date DATE AFTER position;', 'SELECT "birth_date exists";') INTO @s;
+PREPARE stmt FROM @s; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+SET @c := (SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA=DATABASE() AND TABLE_NAME='stg_player_raw' AND COLUMN_NAME='nationality');
+SELECT IF(@c=0, 'ALTER TABLE stg_player_raw ADD COLUMN nationality VARCHAR(100) AFTER birth_date;', 'SELECT "nationality exists";') INTO @s;
+PREPARE stmt FROM @s; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
 CREATE TABLE IF NOT EXISTS ETL_JSON_Manifest (
     manifest_id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
     file_name VARCHAR(255) NOT NULL,
@@ -335,8 +427,13 @@ CREATE TABLE IF NOT EXISTS dim_team (
     eff_start DATE NOT NULL DEFAULT '1900-01-01',
     eff_end DATE NOT NULL DEFAULT '9999-12-31',
     is_current CHAR(1) NOT NULL DEFAULT 'Y',
-    UNIQUE KEY uk_team_name (team_name),
-    UNIQUE KEY uk_team_code (team_code)
+    row_hash CHAR(32),  -- MD5 of tracked attributes; a changed hash opens a new version
+    team_bk VARCHAR(80),  -- football-data.org team id (team name for rows staged without one)
+    -- SCD2: at most one current version per business key (NULL for history rows)
+    current_bk VARCHAR(80) AS (CASE WHEN is_current = 'Y' THEN team_bk END) STORED,
+    UNIQUE KEY uk_team_current (current_bk),
+    INDEX idx_team_bk_range (team_bk, eff_start, eff_end),
+    INDEX idx_team_name_range (team_name, eff_start, eff_end)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 CREATE TABLE IF NOT EXISTS dim_player (
@@ -346,10 +443,19 @@ CREATE TABLE IF NOT EXISTS dim_player (
     birth_date DATE,
     nationality VARCHAR(100),
     position VARCHAR(50),
+    team_name VARCHAR(255),  -- club in the staged season; a transfer opens a new version
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    player_bk VARCHAR(80) UNIQUE,
-    INDEX idx_player_name (player_name),
-    UNIQUE KEY uk_external_id (external_id)
+    player_bk VARCHAR(80),
+    eff_start DATE NOT NULL DEFAULT '1900-01-01',
+    eff_end DATE NOT NULL DEFAULT '9999-12-31',
+    is_current CHAR(1) NOT NULL DEFAULT 'Y',
+    row_hash CHAR(32),  -- MD5 of tracked attributes; a changed hash opens a new version
+    -- SCD2: at most one current version per business key (NULL for history rows)
+    current_bk VARCHAR(80) AS (CASE WHEN is_current = 'Y' THEN player_bk END) STORED,
+    UNIQUE KEY uk_player_current (current_bk),
+    INDEX idx_player_bk_range (player_bk, eff_start, eff_end),
+    INDEX idx_player_name_range (player_name, eff_start, eff_end),
+    INDEX idx_external_id (external_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 CREATE TABLE IF NOT EXISTS dim_stadium (
@@ -361,7 +467,10 @@ CREATE TABLE IF NOT EXISTS dim_stadium (
     opened INT,
     coordinates VARCHAR(100),
     notes TEXT,
-    stadium_bk VARCHAR(80) UNIQUE
+    stadium_bk VARCHAR(80) UNIQUE,
+    row_hash CHAR(32),  -- MD5 of tracked attributes; upserts skip unchanged rows
+    INDEX idx_stadium_name (stadium_name),
+    INDEX idx_stadium_club (club)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 CREATE TABLE IF NOT EXISTS dim_referee (
@@ -373,9 +482,21 @@ CREATE TABLE IF NOT EXISTS dim_referee (
     premier_league_debut DATE,
     status VARCHAR(50),
     referee_bk VARCHAR(80) UNIQUE,
+    row_hash CHAR(32),  -- MD5 of tracked attributes; upserts skip unchanged rows
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
+-- Every known spelling of a referee -> referee_id, for an equi-join on the
+-- staged string. Derived spellings are rebuilt by upsert_dim_referee;
+-- rows with alias_kind 'manual' are kept. -1 = spelling of several referees.
+CREATE TABLE IF NOT EXISTS dim_referee_alias (
+    alias VARCHAR(255) NOT NULL PRIMARY KEY,
+    referee_id INT NOT NULL,
+    alias_kind VARCHAR(20) NOT NULL,  -- full | short | initial_dot | manual
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_referee (referee_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
 CREATE TABLE IF NOT EXISTS dim_season (
     season_id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
     season_name VARCHAR(20) NOT NULL,
@@ -384,6 +505,21 @@ CREATE TABLE IF NOT EXISTS dim_season (
     UNIQUE KEY uk_season_name (season_name)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
+-- Team name conformance: each source system's spelling of a team -> the
+-- conformed dim_team.team_name. team_id (current version) is resolved by
+-- create_mapping_tables.sql; add aliases with team_alias.register_team_aliases
+CREATE TABLE IF NOT EXISTS dim_team_alias (
+    source_system VARCHAR(20) NOT NULL,  -- e0_csv | fbref | statsbomb | stadium_club | dim_team
+    alias VARCHAR(255) NOT NULL,
+    team_name VARCHAR(255) NOT NULL,
+    team_id INT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (source_system, alias),
+    INDEX idx_alias_team_name (source_system, team_name),
+    INDEX idx_alias_team_id (team_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
 -- MAPPING TABLES (Bridge between StatsBomb and CSV data)
 CREATE TABLE IF NOT EXISTS dim_team_mapping (
     statsbomb_team_id INT PRIMARY KEY,
@@ -433,11 +569,33 @@ CREATE TABLE IF NOT EXISTS fact_match (
     FOREIGN KEY (referee_id) REFERENCES dim_referee(referee_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
+-- Derived from fact_match, rebuilt by load_fact_player_stats.sql before each load:
+-- the matches of every (season, team), so stats resolve their match by equi-join
+CREATE TABLE IF NOT EXISTS team_season_match (
+    season_id INT NOT NULL,
+    team_id INT NOT NULL,
+    first_match_id INT NOT NULL,
+    last_match_id INT NOT NULL,
+    matches_played INT NOT NULL,
+    match_ids TEXT,  -- comma-separated fact_match ids in match_id order
+    built_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (season_id, team_id),
+    INDEX idx_team (team_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
 CREATE INDEX idx_date_year_month ON dim_date (year, month);
 CREATE INDEX idx_team_code ON dim_team (team_code);
 
+-- Partitioned by season (LIST on season_id = fact_match.season_id): a season is
+-- reloaded by EXCHANGE PARTITION and archived by dropping its partition
+-- (load_facts.reload_event_season / archive_event_season). Partitions are added
+-- per dim_season row by load_facts.ensure_event_partitions before every load.
+-- Partitioned InnoDB tables cannot have foreign keys and every unique key must
+-- include season_id; the loaders only write keys resolved against the
+-- dimensions (or their -1/6808 sentinels), checked in step 4.
 CREATE TABLE IF NOT EXISTS fact_match_events (
-    event_id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    event_id BIGINT NOT NULL AUTO_INCREMENT,
+    season_id INT NOT NULL DEFAULT -1,
     match_id INT NOT NULL,
     event_type VARCHAR(50),
     player_id INT,
@@ -445,13 +603,18 @@ CREATE TABLE IF NOT EXISTS fact_match_events (
     minute INT,
     extra_time INT DEFAULT 0,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (match_id) REFERENCES fact_match(match_id),
-    FOREIGN KEY (player_id) REFERENCES dim_player(player_id),
-    FOREIGN KEY (team_id) REFERENCES dim_team(team_id),
+    source_event_id VARCHAR(50),  -- StatsBomb event UUID: natural key, reloads update in place
+    statsbomb_match_id INT,       -- lets a re-staged match replace its events
+    PRIMARY KEY (event_id, season_id),
+    UNIQUE KEY uk_source_event (source_event_id, season_id),
+    INDEX idx_statsbomb_match (statsbomb_match_id),
     INDEX (match_id),
     INDEX (player_id),
     INDEX (team_id)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+PARTITION BY LIST (season_id) (
+    PARTITION p_unknown VALUES IN (-1)
+);
 
 CREATE TABLE IF NOT EXISTS fact_player_stats (
     id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
@@ -513,6 +676,115 @@ INSERT IGNORE dim_season (season_name,start_date,end_date) VALUES
 ('2023/2024','2023-08-11','2024-05-19'),
 ('2024/2025','2024-08-16','2025-05-25'),
 ('2025/2026','2025-08-15','2026-05-24');
+
+-- Team aliases (football-data.co.uk E0 CSV, dim_stadium.club, FBref, StatsBomb)
+INSERT IGNORE dim_team_alias (source_system,alias,team_name) VALUES
+('e0_csv','Arsenal','Arsenal FC'),
+('e0_csv','Aston Villa','Aston Villa FC'),
+('e0_csv','Bournemouth','AFC Bournemouth'),
+('e0_csv','Brentford','Brentford FC'),
+('e0_csv','Brighton','Brighton & Hove Albion FC'),
+('e0_csv','Burnley','Burnley FC'),
+('e0_csv','Chelsea','Chelsea FC'),
+('e0_csv','Crystal Palace','Crystal Palace FC'),
+('e0_csv','Everton','Everton FC'),
+('e0_csv','Fulham','Fulham FC'),
+('e0_csv','Ipswich','Ipswich Town FC'),
+('e0_csv','Leeds','Leeds United FC'),
+('e0_csv','Leicester','Leicester City FC'),
+('e0_csv','Liverpool','Liverpool FC'),
+('e0_csv','Luton','Luton Town FC'),
+('e0_csv','Man City','Manchester City FC'),
+('e0_csv','Man United','Manchester United FC'),
+('e0_csv','Newcastle','Newcastle United FC'),
+('e0_csv','Nott''m Forest','Nottingham Forest FC'),
+('e0_csv','Sheffield United','Sheffield United FC'),
+('e0_csv','Southampton','Southampton FC'),
+('e0_csv','Sunderland','Sunderland AFC'),
+('e0_csv','Tottenham','Tottenham Hotspur FC'),
+('e0_csv','West Ham','West Ham United FC'),
+('e0_csv','Wolves','Wolverhampton Wanderers FC'),
+('stadium_club','Manchester City','Manchester City FC'),
+('stadium_club','Manchester United','Manchester United FC'),
+('stadium_club','Nottingham Forest','Nottingham Forest FC'),
+('stadium_club','Wolves','Wolverhampton Wanderers FC'),
+('stadium_club','AFC Bournemouth','AFC Bournemouth'),
+('stadium_club','Brighton & Hove Albion','Brighton & Hove Albion FC'),
+('stadium_club','Newcastle United','Newcastle United FC'),
+('stadium_club','Sheffield United','Sheffield United FC'),
+('stadium_club','West Ham United','West Ham United FC'),
+('stadium_club','Tottenham Hotspur','Tottenham Hotspur FC'),
+('stadium_club','Luton Town','Luton Town FC'),
+('stadium_club','Ipswich Town','Ipswich Town FC'),
+('stadium_club','Leicester City','Leicester City FC'),
+('stadium_club','Southampton','Southampton FC'),
+('stadium_club','Sunderland','Sunderland AFC'),
+('stadium_club','Leeds United','Leeds United FC'),
+('stadium_club','Arsenal','Arsenal FC'),
+('stadium_club','Chelsea','Chelsea FC'),
+('stadium_club','Liverpool','Liverpool FC'),
+('stadium_club','Everton','Everton FC'),
+('stadium_club','Fulham','Fulham FC'),
+('stadium_club','Burnley','Burnley FC'),
+('stadium_club','Crystal Palace','Crystal Palace FC'),
+('stadium_club','Brentford','Brentford FC'),
+('stadium_club','Aston Villa','Aston Villa FC'),
+('fbref','Arsenal','Arsenal FC'),
+('fbref','Aston Villa','Aston Villa FC'),
+('fbref','Bournemouth','AFC Bournemouth'),
+('fbref','Brentford','Brentford FC'),
+('fbref','Brighton','Brighton & Hove Albion FC'),
+('fbref','Burnley','Burnley FC'),
+('fbref','Chelsea','Chelsea FC'),
+('fbref','Crystal Palace','Crystal Palace FC'),
+('fbref','Everton','Everton FC'),
+('fbref','Fulham','Fulham FC'),
+('fbref','Ipswich Town','Ipswich Town FC'),
+('fbref','Leeds United','Leeds United FC'),
+('fbref','Leicester City','Leicester City FC'),
+('fbref','Liverpool','Liverpool FC'),
+('fbref','Luton Town','Luton Town FC'),
+('fbref','Manchester City','Manchester City FC'),
+('fbref','Manchester Utd','Manchester United FC'),
+('fbref','Manchester United','Manchester United FC'),
+('fbref','Newcastle Utd','Newcastle United FC'),
+('fbref','Newcastle','Newcastle United FC'),
+('fbref','Nott''ham Forest','Nottingham Forest FC'),
+('fbref','Nottingham Forest','Nottingham Forest FC'),
+('fbref','Sheffield Utd','Sheffield United FC'),
+('fbref','Sheffield United','Sheffield United FC'),
+('fbref','Southampton','Southampton FC'),
+('fbref','Sunderland','Sunderland AFC'),
+('fbref','Tottenham','Tottenham Hotspur FC'),
+('fbref','West Ham','West Ham United FC'),
+('fbref','Wolves','Wolverhampton Wanderers FC'),
+('statsbomb','AFC Bournemouth','AFC Bournemouth'),
+('statsbomb','Bournemouth','AFC Bournemouth'),
+('statsbomb','Arsenal','Arsenal FC'),
+('statsbomb','Aston Villa','Aston Villa FC'),
+('statsbomb','Brentford','Brentford FC'),
+('statsbomb','Brighton & Hove Albion','Brighton & Hove Albion FC'),
+('statsbomb','Burnley','Burnley FC'),
+('statsbomb','Chelsea','Chelsea FC'),
+('statsbomb','Crystal Palace','Crystal Palace FC'),
+('statsbomb','Everton','Everton FC'),
+('statsbomb','Fulham','Fulham FC'),
+('statsbomb','Ipswich Town','Ipswich Town FC'),
+('statsbomb','Leeds United','Leeds United FC'),
+('statsbomb','Leicester City','Leicester City FC'),
+('statsbomb','Liverpool','Liverpool FC'),
+('statsbomb','Luton Town','Luton Town FC'),
+('statsbomb','Manchester City','Manchester City FC'),
+('statsbomb','Manchester United','Manchester United FC'),
+('statsbomb','Newcastle United','Newcastle United FC'),
+('statsbomb','Nottingham Forest','Nottingham Forest FC'),
+('statsbomb','Sheffield United','Sheffield United FC'),
+('statsbomb','Southampton','Southampton FC'),
+('statsbomb','Sunderland','Sunderland AFC'),
+('statsbomb','Tottenham Hotspur','Tottenham Hotspur FC'),
+('statsbomb','West Ham United','West Ham United FC'),
+('statsbomb','Wolverhampton Wanderers','Wolverhampton Wanderers FC');
+
 -- Add check constraints if they do not already exist (MySQL doesn't support IF NOT EXISTS for constraints)
 -- We'll create them only when not present.
 SET @c1 := (SELECT COUNT(*) FROM information_schema.TABLE_CONSTRAINTS WHERE CONSTRAINT_SCHEMA=DATABASE() AND TABLE_NAME='fact_match' AND CONSTRAINT_NAME='chk_hg');
@@ -533,6 +805,7 @@ PREPARE stmt FROM @s; EXECUTE stmt; DEALLOCATE PREPARE stmt;
 --
 -- 1. dim_team_mapping: Maps StatsBomb team IDs to dim_team IDs
 --    - Populated after stg_team_raw and dim_team are loaded
+--    - Resolved through the 'statsbomb' aliases in dim_team_alias
 --
 -- 2. dim_match_mapping: Maps StatsBomb match IDs to CSV match IDs (fact_match)
 --    - Populated after stg_events_raw and fact_match are loaded
@@ -19,50 +19,68 @@ CREATE TABLE IF NOT EXISTS dim_match_mapping (
     INDEX idx_csv_match (csv_match_id)
 );
 
--- Populate dim_team_mapping from unique teams in events
--- Use explicit StatsBomb ID to dim_team ID mapping (based on team names)
-INSERT IGNORE INTO dim_team_mapping (statsbomb_team_id, dim_team_id)
-VALUES
-(1, 1),      -- Arsenal FC
-(22, 2),     -- Aston Villa FC
-(23, 3),     -- Chelsea FC
-(24, 4),     -- Everton FC
-(25, 14),    -- Crystal Palace FC
-(26, 5),     -- Fulham FC
-(27, 23),    -- Ipswich Town FC
-(28, 21),    -- Leicester City FC
-(29, 6),     -- Liverpool FC
-(30, -1),    -- (International team - not in EPL)
-(31, -1),    -- (International team - not in EPL)
-(32, 9),     -- Newcastle United FC
-(33, -1),    -- (International team - not in EPL)
-(34, 13),    -- Nottingham Forest FC
-(35, 22),    -- Southampton FC
-(36, 10),    -- Tottenham Hotspur FC
-(37, 19),    -- West Ham United FC
-(38, 11),    -- Wolverhampton Wanderers FC
-(39, -1),    -- (International team - not in EPL)
-(40, 17),    -- Brighton & Hove Albion FC
-(41, -1),    -- (International team - not in EPL)
-(56, -1),    -- (International team - not in EPL)
-(59, -1),    -- (International team - not in EPL)
-(90, 18);    -- Brentford FC
+-- @block team_alias
+-- Every conformed team name is an alias of itself (source 'dim_team')
+INSERT IGNORE INTO dim_team_alias (source_system, alias, team_name)
+SELECT DISTINCT 'dim_team', team_name, team_name
+FROM dim_team
+WHERE team_id > 0;
 
--- Handle any remaining unmapped teams (use sentinel value -1)
-INSERT IGNORE INTO dim_team_mapping (statsbomb_team_id, dim_team_id)
-SELECT DISTINCT 
-    se.team_id,
-    -1
-FROM stg_events_raw se
-LEFT JOIN dim_team_mapping dtm ON dtm.statsbomb_team_id = se.team_id
-WHERE dtm.statsbomb_team_id IS NULL
-  AND se.team_id > 0;
+-- Point every alias at the current version of its team. Versions are linked
+-- by team_bk, so an alias of a former name still reaches the team. A name
+-- used by two business keys is left unresolved (NULL) and reported below.
+UPDATE dim_team_alias a
+LEFT JOIN (
+    SELECT v.team_name, MIN(cur.team_id) AS team_id
+    FROM dim_team v
+    JOIN dim_team cur ON cur.team_bk = v.team_bk AND cur.is_current = 'Y'
+    GROUP BY v.team_name
+    HAVING COUNT(DISTINCT v.team_bk) = 1
+) t ON t.team_name = a.team_name
+SET a.team_id = t.team_id;
+
+-- @name ambiguous_team_names
+-- Fix by renaming one team or adding source aliases that name it uniquely
+SELECT v.team_name AS ambiguous_team_name,
+       COUNT(DISTINCT v.team_bk) AS teams,
+       GROUP_CONCAT(DISTINCT v.team_bk ORDER BY v.team_bk) AS team_bks
+FROM dim_team v
+WHERE v.team_id > 0
+GROUP BY v.team_name
+HAVING COUNT(DISTINCT v.team_bk) > 1;
+
+-- @block team_mapping
+-- StatsBomb team ids resolve through their team names ('statsbomb' aliases);
+-- teams without an alias (e.g. international sides) map to the -1 sentinel
+DROP TEMPORARY TABLE IF EXISTS tmp_statsbomb_teams;
+CREATE TEMPORARY TABLE tmp_statsbomb_teams AS
+SELECT DISTINCT team_id, team_name
+FROM stg_events_raw
+WHERE team_id > 0;
+
+INSERT INTO dim_team_mapping (statsbomb_team_id, dim_team_id)
+SELECT se.team_id, COALESCE(MAX(a.team_id), -1)
+FROM tmp_statsbomb_teams se
+LEFT JOIN dim_team_alias a ON a.source_system = 'statsbomb' AND a.alias = se.team_name
+GROUP BY se.team_id
+ON DUPLICATE KEY UPDATE dim_team_id = VALUES(dim_team_id);
+
+-- @name unresolved_statsbomb_teams
+SELECT se.team_id AS unresolved_statsbomb_team_id, se.team_name
+FROM tmp_statsbomb_teams se
+JOIN dim_team_mapping dtm ON dtm.statsbomb_team_id = se.team_id
+WHERE dtm.dim_team_id = -1
+ORDER BY se.team_name;
+
+DROP TEMPORARY TABLE IF EXISTS tmp_statsbomb_teams;
 
 -- Verify team mapping
+-- @name verify_team_mapping
 SELECT 'Team Mapping Results:' as status;
 SELECT COUNT(*) as total_mappings FROM dim_team_mapping;
 SELECT COUNT(DISTINCT statsbomb_team_id) as unique_statsbomb_teams FROM dim_team_mapping;
 
+-- @block match_mapping
 -- Populate dim_match_mapping: Sequential mapping (first 380 CSV matches to StatsBomb IDs)
 -- We have 380 StatsBomb matches and need to map them to 380 CSV matches
 INSERT IGNORE INTO dim_match_mapping (statsbomb_match_id, csv_match_id)
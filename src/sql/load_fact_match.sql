@@ -11,7 +11,8 @@
 
 -- Step 1: Perform the idempotent upsert into the fact table.
 -- A Common Table Expression (CTE) is used to first conform the raw team names
--- from staging into the standard names used in the dimension tables.
+-- from staging into the standard names used in the dimension tables
+-- (through dim_team_alias, source_system 'e0_csv').
 INSERT INTO fact_match (
     -- Business Key
     match_source_key,
@@ -49,93 +50,20 @@ INSERT INTO fact_match (
     attendance
 )
 WITH stg_e0_match_raw_conformed AS (
+    -- Conformed names and team ids come from dim_team_alias (PK lookup); names
+    -- without an 'e0_csv' alias pass through trimmed and resolve through the
+    -- 'dim_team' self-aliases
     SELECT
-        *,
-        CASE TRIM(HomeTeam)
-            WHEN 'Man City' THEN 'Manchester City FC'
-            WHEN 'Man United' THEN 'Manchester United FC'
-            WHEN 'Nott''m Forest' THEN 'Nottingham Forest FC'
-            WHEN 'Wolves' THEN 'Wolverhampton Wanderers FC'
-            WHEN 'Bournemouth' THEN 'AFC Bournemouth'
-            WHEN 'Brighton' THEN 'Brighton & Hove Albion FC'
-            WHEN 'Newcastle' THEN 'Newcastle United FC'
-            WHEN 'Sheffield United' THEN 'Sheffield United FC'
-            WHEN 'West Ham' THEN 'West Ham United FC'
-            WHEN 'Tottenham' THEN 'Tottenham Hotspur FC'
-            WHEN 'Luton' THEN 'Luton Town FC'
-            WHEN 'Ipswich' THEN 'Ipswich Town FC'
-            WHEN 'Leicester' THEN 'Leicester City FC'
-            WHEN 'Southampton' THEN 'Southampton FC'
-            WHEN 'Sunderland' THEN 'Sunderland AFC'
-            WHEN 'Leeds' THEN 'Leeds United FC'
-            WHEN 'Arsenal' THEN 'Arsenal FC'
-            WHEN 'Chelsea' THEN 'Chelsea FC'
-            WHEN 'Liverpool' THEN 'Liverpool FC'
-            WHEN 'Everton' THEN 'Everton FC'
-            WHEN 'Fulham' THEN 'Fulham FC'
-            WHEN 'Burnley' THEN 'Burnley FC'
-            WHEN 'Crystal Palace' THEN 'Crystal Palace FC'
-            WHEN 'Brentford' THEN 'Brentford FC'
-            WHEN 'Aston Villa' THEN 'Aston Villa FC'
-            ELSE TRIM(HomeTeam)
-        END AS HomeTeam_conformed,
-        CASE TRIM(HomeTeam)
-            WHEN 'Man City' THEN 'Manchester City'
-            WHEN 'Man United' THEN 'Manchester United'
-            WHEN 'Nott''m Forest' THEN 'Nottingham Forest'
-            WHEN 'Wolves' THEN 'Wolves'
-            WHEN 'Bournemouth' THEN 'AFC Bournemouth'
-            WHEN 'Brighton' THEN 'Brighton & Hove Albion'
-            WHEN 'Newcastle' THEN 'Newcastle United'
-            WHEN 'Sheffield United' THEN 'Sheffield United'
-            WHEN 'West Ham' THEN 'West Ham United'
-            WHEN 'Tottenham' THEN 'Tottenham Hotspur'
-            WHEN 'Luton' THEN 'Luton Town'
-            WHEN 'Ipswich' THEN 'Ipswich Town'
-            WHEN 'Leicester' THEN 'Leicester City'
-            WHEN 'Southampton' THEN 'Southampton'
-            WHEN 'Sunderland' THEN 'Sunderland'
-            WHEN 'Leeds' THEN 'Leeds United'
-            WHEN 'Arsenal' THEN 'Arsenal'
-            WHEN 'Chelsea' THEN 'Chelsea'
-            WHEN 'Liverpool' THEN 'Liverpool'
-            WHEN 'Everton' THEN 'Everton'
-            WHEN 'Fulham' THEN 'Fulham'
-            WHEN 'Burnley' THEN 'Burnley'
-            WHEN 'Crystal Palace' THEN 'Crystal Palace'
-            WHEN 'Brentford' THEN 'Brentford'
-            WHEN 'Aston Villa' THEN 'Aston Villa'
-            ELSE TRIM(HomeTeam)
-        END AS HomeTeam_stadium,
-        CASE TRIM(AwayTeam)
-            WHEN 'Man City' THEN 'Manchester City FC'
-            WHEN 'Man United' THEN 'Manchester United FC'
-            WHEN 'Nott''m Forest' THEN 'Nottingham Forest FC'
-            WHEN 'Wolves' THEN 'Wolverhampton Wanderers FC'
-            WHEN 'Bournemouth' THEN 'AFC Bournemouth'
-            WHEN 'Brighton' THEN 'Brighton & Hove Albion FC'
-            WHEN 'Newcastle' THEN 'Newcastle United FC'
-            WHEN 'Sheffield United' THEN 'Sheffield United FC'
-            WHEN 'West Ham' THEN 'West Ham United FC'
-            WHEN 'Tottenham' THEN 'Tottenham Hotspur FC'
-            WHEN 'Luton' THEN 'Luton Town FC'
-            WHEN 'Ipswich' THEN 'Ipswich Town FC'
-            WHEN 'Leicester' THEN 'Leicester City FC'
-            WHEN 'Southampton' THEN 'Southampton FC'
-            WHEN 'Sunderland' THEN 'Sunderland AFC'
-            WHEN 'Leeds' THEN 'Leeds United FC'
-            WHEN 'Arsenal' THEN 'Arsenal FC'
-            WHEN 'Chelsea' THEN 'Chelsea FC'
-            WHEN 'Liverpool' THEN 'Liverpool FC'
-            WHEN 'Everton' THEN 'Everton FC'
-            WHEN 'Fulham' THEN 'Fulham FC'
-            WHEN 'Burnley' THEN 'Burnley FC'
-            WHEN 'Crystal Palace' THEN 'Crystal Palace FC'
-            WHEN 'Brentford' THEN 'Brentford FC'
-            WHEN 'Aston Villa' THEN 'Aston Villa FC'
-            ELSE TRIM(AwayTeam)
-        END AS AwayTeam_conformed
-    FROM stg_e0_match_raw
+        s.*,
+        COALESCE(ah.team_name, TRIM(s.HomeTeam)) AS HomeTeam_conformed,
+        COALESCE(aa.team_name, TRIM(s.AwayTeam)) AS AwayTeam_conformed,
+        CASE WHEN ah.alias IS NOT NULL THEN ah.team_id ELSE sh.team_id END AS HomeTeam_id,
+        CASE WHEN aa.alias IS NOT NULL THEN aa.team_id ELSE sa.team_id END AS AwayTeam_id
+    FROM stg_e0_match_raw s
+    LEFT JOIN dim_team_alias ah ON ah.source_system = 'e0_csv' AND ah.alias = TRIM(s.HomeTeam)
+    LEFT JOIN dim_team_alias aa ON aa.source_system = 'e0_csv' AND aa.alias = TRIM(s.AwayTeam)
+    LEFT JOIN dim_team_alias sh ON sh.source_system = 'dim_team' AND sh.alias = TRIM(s.HomeTeam)
+    LEFT JOIN dim_team_alias sa ON sa.source_system = 'dim_team' AND sa.alias = TRIM(s.AwayTeam)
 )
 SELECT
     -- Business Key: Unique identifier for a match from the source file.
@@ -146,7 +74,7 @@ SELECT
     COALESCE(ds.season_id, -1) AS season_id,         -- from dim_season
     COALESCE(dth.team_id, -1) AS home_team_id,      -- from dim_team (Home)
     COALESCE(dta.team_id, -1) AS away_team_id,      -- from dim_team (Away)
-    COALESCE(dr.referee_id, -1) AS referee_id,        -- from dim_referee
+    COALESCE(dr.referee_id, -1) AS referee_id,        -- from dim_referee_alias
     COALESCE(dst.stadium_id, -1) AS stadium_id,        -- from dim_stadium
 
     -- Core Match Metrics
@@ -177,15 +105,20 @@ FROM
     stg_e0_match_raw_conformed s
 LEFT JOIN dim_date dd ON dd.cal_date = s.Date
 LEFT JOIN dim_season ds ON ds.season_name = s.Season
-LEFT JOIN dim_team dth ON dth.team_name = s.HomeTeam_conformed
-LEFT JOIN dim_team dta ON dta.team_name = s.AwayTeam_conformed
-LEFT JOIN dim_referee dr ON (
-    dr.referee_name = TRIM(s.Referee)
-    OR dr.referee_name_short = TRIM(s.Referee)
-)
-LEFT JOIN dim_stadium dst ON (
-    dst.club = s.HomeTeam_stadium
-)
+-- dim_team is SCD2: the alias names the team's current version (PK lookup),
+-- whose team_bk picks the version valid on match day (idx_team_bk_range), so
+-- a match staged after a rename still gets the version of its date
+LEFT JOIN dim_team cth ON cth.team_id = s.HomeTeam_id
+LEFT JOIN dim_team cta ON cta.team_id = s.AwayTeam_id
+LEFT JOIN dim_team dth ON dth.team_bk = cth.team_bk
+                      AND s.Date BETWEEN dth.eff_start AND dth.eff_end
+LEFT JOIN dim_team dta ON dta.team_bk = cta.team_bk
+                      AND s.Date BETWEEN dta.eff_start AND dta.eff_end
+-- Any spelling of the referee (full name, 'M Oliver', 'M. Oliver') via its PK
+LEFT JOIN dim_referee_alias dr ON dr.alias = TRIM(s.Referee)
+-- dim_stadium.club spells the home team its own way (stadium_club aliases)
+LEFT JOIN dim_team_alias sc ON sc.source_system = 'stadium_club' AND sc.team_name = s.HomeTeam_conformed
+LEFT JOIN dim_stadium dst ON dst.club = COALESCE(sc.alias, TRIM(s.HomeTeam))
 
 ON DUPLICATE KEY UPDATE
     -- If a match already exists, only update the metrics, not the dimension keys.
@@ -247,3 +180,16 @@ VALUES (
         ', Total Affected: ', @total_affected
     )
 );
+
+-- Step 4: Report referee strings that did not resolve (no alias, or ambiguous).
+-- Add a spelling with alias_kind 'manual' to dim_referee_alias to fix one.
+-- @name unresolved_referees
+SELECT TRIM(s.Referee) AS unresolved_referee,
+       CASE WHEN ra.alias IS NULL THEN 'no alias' ELSE 'ambiguous' END AS reason,
+       COUNT(*) AS matches
+FROM stg_e0_match_raw s
+LEFT JOIN dim_referee_alias ra ON ra.alias = TRIM(s.Referee)
+WHERE TRIM(s.Referee) <> ''
+  AND (ra.alias IS NULL OR ra.referee_id = -1)
+GROUP BY TRIM(s.Referee), reason
+ORDER BY matches DESC;
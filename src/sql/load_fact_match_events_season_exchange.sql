@@ -0,0 +1,127 @@
+-- Season reload of fact_match_events by partition exchange
+-- Variables (set by load_facts.reload_event_season):
+--   ${season_id}      dim_season.season_id to reload
+--   ${partition}      its partition of fact_match_events (p_season_<id>)
+--   ${next_event_id}  AUTO_INCREMENT for the standalone table, so event ids stay unique
+--
+-- The season is built in fact_match_events_swap (same columns and keys, not
+-- partitioned): events of the season's matches still in staging are resolved
+-- fresh, the partition's events of every other match are copied over. One
+-- EXCHANGE PARTITION then swaps the table in; no row outside the season is
+-- read or locked, and the old rows leave with the swap table.
+
+-- @block build
+DROP TABLE IF EXISTS fact_match_events_swap;
+CREATE TABLE fact_match_events_swap LIKE fact_match_events;
+ALTER TABLE fact_match_events_swap REMOVE PARTITIONING;
+ALTER TABLE fact_match_events_swap AUTO_INCREMENT = ${next_event_id};
+
+-- @name find_season_matches
+-- Staged, mappable matches of the season
+DROP TEMPORARY TABLE IF EXISTS tmp_season_event_matches;
+CREATE TEMPORARY TABLE tmp_season_event_matches (
+    statsbomb_match_id INT NOT NULL PRIMARY KEY,
+    match_id INT NOT NULL,
+    match_date DATE NOT NULL,
+    staged_events INT,
+    staged_at DATETIME
+) ENGINE=InnoDB;
+
+INSERT INTO tmp_season_event_matches (statsbomb_match_id, match_id, match_date, staged_events, staged_at)
+SELECT  dmm.statsbomb_match_id,
+        fm.match_id,
+        dd.cal_date,
+        em.rows_processed,
+        em.load_end_time
+FROM    ETL_Events_Manifest em
+JOIN    dim_match_mapping dmm ON dmm.statsbomb_match_id = CAST(em.statsbomb_match_id AS UNSIGNED)
+JOIN    fact_match fm ON fm.match_id = dmm.csv_match_id
+JOIN    dim_date dd ON dd.date_id = fm.date_id
+WHERE   em.status = 'SUCCESS'
+  AND   fm.season_id = ${season_id}
+  AND   EXISTS (SELECT 1 FROM stg_events_raw se WHERE se.statsbomb_match_id = dmm.statsbomb_match_id);
+
+-- @name keep_unstaged_matches
+-- Matches that are not staged again keep their current events
+INSERT INTO fact_match_events_swap
+SELECT  fe.*
+FROM    fact_match_events PARTITION (${partition}) fe
+WHERE   NOT EXISTS (SELECT 1 FROM tmp_season_event_matches p
+                    WHERE p.statsbomb_match_id = fe.statsbomb_match_id);
+
+-- @name insert_season_events
+INSERT INTO fact_match_events_swap (
+        source_event_id,
+        season_id,
+        statsbomb_match_id,
+        match_id,
+        event_type,
+        player_id,
+        team_id,
+        minute,
+        extra_time
+)
+SELECT  se.event_id,
+        ${season_id},
+        se.statsbomb_match_id,
+        p.match_id,
+        se.type,
+        COALESCE(dp.player_id, 6808),
+        COALESCE(dt.team_id, dtm.dim_team_id, -1),
+        se.minute,
+        CASE WHEN se.statsbomb_period = 2 AND se.minute > 45 THEN se.minute - 45
+             WHEN se.statsbomb_period >= 3 THEN se.minute
+             ELSE 0 END
+FROM    tmp_season_event_matches p
+JOIN    stg_events_raw se ON se.statsbomb_match_id = p.statsbomb_match_id
+LEFT JOIN dim_team_mapping dtm ON dtm.statsbomb_team_id = se.team_id
+-- dim_team/dim_player are SCD2: resolve the version valid on match day
+LEFT JOIN dim_team dtv ON dtv.team_id = dtm.dim_team_id
+LEFT JOIN dim_team dt ON dt.team_bk = dtv.team_bk
+                     AND p.match_date BETWEEN dt.eff_start AND dt.eff_end
+LEFT JOIN dim_player dp ON dp.player_name = se.player_name
+                       AND p.match_date BETWEEN dp.eff_start AND dp.eff_end
+WHERE   se.status = 'LOADED'
+  AND   se.minute BETWEEN 0 AND 120
+ON DUPLICATE KEY UPDATE
+        match_id = VALUES(match_id),
+        event_type = VALUES(event_type),
+        player_id = VALUES(player_id),
+        team_id = VALUES(team_id),
+        minute = VALUES(minute),
+        extra_time = VALUES(extra_time);
+
+-- @block swap
+-- @name exchange_partition
+-- Rows are checked against the partition's VALUES IN list during the swap
+ALTER TABLE fact_match_events EXCHANGE PARTITION ${partition} WITH TABLE fact_match_events_swap;
+
+-- @name record_loaded_matches
+INSERT INTO ETL_Fact_Events_Manifest
+        (statsbomb_match_id, match_id, staged_events, staged_at, events_loaded, loaded_at)
+SELECT  p.statsbomb_match_id,
+        p.match_id,
+        p.staged_events,
+        p.staged_at,
+        COUNT(fe.event_id),
+        NOW()
+FROM    tmp_season_event_matches p
+LEFT JOIN fact_match_events PARTITION (${partition}) fe ON fe.statsbomb_match_id = p.statsbomb_match_id
+GROUP BY p.statsbomb_match_id, p.match_id, p.staged_events, p.staged_at
+ON DUPLICATE KEY UPDATE
+        match_id = VALUES(match_id),
+        staged_events = VALUES(staged_events),
+        staged_at = VALUES(staged_at),
+        events_loaded = VALUES(events_loaded),
+        loaded_at = VALUES(loaded_at);
+
+-- @name verify_season
+SELECT  ${season_id} AS season_id,
+        COUNT(*) AS season_events,
+        COUNT(DISTINCT match_id) AS season_matches,
+        (SELECT COUNT(*) FROM tmp_season_event_matches) AS matches_reloaded
+FROM    fact_match_events PARTITION (${partition});
+
+-- The swap table now holds the season's previous rows
+DROP TABLE IF EXISTS fact_match_events_swap;
+DROP TEMPORARY TABLE IF EXISTS tmp_season_event_matches;
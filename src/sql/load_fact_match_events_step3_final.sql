@@ -1,7 +1,66 @@
--- Step 3 (Final): Load events into fact_match_events  
+-- Step 3 (Final): Load events into fact_match_events (incremental)
 -- Using sentinel values: player_id=6808 (UNKNOWN), team_id=-1 for unknowns
 -- Join through dim_match_mapping to fact_match, only insert if match_id exists
+--
+-- Only StatsBomb matches that are new or changed since they were last
+-- materialized are joined. ETL_Fact_Events_Manifest remembers each match's
+-- staging fingerprint (ETL_Events_Manifest rows_processed + load_end_time).
+-- A changed match has its old fact rows replaced. fact_match_events.source_event_id
+-- (the StatsBomb event UUID) is unique, so re-running a load is idempotent.
+--
+-- The script loads one chunk: matches with statsbomb_match_id in
+-- [${range_low}, ${range_high}]. load_facts.load_fact_match_events_chunked runs
+-- the chunks in parallel, each on its own connection and in one transaction;
+-- the ETL_Fact_Events_Manifest rows it commits are the resume checkpoint.
+-- Rows land in their season's partition (load_facts.ensure_event_partitions
+-- adds missing ones first); whole seasons reload through
+-- load_fact_match_events_season_exchange.sql instead.
+
+-- @block pending_matches
+-- @name find_pending_matches
+-- Staged, mappable matches whose fingerprint differs from the last load
+DROP TEMPORARY TABLE IF EXISTS tmp_pending_event_matches;
+CREATE TEMPORARY TABLE tmp_pending_event_matches (
+    statsbomb_match_id INT NOT NULL PRIMARY KEY,
+    match_id INT NOT NULL,
+    season_id INT NOT NULL,
+    match_date DATE NOT NULL,
+    staged_events INT,
+    staged_at DATETIME
+) ENGINE=InnoDB;
+
+INSERT INTO tmp_pending_event_matches (statsbomb_match_id, match_id, season_id, match_date, staged_events, staged_at)
+SELECT  CAST(em.statsbomb_match_id AS UNSIGNED),
+        fm.match_id,
+        fm.season_id,
+        dd.cal_date,
+        em.rows_processed,
+        em.load_end_time
+FROM    ETL_Events_Manifest em
+JOIN    dim_match_mapping dmm ON dmm.statsbomb_match_id = CAST(em.statsbomb_match_id AS UNSIGNED)
+JOIN    fact_match fm ON fm.match_id = dmm.csv_match_id
+JOIN    dim_date dd ON dd.date_id = fm.date_id
+LEFT JOIN ETL_Fact_Events_Manifest fl ON fl.statsbomb_match_id = dmm.statsbomb_match_id
+WHERE   em.status = 'SUCCESS'
+  AND   dmm.statsbomb_match_id BETWEEN ${range_low} AND ${range_high}
+  AND   (fl.statsbomb_match_id IS NULL
+         OR NOT (fl.staged_events <=> em.rows_processed)
+         OR NOT (fl.staged_at <=> em.load_end_time))
+  -- staging may already be truncated; such matches wait for their next staging
+  AND   EXISTS (SELECT 1 FROM stg_events_raw se WHERE se.statsbomb_match_id = dmm.statsbomb_match_id);
+
+-- @block load_events
+-- @name clear_changed_matches
+-- Events dropped from a re-staged match file must not survive
+DELETE  fe
+FROM    fact_match_events fe
+JOIN    tmp_pending_event_matches p ON p.statsbomb_match_id = fe.statsbomb_match_id;
+
+-- @name insert_fact_match_events
 INSERT INTO fact_match_events (
+        source_event_id,
+        season_id,
+        statsbomb_match_id,
         match_id,
         event_type,
         player_id,
@@ -9,25 +68,54 @@ INSERT INTO fact_match_events (
         minute,
         extra_time
 )
-SELECT  fm.match_id,
+SELECT  se.event_id,
+        p.season_id,
+        se.statsbomb_match_id,
+        p.match_id,
         se.type,
         COALESCE(dp.player_id, 6808),
-        COALESCE(dtm.dim_team_id, -1),
+        COALESCE(dt.team_id, dtm.dim_team_id, -1),
         se.minute,
         CASE WHEN se.statsbomb_period = 2 AND se.minute > 45 THEN se.minute - 45
              WHEN se.statsbomb_period >= 3 THEN se.minute
              ELSE 0 END
-FROM    stg_events_raw se
-JOIN    dim_match_mapping dmm ON dmm.statsbomb_match_id = se.statsbomb_match_id
-INNER JOIN fact_match fm ON fm.match_id = dmm.csv_match_id  -- Only matches with valid mapping
+FROM    tmp_pending_event_matches p
+JOIN    stg_events_raw se ON se.statsbomb_match_id = p.statsbomb_match_id
 LEFT JOIN dim_team_mapping dtm ON dtm.statsbomb_team_id = se.team_id
+-- dim_team/dim_player are SCD2: resolve the version valid on match day.
+-- The mapping names one version of the team, so hop to its business key.
+LEFT JOIN dim_team dtv ON dtv.team_id = dtm.dim_team_id
+LEFT JOIN dim_team dt ON dt.team_bk = dtv.team_bk
+                     AND p.match_date BETWEEN dt.eff_start AND dt.eff_end
 LEFT JOIN dim_player dp ON dp.player_name = se.player_name
+                       AND p.match_date BETWEEN dp.eff_start AND dp.eff_end
 WHERE   se.status = 'LOADED'
-  AND   se.minute BETWEEN 0 AND 120;
+  AND   se.minute BETWEEN 0 AND 120
+ON DUPLICATE KEY UPDATE
+        match_id = VALUES(match_id),
+        event_type = VALUES(event_type),
+        player_id = VALUES(player_id),
+        team_id = VALUES(team_id),
+        minute = VALUES(minute),
+        extra_time = VALUES(extra_time);
+
+-- @name record_loaded_matches
+INSERT INTO ETL_Fact_Events_Manifest
+        (statsbomb_match_id, match_id, staged_events, staged_at, events_loaded, loaded_at)
+SELECT  p.statsbomb_match_id,
+        p.match_id,
+        p.staged_events,
+        p.staged_at,
+        COUNT(fe.event_id),
+        NOW()
+FROM    tmp_pending_event_matches p
+LEFT JOIN fact_match_events fe ON fe.statsbomb_match_id = p.statsbomb_match_id
+GROUP BY p.statsbomb_match_id, p.match_id, p.staged_events, p.staged_at
+ON DUPLICATE KEY UPDATE
+        match_id = VALUES(match_id),
+        staged_events = VALUES(staged_events),
+        staged_at = VALUES(staged_at),
+        events_loaded = VALUES(events_loaded),
+        loaded_at = VALUES(loaded_at);
 
--- Verify results
-SELECT COUNT(*) AS total_events,
-       COUNT(DISTINCT match_id) AS matches_with_events,
-       COUNT(DISTINCT player_id) AS players_seen,
-       SUM(CASE WHEN player_id = 6808 THEN 1 ELSE 0 END) AS unknown_player_events
-FROM   fact_match_events;
+DROP TEMPORARY TABLE IF EXISTS tmp_pending_event_matches;
@@ -7,6 +7,12 @@ SELECT COUNT(*) AS total_events,
        MAX(minute) AS max_minute
 FROM   fact_match_events;
 
+-- Matches materialized by the incremental step 3 load
+SELECT COUNT(*) AS matches_materialized,
+       COALESCE(SUM(events_loaded), 0) AS events_materialized,
+       MAX(loaded_at) AS last_loaded_at
+FROM   ETL_Fact_Events_Manifest;
+
 -- Event type distribution
 SELECT event_type, COUNT(*) AS event_count 
 FROM fact_match_events 
@@ -24,3 +30,23 @@ UNION ALL
 SELECT 'dim_team', COUNT(*) FROM dim_team
 UNION ALL
 SELECT 'dim_match_mapping', COUNT(*) FROM dim_match_mapping;
+
+-- Orphaned keys (the partitioned table has no foreign keys); all zero expected
+SELECT SUM(fm.match_id IS NULL) AS orphan_matches,
+       SUM(fe.season_id <> -1 AND ds.season_id IS NULL) AS orphan_seasons,
+       SUM(fe.season_id <> fm.season_id) AS wrong_partition,
+       SUM(fe.player_id IS NOT NULL AND dp.player_id IS NULL) AS orphan_players,
+       SUM(fe.team_id IS NOT NULL AND dt.team_id IS NULL) AS orphan_teams
+FROM   fact_match_events fe
+LEFT JOIN fact_match fm ON fm.match_id = fe.match_id
+LEFT JOIN dim_season ds ON ds.season_id = fe.season_id
+LEFT JOIN dim_player dp ON dp.player_id = fe.player_id
+LEFT JOIN dim_team dt ON dt.team_id = fe.team_id;
+
+-- Events per season partition
+SELECT PARTITION_NAME AS partition_name,
+       PARTITION_DESCRIPTION AS season_id,
+       TABLE_ROWS AS approx_rows
+FROM   information_schema.PARTITIONS
+WHERE  TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'fact_match_events'
+ORDER BY PARTITION_ORDINAL_POSITION;
@@ -1,11 +1,36 @@
 -- Step: Load fact_player_stats from staging
 -- For PoC: Associate all player stats with the first match per team per season
 
+-- @block team_season_match
+-- Build the (season, team) -> matches lookup once per load instead of
+-- aggregating fact_match inside the stats query
+SET SESSION group_concat_max_len = 65535;
+
+DELETE FROM team_season_match;
+
+INSERT INTO team_season_match (season_id, team_id, first_match_id, last_match_id, matches_played, match_ids)
+SELECT season_id,
+       team_id,
+       MIN(match_id),
+       MAX(match_id),
+       COUNT(*),
+       GROUP_CONCAT(match_id ORDER BY match_id)
+FROM (
+    SELECT season_id, home_team_id AS team_id, match_id FROM fact_match
+    UNION ALL
+    SELECT season_id, away_team_id AS team_id, match_id FROM fact_match
+) AS sides
+GROUP BY season_id, team_id;
+
+-- @block load_stats
+-- @name insert_fact_player_stats
+-- Staged labels are '2023-2024' (mock) or '2023/2024' (FBref); dim_season names
+-- use '/', so the season resolves by exact match on uk_season_name
 INSERT INTO fact_player_stats (match_id, player_id, team_id, minutes_played, goals, assists, yellow_cards, red_cards, shots)
 SELECT
-    (SELECT MIN(m.match_id) FROM fact_match m WHERE m.season_id = ds.season_id AND (m.home_team_id = dt.team_id OR m.away_team_id = dt.team_id)) AS match_id,
+    tsm.first_match_id AS match_id,
     COALESCE(dp.player_id, 6808) AS player_id,  -- 6808 = UNKNOWN player
-    COALESCE(dt.team_id, -1) AS team_id,        -- -1 = UNKNOWN team
+    dt.team_id,
     s.minutes_played,
     s.goals,
     s.assists,
@@ -13,12 +38,24 @@ SELECT
     s.red_cards,
     s.shots
 FROM stg_player_stats_fbref s
+JOIN dim_season ds ON ds.season_name = REPLACE(s.season_label, '-', '/')
+-- FBref spells teams its own way ('Manchester Utd', 'Wolves'): dim_team_alias
+-- names the team's current version (PK lookup; names without an 'fbref' alias
+-- resolve through the 'dim_team' self-aliases)
+LEFT JOIN dim_team_alias ta ON ta.source_system = 'fbref' AND ta.alias = s.team_name
+LEFT JOIN dim_team_alias tself ON tself.source_system = 'dim_team' AND tself.alias = s.team_name
+JOIN dim_team cur ON cur.team_id = CASE WHEN ta.alias IS NOT NULL THEN ta.team_id ELSE tself.team_id END
+-- dim_team/dim_player are SCD2: pick the version valid at the season start;
+-- teams by business key, so a season staged after a rename finds its version
+JOIN dim_team dt ON dt.team_bk = cur.team_bk
+                AND COALESCE(ds.start_date, MAKEDATE(LEFT(s.season_label, 4), 1) + INTERVAL 6 MONTH)
+                    BETWEEN dt.eff_start AND dt.eff_end
 LEFT JOIN dim_player dp ON dp.player_name = s.player_name
-LEFT JOIN dim_team dt ON dt.team_name = s.team_name
-LEFT JOIN dim_season ds ON ds.season_name LIKE CONCAT('%', LEFT(s.season_label, 4), '%')
+                       AND COALESCE(ds.start_date, MAKEDATE(LEFT(s.season_label, 4), 1) + INTERVAL 6 MONTH)
+                           BETWEEN dp.eff_start AND dp.eff_end
+JOIN team_season_match tsm ON tsm.season_id = ds.season_id AND tsm.team_id = dt.team_id
 WHERE s.player_name IS NOT NULL 
   AND s.team_name IS NOT NULL
-  AND (SELECT MIN(m.match_id) FROM fact_match m WHERE m.season_id = ds.season_id AND (m.home_team_id = dt.team_id OR m.away_team_id = dt.team_id)) IS NOT NULL
 ON DUPLICATE KEY UPDATE
     minutes_played = VALUES(minutes_played),
     goals = VALUES(goals),
@@ -28,6 +65,7 @@ ON DUPLICATE KEY UPDATE
     shots = VALUES(shots);
 
 -- Verify results
+-- @name verify_player_stats
 SELECT 
     COUNT(*) AS total_player_stats,
     COUNT(DISTINCT player_id) AS unique_players,